@@ -0,0 +1,185 @@
+# =============================================================================
+# bench_parser.py - 영수증 파서 마이크로 벤치마크
+# =============================================================================
+# 설명: 합성 영수증 corpus(1k / 10k / 100k건)로 extractor별 처리량(ops/sec) 측정
+#       결과를 JSON baseline으로 저장하고, 이전 baseline과 비교해 성능 회귀 감지
+#       프로젝트 루트에서 실행:
+#         python -m benchmarks.bench_parser
+#         python -m benchmarks.bench_parser --save benchmarks/results/parser_baseline.json
+#         python -m benchmarks.bench_parser --compare benchmarks/results/parser_baseline.json
+#
+#       기준 기록: benchmarks/results/parser_baseline.json
+#         (--sizes 1000 10000 --repeat 5, Python 3.11 / Linux x86_64 공용 VM)
+#         parse_text 약 3,400 ~ 5,500 ops/s, extract_items 약 5,500 ~ 6,000 ops/s
+#       [주의] ops/s 절대값은 기기마다 다르고 공용 VM에서는 실행마다 ±30% 흔들림
+#              → 다른 기기에서는 변경 전 코드로 --save 후 같은 기기에서 --compare
+# =============================================================================
+
+import argparse
+import json
+import platform
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+# 프로젝트 루트를 path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.synthetic_receipts import generate_receipt_texts
+from services.ocr_pipeline2.parsing.parser import (
+    extract_store_name,
+    extract_date,
+    extract_total,
+    extract_payment,
+    classify_category,
+    extract_items,
+    parse_text,
+)
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+
+
+def _to_lines(full_text):
+    # parse_text와 동일한 줄 분리 (측정 대상에서 제외)
+    return [l.strip() for l in full_text.split("\n") if l.strip()]
+
+
+def build_cases(corpus):
+    """
+    벤치마크 대상 함수별 (함수, 인자 리스트)
+    입력 준비 비용은 측정에서 제외
+    """
+
+    lines = [_to_lines(r["full_text"]) for r in corpus]
+    stores = [extract_store_name(l) for l in lines]
+    category_args = [(s, r["full_text"]) for s, r in zip(stores, corpus)]
+
+    return {
+        "extract_store_name": (extract_store_name, [(l,) for l in lines]),
+        "extract_date": (extract_date, [(l,) for l in lines]),
+        "extract_total": (extract_total, [(l,) for l in lines]),
+        "extract_payment": (extract_payment, [(l,) for l in lines]),
+        "classify_category": (classify_category, category_args),
+        "extract_items": (extract_items, [(l,) for l in lines]),
+        "parse_text": (parse_text, [(r,) for r in corpus]),
+    }
+
+
+def time_case(func, args_list, repeat):
+    """best-of-repeat 기준 ops/sec"""
+
+    best = float("inf")
+
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for args in args_list:
+            func(*args)
+        best = min(best, time.perf_counter() - started)
+
+    return len(args_list) / best if best > 0 else float("inf")
+
+
+def run_benchmark(sizes, repeat=3, seed=42, only=None):
+    """
+    반환:
+    {
+        "meta": {...},
+        "results": {"1000": {"parse_text": ops_per_sec, ...}, ...}
+    }
+    """
+
+    results = {}
+
+    for size in sizes:
+        corpus = generate_receipt_texts(size, seed=seed)
+        cases = build_cases(corpus)
+
+        # 큰 corpus는 반복 횟수를 줄여 전체 실행 시간 제한
+        size_repeat = repeat if size <= 10000 else 1
+
+        results[str(size)] = {}
+
+        for name, (func, args_list) in cases.items():
+            if only and name not in only:
+                continue
+
+            ops = time_case(func, args_list, size_repeat)
+            results[str(size)][name] = round(ops, 1)
+            print(f"   {size:>7,}건 | {name:<20} | {ops:>12,.0f} ops/s")
+            sys.stdout.flush()
+
+    return {
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": seed,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def compare(current, baseline, tolerance):
+    """
+    baseline 대비 tolerance(비율) 이상 느려진 항목 반환
+    반환: [(size, name, baseline_ops, current_ops), ...]
+    """
+
+    regressions = []
+
+    for size, ops_by_name in current["results"].items():
+        for name, ops in ops_by_name.items():
+            base = baseline.get("results", {}).get(size, {}).get(name)
+            if base and ops < base * (1 - tolerance):
+                regressions.append((size, name, base, ops))
+
+    return regressions
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="영수증 파서 마이크로 벤치마크")
+    ap.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="corpus 크기 목록")
+    ap.add_argument("--repeat", type=int, default=3, help="반복 측정 횟수 (best-of)")
+    ap.add_argument("--seed", type=int, default=42, help="corpus 생성 seed")
+    ap.add_argument("--only", nargs="+", default=None, help="측정할 함수 이름만 지정")
+    ap.add_argument("--save", default=None, help="결과 JSON 저장 경로 (baseline)")
+    ap.add_argument("--compare", default=None, help="비교할 baseline JSON 경로")
+    ap.add_argument("--tolerance", type=float, default=0.2, help="허용 성능 하락 비율 (기본 20%%)")
+    args = ap.parse_args(argv)
+
+    print("=" * 60)
+    print("영수증 파서 벤치마크")
+    print("=" * 60)
+
+    report = run_benchmark(args.sizes, repeat=args.repeat, seed=args.seed, only=args.only)
+
+    if args.save:
+        Path(args.save).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 baseline 저장: {args.save}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+
+        regressions = compare(report, baseline, args.tolerance)
+
+        print("\n" + "=" * 60)
+        if regressions:
+            print(f"❌ 성능 회귀 {len(regressions)}건 (허용 {args.tolerance:.0%})")
+            for size, name, base, ops in regressions:
+                print(f"   {int(size):>7,}건 | {name:<20} | {base:,.0f} → {ops:,.0f} ops/s")
+            print("=" * 60)
+            return 1
+
+        print("✅ baseline 대비 성능 회귀 없음")
+        print("=" * 60)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
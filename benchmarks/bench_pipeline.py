@@ -0,0 +1,118 @@
+# =============================================================================
+# bench_pipeline.py - run_pipeline 처리량 / 꼬리 지연 벤치마크 (오프라인)
+# =============================================================================
+# 설명: Vision 대신 ReplayOCRAdapter(녹화 corpus 재생)로 run_pipeline을 실행
+#       - 동시 실행 스레드 수별 처리량(건/s)과 p50 / p95 / p99 지연 측정
+#       - OCR 지연(latency / jitter)과 오류율을 주입해 실제 환경과 비슷하게 재현
+#       네트워크 / Google 인증 정보 없이 실행 가능
+#       프로젝트 루트에서 실행:
+#         python -m benchmarks.bench_pipeline --synthetic 2000 --latency-ms 300 --jitter-ms 400
+#         python -m benchmarks.bench_pipeline --corpus data/ocr_corpus.jsonl --workers 1 8 32
+# =============================================================================
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# 프로젝트 루트를 path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# 측정 대상은 OCR → 파싱 → 검증 경로만
+# draft 저장소(SQLite 쓰기) / 재OCR(추가 OCR 호출) / 중복 감지(빈 바이트라 해시 실패)는 끔
+# (.env보다 우선하도록 run_pipeline import 전에 설정)
+os.environ.update({
+    "OCR_DRAFT_STORE_ENABLED": "0",
+    "OCR_RESCUE_ENABLED": "0",
+    "OCR_DEDUP_ENABLED": "0",
+})
+
+from benchmarks.synthetic_receipts import generate_receipt_texts
+from services.ocr_pipeline2.ocr.adapter_registry import registry
+from services.ocr_pipeline2.ocr.replay_adapter import ReplayOCRAdapter
+from services.ocr_pipeline2.pipeline.run_pipeline import run_pipeline_bytes
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    idx = min(int(round(q * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[idx]
+
+
+def _timed_run(name):
+    started = time.perf_counter()
+    draft = run_pipeline_bytes(b"", name, verbose=False, user_pk=None)
+    return (time.perf_counter() - started) * 1000, draft["validation_status"]
+
+
+def run_benchmark(names, workers):
+    """
+    반환: {"workers", "count", "ops_per_sec", "p50_ms", "p95_ms", "p99_ms", "errors"}
+    """
+
+    started = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(_timed_run, names))
+
+    elapsed = time.perf_counter() - started
+    latencies = sorted(ms for ms, _ in results)
+
+    return {
+        "workers": workers,
+        "count": len(names),
+        "ops_per_sec": round(len(names) / elapsed, 1) if elapsed > 0 else float("inf"),
+        "p50_ms": round(percentile(latencies, 0.50), 1),
+        "p95_ms": round(percentile(latencies, 0.95), 1),
+        "p99_ms": round(percentile(latencies, 0.99), 1),
+        "errors": sum(status == "error" for _, status in results),
+    }
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="run_pipeline 오프라인 처리량 / 지연 벤치마크")
+    ap.add_argument("--corpus", default=None, help="녹화 corpus (vision_results.json 또는 JSONL)")
+    ap.add_argument("--synthetic", type=int, default=2000, help="corpus가 없을 때 합성 영수증 수")
+    ap.add_argument("--latency-ms", type=float, default=0.0, help="OCR 호출당 기본 지연")
+    ap.add_argument("--jitter-ms", type=float, default=0.0, help="추가 지연 상한 (균등분포)")
+    ap.add_argument("--error-rate", type=float, default=0.0, help="OCR 오류 주입 확률")
+    ap.add_argument("--workers", type=int, nargs="+", default=[1, 4, 16], help="동시 실행 스레드 수 목록")
+    ap.add_argument("--seed", type=int, default=42, help="corpus / 주입 난수 seed")
+    args = ap.parse_args(argv)
+
+    corpus = args.corpus or generate_receipt_texts(args.synthetic, seed=args.seed)
+    adapter = ReplayOCRAdapter(
+        corpus,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+    names = sorted(adapter.by_name)
+
+    # run_pipeline이 레지스트리에서 이 인스턴스를 꺼내 쓰도록 등록
+    registry.register("replay", lambda: adapter)
+    registry.reset("replay")
+    os.environ["OCR_ADAPTER"] = "replay"
+
+    print("=" * 60)
+    print(f"run_pipeline 벤치마크 ({len(names):,}건, 지연 {args.latency_ms}+{args.jitter_ms}ms, 오류율 {args.error_rate:.0%})")
+    print("=" * 60)
+
+    for workers in args.workers:
+        r = run_benchmark(names, workers)
+        print(
+            f"   workers {workers:>3} | {r['ops_per_sec']:>9,.1f}건/s "
+            f"| p50 {r['p50_ms']:>7.1f} | p95 {r['p95_ms']:>7.1f} | p99 {r['p99_ms']:>7.1f}ms "
+            f"| 오류 {r['errors']}"
+        )
+        sys.stdout.flush()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,286 @@
+# =============================================================================
+# bench_preprocess.py - OCR 전처리 전/후 추출 정확도 + payload 비교
+# =============================================================================
+# 설명: 샘플 영수증 이미지를 원본 / 전처리본으로 각각 Vision OCR → parse_text
+#       - 필드별(상호/날짜/합계/결제수단/카테고리) 추출 결과 비교
+#       - 정답 JSON(--expected)이 있으면 원본 대비 정답률이 떨어지지 않는지 확인
+#       - 전송 바이트 / 전처리 시간 / Vision 응답 시간 비교
+#       Vision API를 실제로 호출하므로 GOOGLE_APPLICATION_CREDENTIALS 필요
+#       --payload-only : Vision 호출 없이 전송 바이트 / 전처리 시간만 측정 (정확도는 측정 안 됨)
+#       --synthetic N  : 샘플 이미지 대신 휴대폰 사진 크기(4032x3024) 합성 영수증 사진 N장 사용
+#       프로젝트 루트에서 실행:
+#         python -m benchmarks.bench_preprocess --images data/receipts/v01_eval
+#         python -m benchmarks.bench_preprocess --images data/receipts/v01_eval --expected data/receipts/v01_eval/expected.json
+#         python -m benchmarks.bench_preprocess --payload-only --synthetic 8 --save benchmarks/results/preprocess_payload.json
+#
+#       정답 JSON 형식: {"r1.jpg": {"store_name": ..., "transaction_date": ..., "total": ...}, ...}
+#
+#       측정 기록: benchmarks/results/preprocess_payload.json (합성 사진, 전송량만)
+#       [주의] 실제 영수증 사진으로 전처리 전/후 추출 정확도(텍스트 유사도)는 아직 검증되지 않음
+#              → OCR_PREPROCESS_ENABLED는 기본 0 유지, 켜기 전에 --expected로 확인 필요
+# =============================================================================
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# 프로젝트 루트를 path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.ocr_pipeline2.ocr.google_vision_adapter import GoogleVisionAdapter
+from services.ocr_pipeline2.ocr.preprocess import (
+    ImagePreprocessor,
+    DEFAULT_MAX_EDGE,
+    DEFAULT_JPEG_QUALITY,
+)
+from services.ocr_pipeline2.parsing.parser import parse_text
+
+FIELDS = ["store_name", "transaction_date", "total", "payment", "category"]
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png"}
+
+
+def make_synthetic_photos(out_dir, count: int, seed: int = 42) -> list:
+    """
+    휴대폰 원본과 비슷한 합성 영수증 사진 (4032x3024 컬러 JPEG, quality 92)
+    책상 배경(색 그라데이션) 위 기울어진 흰 종이 + 글자 줄(어두운 막대) + 센서 노이즈
+    전송량 측정용 — 글자가 실제 문자는 아니므로 OCR 정확도 측정에는 쓸 수 없음
+    """
+
+    import numpy as np
+    from PIL import Image, ImageDraw
+
+    rng = np.random.default_rng(seed)
+    width, height = 4032, 3024
+    paths = []
+
+    for n in range(count):
+        yy, xx = np.mgrid[0:height, 0:width].astype(np.float32)
+        base = rng.uniform(90, 160, 3)
+        background = base + 30 * np.sin(xx[..., None] / rng.uniform(600, 1200) + yy[..., None] / 900)
+
+        img = Image.fromarray(np.clip(background, 0, 255).astype(np.uint8), "RGB")
+
+        paper = Image.new("L", (1400, 2600), 245)
+        draw = ImageDraw.Draw(paper)
+        for row in range(120, 2480, 48):
+            start = int(rng.integers(60, 200))
+            end = int(rng.integers(500, 1340))
+            draw.rectangle((start, row, end, row + 22), fill=int(rng.integers(20, 70)))
+
+        paper = paper.rotate(float(rng.uniform(-6, 6)), expand=True, fillcolor=0)
+        mask = paper.point(lambda v: 255 if v > 0 else 0)
+        img.paste(Image.merge("RGB", (paper,) * 3), (1300, 200), mask)
+
+        noisy = np.asarray(img, dtype=np.int16) + rng.normal(0, 4, (height, width, 3)).astype(np.int16)
+
+        path = Path(out_dir) / f"synthetic_{n:02d}.jpg"
+        Image.fromarray(np.clip(noisy, 0, 255).astype(np.uint8)).save(path, format="JPEG", quality=92)
+        paths.append(path)
+
+    return paths
+
+
+def run_payload_only(image_dir, preprocessor):
+    """Vision 호출 없이 전처리 전/후 바이트 / 전처리 시간만 측정"""
+
+    images = sorted(p for p in Path(image_dir).iterdir() if p.suffix.lower() in IMAGE_SUFFIXES)
+
+    report = {
+        "images": len(images),
+        "original_bytes": 0,
+        "output_bytes": 0,
+        "preprocess_ms": 0.0,
+        "accuracy_verified": False,
+    }
+
+    for image_path in images:
+        _, info = preprocessor(image_path.read_bytes())
+
+        report["original_bytes"] += info["original_bytes"]
+        report["output_bytes"] += info["output_bytes"]
+        report["preprocess_ms"] += info["duration_ms"]
+
+        print(
+            f"   {image_path.name:<24} | {info['original_bytes']:>9,} → {info['output_bytes']:>9,} B "
+            f"| 전처리 {info['duration_ms']:>6.1f}ms | {info['size']}"
+        )
+        sys.stdout.flush()
+
+    if images:
+        report["preprocess_ms"] = round(report["preprocess_ms"] / len(images), 2)
+
+    return report
+
+
+def _ocr(adapter, image_path):
+    started = time.perf_counter()
+    result = adapter.run(str(image_path))
+    elapsed = (time.perf_counter() - started) * 1000
+
+    return result, elapsed
+
+
+def run_benchmark(image_dir, preprocessor, expected=None):
+    """
+    반환:
+    {
+        "images": int,
+        "original_bytes": int, "output_bytes": int,
+        "preprocess_ms": float (평균),
+        "ocr_ms": {"original": float, "preprocessed": float} (평균),
+        "mismatches": [(image, field, original, preprocessed), ...],
+        "accuracy": {"original": {field: n}, "preprocessed": {field: n}} (정답 있을 때)
+    }
+    """
+
+    images = sorted(p for p in Path(image_dir).iterdir() if p.suffix.lower() in IMAGE_SUFFIXES)
+
+    # 같은 클라이언트로 전처리만 켜고 끄며 비교
+    adapter = GoogleVisionAdapter()
+
+    report = {
+        "images": len(images),
+        "original_bytes": 0,
+        "output_bytes": 0,
+        "preprocess_ms": 0.0,
+        "ocr_ms": {"original": 0.0, "preprocessed": 0.0},
+        "mismatches": [],
+        "accuracy": {"original": dict.fromkeys(FIELDS, 0), "preprocessed": dict.fromkeys(FIELDS, 0)},
+    }
+
+    for image_path in images:
+        adapter.preprocessor = None
+        original, original_ms = _ocr(adapter, image_path)
+
+        adapter.preprocessor = preprocessor
+        processed, processed_ms = _ocr(adapter, image_path)
+
+        info = processed["preprocess"]
+        report["original_bytes"] += info["original_bytes"]
+        report["output_bytes"] += info["output_bytes"]
+        report["preprocess_ms"] += info["duration_ms"]
+        report["ocr_ms"]["original"] += original_ms
+        report["ocr_ms"]["preprocessed"] += processed_ms
+
+        parsed_original = parse_text(original)
+        parsed_processed = parse_text(processed)
+
+        truth = (expected or {}).get(image_path.name)
+
+        for field in FIELDS:
+            a, b = parsed_original.get(field), parsed_processed.get(field)
+
+            if a != b:
+                report["mismatches"].append((image_path.name, field, a, b))
+
+            if truth and field in truth:
+                report["accuracy"]["original"][field] += a == truth[field]
+                report["accuracy"]["preprocessed"][field] += b == truth[field]
+
+        print(
+            f"   {image_path.name:<24} | {info['original_bytes']:>9,} → {info['output_bytes']:>9,} B "
+            f"| 전처리 {info['duration_ms']:>6.1f}ms | OCR {original_ms:>6.0f} → {processed_ms:>6.0f}ms"
+        )
+        sys.stdout.flush()
+
+    if images:
+        report["preprocess_ms"] = round(report["preprocess_ms"] / len(images), 2)
+        for key in report["ocr_ms"]:
+            report["ocr_ms"][key] = round(report["ocr_ms"][key] / len(images), 1)
+
+    return report
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="OCR 전처리 전/후 정확도 비교")
+    ap.add_argument("--images", default="data/receipts/v01_eval", help="샘플 이미지 디렉터리")
+    ap.add_argument("--expected", default=None, help="정답 JSON 경로 (파일명 → 필드값)")
+    ap.add_argument("--max-edge", type=int, default=DEFAULT_MAX_EDGE, help="긴 변 최대 픽셀")
+    ap.add_argument("--quality", type=int, default=DEFAULT_JPEG_QUALITY, help="JPEG 품질")
+    ap.add_argument("--color", action="store_true", help="흑백 변환 안 함")
+    ap.add_argument("--save", default=None, help="결과 JSON 저장 경로")
+    ap.add_argument("--payload-only", action="store_true", help="Vision 호출 없이 전송량만 측정")
+    ap.add_argument("--synthetic", type=int, default=0, help="합성 사진 N장으로 측정 (--images 무시)")
+    ap.add_argument("--seed", type=int, default=42, help="합성 사진 seed")
+    args = ap.parse_args(argv)
+
+    expected = None
+    if args.expected:
+        with open(args.expected, "r", encoding="utf-8") as f:
+            expected = json.load(f)
+
+    preprocessor = ImagePreprocessor(
+        max_edge=args.max_edge,
+        grayscale=not args.color,
+        jpeg_quality=args.quality,
+    )
+
+    print("=" * 60)
+    print(f"OCR 전처리 벤치마크 (max_edge={args.max_edge}, quality={args.quality}, 흑백={not args.color})")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        image_dir = args.images
+
+        if args.synthetic:
+            make_synthetic_photos(tmp, args.synthetic, seed=args.seed)
+            image_dir = tmp
+
+        if args.payload_only:
+            report = run_payload_only(image_dir, preprocessor)
+        else:
+            report = run_benchmark(image_dir, preprocessor, expected)
+
+    report["settings"] = {
+        "max_edge": args.max_edge,
+        "jpeg_quality": args.quality,
+        "grayscale": not args.color,
+        "images": f"synthetic x{args.synthetic} (seed {args.seed})" if args.synthetic else args.images,
+    }
+
+    if args.save:
+        Path(args.save).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 결과 저장: {args.save}")
+
+    saved = report["original_bytes"] - report["output_bytes"]
+    ratio = saved / report["original_bytes"] if report["original_bytes"] else 0.0
+
+    print("\n" + "=" * 60)
+    print(f"이미지 {report['images']}장 | 전송량 {ratio:.1%} 감소 ({saved:,} B)")
+
+    if args.payload_only:
+        print(f"평균 전처리 {report['preprocess_ms']}ms")
+        print("⚠️  추출 정확도는 측정하지 않음 (Vision 호출 없음)")
+        print("=" * 60)
+        return 0
+
+    print(f"평균 전처리 {report['preprocess_ms']}ms | 평균 OCR {report['ocr_ms']['original']} → {report['ocr_ms']['preprocessed']}ms")
+
+    failed = False
+
+    if expected:
+        for field in FIELDS:
+            a = report["accuracy"]["original"][field]
+            b = report["accuracy"]["preprocessed"][field]
+            mark = "✅" if b >= a else "❌"
+            failed |= b < a
+            print(f"   {mark} {field:<18} 정답 {a} → {b}")
+    else:
+        # 정답이 없으면 원본과 추출 결과가 완전히 같아야 통과
+        for name, field, a, b in report["mismatches"]:
+            print(f"   ❌ {name:<24} | {field:<18} | {a!r} → {b!r}")
+        failed = bool(report["mismatches"])
+
+    print(("❌ 전처리 후 추출 정확도 하락" if failed else "✅ 추출 정확도 변화 없음"))
+    print("=" * 60)
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+# =============================================================================
+# synthetic_receipts.py - 합성 한국어 영수증 OCR 텍스트 생성기
+# =============================================================================
+# 설명: dummy data/dummy_receipts_full_format.json + 브랜드/품목 사전을 씨앗으로
+#       실제 Vision 출력과 비슷한 영수증 텍스트를 생성 (파서 벤치마크용)
+#       - 헤더 (상호 / 사업자 / 주소 / TEL / 일시)
+#       - 품목 행 (한 줄형 / 상품명·금액 분리형)
+#       - 합계 / 부가세 / 할인
+#       - 결제 footer (카드 / 현금 / 페이) + VAN 승인 라인 + 환불 안내
+#       같은 seed면 항상 같은 corpus 생성
+# =============================================================================
+
+import json
+import random
+from pathlib import Path
+
+from services.ocr_pipeline2.parsing.dict.store_dict import BRAND_KEYWORDS, STORE_GENERIC
+from services.ocr_pipeline2.parsing.dict.item_dict import ITEM_CATEGORY_RULES
+
+DUMMY_PATH = Path(__file__).parent.parent / "dummy data" / "dummy_receipts_full_format.json"
+
+# payment_methods 테이블 기준 (db_mapper.PAYMENT_MAP 역방향)
+PAYMENT_LABELS = {1: "card", 2: "cash", 3: "app"}
+
+BRANCHES = ["강남점", "역삼점", "성수점", "홍대입구점", "본점", "수원영통점", ""]
+VAN_NAMES = ["KOCES", "KICC", "한국신용카드결제"]
+CARD_NAMES = ["신한카드", "국민카드", "현대카드", "삼성카드", "BC카드"]
+PAY_APPS = ["카카오페이", "네이버페이", "삼성페이"]
+FOOTERS = [
+    "교환/환불은 영수증 지참 후 7일 이내",
+    "환불시 결제카드를 지참하세요",
+    "이용해 주셔서 감사합니다",
+    "신고안내 : 국세청 현금영수증",
+]
+
+
+def _load_seeds():
+    with open(DUMMY_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _fmt(amount):
+    return f"{amount:,}"
+
+
+def _header(r, store, date):
+    lines = [f"{store} {r.choice(BRANCHES)}".strip()]
+
+    if r.random() < 0.7:
+        lines.append(f"사업자 {r.randint(100, 999)}-{r.randint(10, 99)}-{r.randint(10000, 99999)}")
+    if r.random() < 0.5:
+        lines.append(f"대표자 {r.choice(['김', '이', '박', '최'])}OO")
+    if r.random() < 0.6:
+        lines.append(f"서울특별시 {r.choice(['강남구', '마포구', '성동구'])} 테헤란로 {r.randint(1, 500)}")
+    if r.random() < 0.6:
+        lines.append(f"TEL 02-{r.randint(100, 9999)}-{r.randint(1000, 9999)}")
+
+    sep = r.choice(["-", ".", "/"])
+    y, m, d = date.split("-")
+    if r.random() < 0.3:
+        y = y[2:]
+    lines.append(f"{y}{sep}{m}{sep}{d} {r.randint(0, 23):02d}:{r.randint(0, 59):02d}")
+
+    if r.random() < 0.4:
+        lines.append(f"POS:{r.randint(1, 9):02d} NO:{r.randint(1000, 9999)}")
+
+    return lines
+
+
+def _item_rows(r, items):
+    rows = []
+
+    if r.random() < 0.6:
+        rows.append(r.choice(["상품명 단가 수량 금액", "메뉴 수량 금액", "품목 금액"]))
+
+    for name, qty, price in items:
+        style = r.random()
+        amount = price * qty
+
+        if style < 0.55:
+            rows.append(f"{name} {_fmt(amount)}")
+        elif style < 0.8:
+            rows.append(name)
+            rows.append(f"{_fmt(price)} {qty} {_fmt(amount)}")
+        else:
+            rows.append(f"{r.randint(100000, 999999)} {name}")
+            rows.append(_fmt(amount))
+
+    return rows
+
+
+def _footer(r, total, payment):
+    lines = []
+
+    discount = 0
+    if r.random() < 0.2:
+        discount = r.randint(1, 5) * 500
+        lines.append(f"할인 -{_fmt(discount)}")
+
+    paid = total - discount
+    vat = paid // 11
+
+    lines.append(f"{r.choice(['합계', '합계금액', '총액', '결제금액'])} {_fmt(paid)}")
+    if r.random() < 0.5:
+        lines.append(f"과세물품가액 {_fmt(paid - vat)}")
+        lines.append(f"부가세 {_fmt(vat)}")
+
+    if payment == "card":
+        lines.append(f"{r.choice(CARD_NAMES)} {_fmt(paid)}")
+        lines.append(f"카드번호 {r.randint(1000, 9999)}-****-****-{r.randint(1000, 9999)}")
+        lines.append(f"{r.choice(VAN_NAMES)} 승인번호 {r.randint(10000000, 99999999)}")
+    elif payment == "cash":
+        received = (paid // 10000 + 1) * 10000
+        lines.append(f"현금 {_fmt(paid)}")
+        lines.append(f"받은금액 {_fmt(received)}")
+        lines.append(f"거스름돈 {_fmt(received - paid)}")
+    else:
+        lines.append(f"{r.choice(PAY_APPS)} {_fmt(paid)}")
+
+    if r.random() < 0.7:
+        lines.append(r.choice(FOOTERS))
+
+    return lines, paid
+
+
+def generate_receipt_texts(n: int, seed: int = 42) -> list:
+    """
+    합성 OCR 결과 n건 생성
+
+    반환: [{"adapter", "image_name", "full_text", "expected"}, ...]
+          (vision_results.json 형식 + 생성 시 사용한 정답값)
+    """
+
+    r = random.Random(seed)
+    seeds = _load_seeds()
+
+    stores = sorted({s["store_name"] for s in seeds}) + BRAND_KEYWORDS + [f"행복{g}" for g in STORE_GENERIC]
+    item_names = sorted({d["name"] for s in seeds for d in s["details"]})
+    item_names += [kw for keywords in ITEM_CATEGORY_RULES.values() for kw in keywords]
+
+    results = []
+
+    for i in range(n):
+        base = r.choice(seeds)
+
+        store = base["store_name"] if r.random() < 0.3 else r.choice(stores)
+        date = base["date"]
+        payment = PAYMENT_LABELS.get(base["payment_method_id"], "card")
+        if r.random() < 0.3:
+            payment = r.choice(list(PAYMENT_LABELS.values()))
+
+        items = [
+            (r.choice(item_names), r.randint(1, 3), r.randint(5, 300) * 100)
+            for _ in range(r.randint(1, 12))
+        ]
+        total = sum(qty * price for _, qty, price in items)
+
+        header = _header(r, store, date)
+        footer, paid = _footer(r, total, payment)
+        lines = header + _item_rows(r, items) + footer
+
+        results.append({
+            "adapter": "synthetic",
+            "image_name": f"synthetic_{seed}_{i:06d}.jpg",
+            "full_text": "\n".join(lines),
+            "expected": {
+                "store_name": header[0],
+                "transaction_date": date,
+                "total": paid,
+                "payment": payment,
+            }
+        })
+
+    return results
@@ -20,7 +20,6 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import time
-import tempfile
 import os
 import sys
 from pathlib import Path
@@ -33,7 +32,8 @@ from backend.api.users import get_user_by_user_id, create_user
 from backend.api.categories import get_all_categories
 from backend.api.receipts import create_receipt, get_receipts_by_user, delete_receipt
 from backend.api.storage import upload_image, get_public_url, delete_image
-from services.ocr_pipeline2.pipeline.run_pipeline import run_pipeline
+from services.ocr_pipeline2.pipeline.run_pipeline import run_pipeline_many, run_pipeline_stitched
+from services.ocr_pipeline2.pipeline.job_queue import get_default_queue, FINISHED, CANCELLED, DEFAULT_RESTORE_S
 from services.ocr_pipeline2.persistence.db_mapper import CATEGORY_MAP, PAYMENT_MAP
 
 
@@ -230,93 +230,210 @@ def page_upload():
         key="m_uploader"
     )
 
+    # [변경] 긴 영수증을 여러 장으로 나눠 찍은 경우 → 겹친 줄을 제거하고 영수증 1건으로 합침
+    stitch_photos = st.checkbox(
+        "📏 긴 영수증 여러 장을 한 장으로 합치기 (위→아래 순서로 업로드)",
+        value=False,
+        key="m_stitch_photos"
+    )
+
     # --- OCR 파이프라인 실행 ---
     if 'ocr_results' not in st.session_state:
         st.session_state['ocr_results'] = {}
 
+    # [변경] OCR_JOB_QUEUE_ENABLED=1이면 업로드를 작업 큐에 넣고 워커 결과를 받아서 표시
+    # 파일명 → 작업 id (rerun 사이에 유지, 끝난 작업은 ocr_results로 이동)
+    if 'ocr_jobs' not in st.session_state:
+        st.session_state['ocr_jobs'] = {}
+
+    job_queue = get_default_queue()
+
+    # [변경] 새로고침(새 세션)이면 이 사용자의 최근 작업을 큐에서 다시 찾아 연결
+    # → 처리 중 작업은 계속 기다리고, 끝난 결과는 아래에서 ocr_results로 옮겨짐 (같은 파일 재업로드 시 OCR 생략)
+    restore_user = st.session_state.get('user_pk')
+    if job_queue is not None and restore_user and st.session_state.get('ocr_jobs_restored_for') != restore_user:
+        st.session_state['ocr_jobs_restored_for'] = restore_user
+        restored = set()
+
+        # 같은 파일명이 여러 번 등록됐으면 가장 최근 작업으로 연결
+        for job_id, name, status in job_queue.list_jobs(restore_user, since=time.time() - DEFAULT_RESTORE_S):
+            if status != CANCELLED and name not in st.session_state['ocr_results']:
+                st.session_state['ocr_jobs'][name] = job_id
+                restored.add(name)
+
+        if restored:
+            st.info(f"🔄 이전 업로드 {len(restored)}장 작업을 불러왔습니다. 같은 파일을 다시 올리면 OCR 없이 결과를 표시합니다.")
+
+    if job_queue is not None and st.session_state['ocr_jobs']:
+        jobs = st.session_state['ocr_jobs']
+        statuses = job_queue.poll(jobs.values())
+
+        for name, job_id in list(jobs.items()):
+            status = statuses.get(job_id)
+
+            if status in FINISHED:
+                st.session_state['ocr_results'][name] = job_queue.result(job_id)
+                del jobs[name]
+            elif status is None:
+                # 큐 파일이 바뀌었거나 정리된 작업
+                st.session_state['ocr_results'][name] = {
+                    "validation_status": "error",
+                    "error_msg": "작업을 찾을 수 없습니다."
+                }
+                del jobs[name]
+
     if uploaded_files:
-        for file in uploaded_files:
-            if file.name not in st.session_state['ocr_results']:
-                with st.spinner(f"🔍 {file.name} OCR 처리 중..."):
-                    try:
-                        suffix = Path(file.name).suffix
-                        tmp = tempfile.NamedTemporaryFile(delete=False, suffix=suffix)
-                        tmp.write(file.getbuffer())
-                        tmp.close()
-                        result = run_pipeline(tmp.name, verbose=False)
-                        st.session_state['ocr_results'][file.name] = result
-                        os.unlink(tmp.name)
-                    except Exception as e:
-                        st.session_state['ocr_results'][file.name] = {
+        # [변경] 새 파일을 모아 배치 OCR 1회로 처리 (파일마다 Vision 왕복하지 않음)
+        # [변경] 임시 파일 없이 업로드 버퍼(getbuffer)를 그대로 OCR에 전달
+        new_files = [
+            f for f in uploaded_files
+            if f.name not in st.session_state['ocr_results'] and f.name not in st.session_state['ocr_jobs']
+        ]
+
+        if new_files:
+            with st.spinner(f"🔍 {len(new_files)}장 OCR 처리 중..."):
+                try:
+                    if stitch_photos and len(new_files) > 1:
+                        # 첫 사진 이름으로 결과 1건 저장, 나머지 사진은 합쳐졌다고 표시
+                        first_name = new_files[0].name
+                        st.session_state['ocr_results'][first_name] = run_pipeline_stitched(
+                            [(file.getbuffer(), file.name) for file in new_files],
+                            verbose=False,
+                            user_pk=st.session_state.get('user_pk')
+                        )
+                        for file in new_files[1:]:
+                            st.session_state['ocr_results'][file.name] = {"stitched_into": first_name}
+                    elif job_queue is not None:
+                        # [변경] 등록만 하고 바로 반환 (rerun / 새로고침 중에도 워커가 계속 처리)
+                        for file in new_files:
+                            st.session_state['ocr_jobs'][file.name] = job_queue.submit(
+                                file.getbuffer(), file.name, user_pk=st.session_state.get('user_pk')
+                            )
+                    else:
+                        # [변경] 중복 정리 후 배치 요청 여러 개로 동시에 처리 → 끝나는 순서대로 진행률 갱신
+                        progress = st.progress(0.0, text=f"0/{len(new_files)}장 완료")
+                        finished = run_pipeline_many(
+                            [(file.getbuffer(), file.name) for file in new_files],
+                            verbose=False,
+                            user_pk=st.session_state.get('user_pk')
+                        )
+                        for done, (i, result) in enumerate(finished, start=1):
+                            st.session_state['ocr_results'][new_files[i].name] = result
+                            progress.progress(
+                                done / len(new_files),
+                                text=f"{done}/{len(new_files)}장 완료 ({new_files[i].name})"
+                            )
+                        progress.empty()
+                except Exception as e:
+                    # [변경] 이미 끝난 사진 결과는 유지하고 나머지만 에러 처리
+                    for file in new_files:
+                        st.session_state['ocr_results'].setdefault(file.name, {
                             "validation_status": "error",
                             "error_msg": str(e)
-                        }
+                        })
 
         st.markdown("---")
-        st.markdown(f"**🔍 추출 결과 ({len(uploaded_files)}건)**")
+        receipt_count = sum(
+            1 + len(st.session_state['ocr_results'].get(f.name, {}).get("segments", []))
+            for f in uploaded_files
+            if f.name in st.session_state['ocr_results']
+            and "stitched_into" not in st.session_state['ocr_results'][f.name]
+        )
+        st.markdown(f"**🔍 추출 결과 ({receipt_count}건)**")
 
         temp_data_list = []
 
         for idx, file in enumerate(uploaded_files):
-            ocr_data = st.session_state['ocr_results'].get(file.name, {})
-
-            parsed_store = ocr_data.get("store_name", "")
-            parsed_date_str = ocr_data.get("transaction_date", "")
-            parsed_total = ocr_data.get("total", 0)
-
-            from datetime import date as _date
-            try:
-                parsed_date = _date.fromisoformat(parsed_date_str)
-            except (ValueError, TypeError):
-                parsed_date = _date.today()
-            parsed_category = ocr_data.get("category", "기타")
-            parsed_payment = ocr_data.get("payment", "")
-            validation_status = ocr_data.get("validation_status", "error")
-
-            with st.expander(f"📄 #{idx+1} {file.name}", expanded=(idx == 0)):
-                # 모바일: 이미지를 위에, 폼을 아래에 세로 배치
-                st.image(file, use_column_width=True)
-
-                if validation_status == "success":
-                    st.success("✅ OCR 인식 성공")
-                elif validation_status == "review_required":
-                    st.warning("⚠️ 검토 필요")
-                else:
-                    st.error("❌ OCR 인식 실패")
-
-                store_name = st.text_input("상호명", value=parsed_store, key=f"m_store_{idx}")
-                date_val = st.date_input("날짜", value=parsed_date, key=f"m_date_{idx}")
-                amount = st.number_input("금액", value=parsed_total, step=100, key=f"m_amt_{idx}")
-
-                cat_index = 0
-                if parsed_category in category_names:
-                    cat_index = category_names.index(parsed_category)
-                category = st.selectbox(
-                    "카테고리", category_names, index=cat_index, key=f"m_cat_{idx}"
-                ) if category_names else st.text_input("카테고리", value=parsed_category, key=f"m_cat_{idx}")
-
-                selected_cat_id = st.session_state['categories'].get(category)
-
-                file_suffix = Path(file.name).suffix.lower()
-                content_type = "image/png" if file_suffix == ".png" else "image/jpeg"
-
-                temp_data_list.append({
-                    "store_name": store_name,
-                    "date": date_val.strftime('%Y-%m-%d'),
-                    "total_amount": amount,
-                    "category": category,
-                    "category_id": selected_cat_id,
-                    "payment": parsed_payment,
-                    "payment_method_id": PAYMENT_MAP.get(parsed_payment),
-                    "file_name": file.name,
-                    "file_bytes": file.getvalue(),
-                    "content_type": content_type,
-                })
+            # [변경] 작업 큐에서 처리 중인 사진은 상태만 표시
+            if file.name in st.session_state['ocr_jobs']:
+                pending_col, cancel_col = st.columns([4, 1])
+                pending_col.info(f"⏳ {file.name} OCR 처리 중...")
+                if cancel_col.button("취소", key=f"m_cancel_job_{idx}"):
+                    job_queue.cancel(st.session_state['ocr_jobs'][file.name])
+                    st.rerun()
+                continue
+
+            file_result = st.session_state['ocr_results'].get(file.name, {})
+
+            # [변경] 앞 사진 결과에 합쳐진 사진은 따로 표시하지 않음
+            if "stitched_into" in file_result:
+                continue
+
+            # [변경] 한 사진에 영수증이 여러 장이면 영수증마다 입력 폼 표시
+            receipts = [file_result, *file_result.get("segments", [])]
+
+            for seg, ocr_data in enumerate(receipts):
+                key = f"{idx}" if seg == 0 else f"{idx}_{seg}"
+
+                parsed_store = ocr_data.get("store_name", "")
+                parsed_date_str = ocr_data.get("transaction_date", "")
+                parsed_total = ocr_data.get("total", 0)
+
+                from datetime import date as _date
+                try:
+                    parsed_date = _date.fromisoformat(parsed_date_str)
+                except (ValueError, TypeError):
+                    parsed_date = _date.today()
+                parsed_category = ocr_data.get("category", "기타")
+                parsed_payment = ocr_data.get("payment", "")
+                validation_status = ocr_data.get("validation_status", "error")
+
+                with st.expander(
+                    f"📄 #{idx+1} {file.name}"
+                    + (f" ({seg+1}/{len(receipts)})" if len(receipts) > 1 else ""),
+                    expanded=(idx == 0)
+                ):
+                    # 모바일: 이미지를 위에, 폼을 아래에 세로 배치
+                    st.image(file, use_column_width=True)
+
+                    if validation_status == "success":
+                        st.success("✅ OCR 인식 성공")
+                    elif validation_status == "review_required":
+                        st.warning("⚠️ 검토 필요")
+                    else:
+                        st.error("❌ OCR 인식 실패")
+
+                    # [변경] 같은 영수증 재업로드(유사 이미지)면 기본적으로 저장 대상에서 제외
+                    include_duplicate = True
+                    if ocr_data.get("duplicate_of"):
+                        st.warning(f"🔁 이전에 올린 '{ocr_data['duplicate_of']}'와 같은 영수증으로 보입니다.")
+                        include_duplicate = st.checkbox("그래도 저장", value=False, key=f"m_dup_{key}")
+
+                    store_name = st.text_input("상호명", value=parsed_store, key=f"m_store_{key}")
+                    date_val = st.date_input("날짜", value=parsed_date, key=f"m_date_{key}")
+                    amount = st.number_input("금액", value=parsed_total, step=100, key=f"m_amt_{key}")
+
+                    cat_index = 0
+                    if parsed_category in category_names:
+                        cat_index = category_names.index(parsed_category)
+                    category = st.selectbox(
+                        "카테고리", category_names, index=cat_index, key=f"m_cat_{key}"
+                    ) if category_names else st.text_input("카테고리", value=parsed_category, key=f"m_cat_{key}")
+
+                    selected_cat_id = st.session_state['categories'].get(category)
+
+                    file_suffix = Path(file.name).suffix.lower()
+                    content_type = "image/png" if file_suffix == ".png" else "image/jpeg"
+
+                    temp_data_list.append({
+                        "store_name": store_name,
+                        "date": date_val.strftime('%Y-%m-%d'),
+                        "total_amount": amount,
+                        "category": category,
+                        "category_id": selected_cat_id,
+                        "payment": parsed_payment,
+                        "payment_method_id": PAYMENT_MAP.get(parsed_payment),
+                        "file_name": file.name,
+                        "file_bytes": file.getvalue(),
+                        "content_type": content_type,
+                        "skip": not include_duplicate,
+                        "segment": seg,
+                    })
 
         # --- 일괄 저장 버튼 ---
         st.markdown("")
         if st.button(
-            f"💾 {len(uploaded_files)}건 장부에 저장",
+            f"💾 {len(temp_data_list)}건 장부에 저장",
             use_container_width=True, type="primary"
         ):
             import time as _time
@@ -324,9 +441,14 @@ def page_upload():
             fail_count = 0
 
             for data in temp_data_list:
+                if data["skip"]:
+                    continue
                 try:
                     user_pk = st.session_state['user_pk']
                     name_part, ext_part = os.path.splitext(data['file_name'])
+                    # 같은 사진의 영수증끼리 경로가 겹치지 않도록 영수증 번호 추가
+                    if data["segment"]:
+                        name_part = f"{name_part}_{data['segment']}"
                     storage_path = f"user_{user_pk}/{name_part}_{int(_time.time())}{ext_part}"
                     upload_result = upload_image(
                         file_path=storage_path,
@@ -373,6 +495,11 @@ def page_upload():
     else:
         st.caption("아직 저장된 내역이 없습니다.")
 
+    # [변경] 처리 중인 큐 작업이 있으면 잠시 후 다시 그려서 끝난 결과 표시
+    if job_queue is not None and st.session_state['ocr_jobs']:
+        time.sleep(1)
+        st.rerun()
+
 
 # =============================================================================
 # 5-2. 지출 분석 페이지 (모바일 - 세로 1컬럼)
@@ -33,6 +33,19 @@ st.set_page_config(
     layout="centered"
 )
 
+# =============================================================================
+# 1-1. OCR 어댑터 warm-up
+# =============================================================================
+# 실제로 쓸 어댑터(OCR_ADAPTER, 기본 google_vision)만 프로세스당 1회 백그라운드에서 미리 생성
+# → 첫 영수증 업로드 시 인증/연결 지연 제거
+# 레지스트리가 시작 여부를 기억하므로 rerun마다 호출되어도 아무 작업도 하지 않음
+# =============================================================================
+import os
+from services.ocr_pipeline2.ocr.adapter_registry import registry as ocr_registry
+from services.ocr_pipeline2.ocr.google_vision_adapter import GoogleVisionAdapter
+
+ocr_registry.warm_up([os.getenv("OCR_ADAPTER", GoogleVisionAdapter.name)], background=True)
+
 # =============================================================================
 # 2. 브라우저 화면 너비 감지
 # =============================================================================
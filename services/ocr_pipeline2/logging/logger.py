@@ -1,5 +1,8 @@
 from datetime import datetime, timezone, timedelta
 import sys
+import time
+
+from .metrics import get_default_metrics
 
 KST = timezone(timedelta(hours=9))  # 한국 표준시
 
@@ -9,35 +12,61 @@ class PipelineLogger:
     파이프라인 운영 로그 관리 클래스
     - 콘솔 출력
     - 구조화된 이벤트 저장
+    - [변경] 이벤트마다 duration_ms 기록 + 단계별 지연 / 에러 집계(metrics)에 반영
+      단계 이벤트는 단계가 끝날 때 남기므로 duration_ms = 직전 이벤트(또는 logger 생성) 이후 경과 시간
+      monotonic clock(perf_counter) 기준 → 시스템 시계 변경 영향 없음
     """
 
-    def __init__(self, verbose: bool = True):
+    def __init__(self, verbose: bool = True, metrics=None):
         self.verbose = verbose
         self.events = []  # 이벤트 기록 저장
 
-    def log_event(self, stage: str, message: str, meta: dict = None):
+        # metrics : StageMetrics (None이면 프로세스 공용 집계, OCR_METRICS_ENABLED=0이면 집계 안 함)
+        self.metrics = metrics if metrics is not None else get_default_metrics()
+        self._mark = time.perf_counter()
+
+    def elapsed_ms(self) -> float:
+        """직전 이벤트(또는 logger 생성) 이후 경과 시간"""
+        return (time.perf_counter() - self._mark) * 1000
+
+    def _lap(self, duration_ms) -> float:
+        now = time.perf_counter()
+
+        if duration_ms is None:
+            duration_ms = (now - self._mark) * 1000
+
+        self._mark = now
+        return round(duration_ms, 3)
+
+    def log_event(self, stage: str, message: str, meta: dict = None, duration_ms: float = None):
         """
         단계별 로그 기록
         stage : 처리 단계 (OCR / PARSING 등)
         message : 간단 설명
         meta : 추가 메타정보
+        duration_ms : 단계 소요 시간 (생략하면 직전 이벤트 이후 경과 시간)
         """
 
         timestamp = datetime.now(KST).isoformat()
+        duration_ms = self._lap(duration_ms)
 
         event = {
             "timestamp": timestamp,
             "stage": stage,
             "message": message,
+            "duration_ms": duration_ms,
             "meta": meta or {}
         }
 
         # 내부 저장
         self.events.append(event)
 
+        if self.metrics is not None:
+            self.metrics.observe(stage, duration_ms)
+
         # 콘솔 출력
         if self.verbose:
-            print(f"[{timestamp}] [{stage}] {message}")
+            print(f"[{timestamp}] [{stage}] {message} ({duration_ms:.1f}ms)")
             sys.stdout.flush()
 
     def log_error(self, stage: str, error: Exception):
@@ -46,11 +75,13 @@ class PipelineLogger:
         """
 
         timestamp = datetime.now(KST).isoformat()
+        duration_ms = self._lap(None)
 
         event = {
             "timestamp": timestamp,
             "stage": stage,
             "message": "에러 발생",
+            "duration_ms": duration_ms,
             "meta": {
                 "error_type": type(error).__name__,
                 "error_message": str(error)
@@ -59,6 +90,9 @@ class PipelineLogger:
 
         self.events.append(event)
 
+        if self.metrics is not None:
+            self.metrics.observe(stage, duration_ms, error=True)
+
         if self.verbose:
             print(f"[{timestamp}] [ERROR:{stage}] {error}")
             sys.stdout.flush()
@@ -0,0 +1,272 @@
+"""
+파이프라인 단계별 지연 / 처리량 지표 (프로세스 내 집계)
+
+- PipelineLogger가 이벤트마다 단계 이름 + duration_ms(monotonic clock)를 기록
+- 단계별 누적 : 처리 건수 / 합계 / 에러 수 / 고정 bucket histogram (Prometheus histogram 형식)
+- 단계별 최근 RECENT_SAMPLES건 : p50 / p95 / p99 (snapshot 용)
+- 다른 모듈의 누적 카운터(재OCR 결과 등)도 register_counters로 등록하면 함께 내보냄
+- Prometheus text format 내보내기
+    write_textfile(path) : node_exporter textfile collector용 파일 (임시 파일 → rename, 원자적 교체)
+    start_http_server(port) : /metrics 엔드포인트 (데몬 스레드)
+
+설정 (환경변수):
+    OCR_METRICS_ENABLED    : "0"이면 집계 안 함 (기본 1)
+    OCR_METRICS_TEXTFILE   : 지정하면 OCR_METRICS_INTERVAL_S초마다 파일로 내보냄
+    OCR_METRICS_INTERVAL_S : 파일 내보내기 주기 (기본 15)
+    OCR_METRICS_PORT       : 지정하면 해당 포트에서 /metrics 제공
+"""
+
+import math
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# histogram bucket 상한 (ms) — 파싱(수 ms) ~ Vision 재시도 포함 OCR(수십 초)
+BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+
+RECENT_SAMPLES = 2048
+
+METRIC_PREFIX = "ocr_pipeline_stage"
+
+DEFAULT_INTERVAL_S = 15.0
+
+
+def _quantile(sorted_values: list, q: float) -> float:
+    """nearest-rank 분위수"""
+    index = max(0, math.ceil(q * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+class _StageStats:
+
+    __slots__ = ("count", "sum_ms", "errors", "buckets", "recent")
+
+    def __init__(self):
+        self.count = 0
+        self.sum_ms = 0.0
+        self.errors = 0
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)  # 마지막 = +Inf
+        self.recent = deque(maxlen=RECENT_SAMPLES)
+
+
+class StageMetrics:
+
+    def __init__(self):
+        self._stages = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+
+    def observe(self, stage: str, duration_ms: float, error: bool = False):
+        """
+        단계 1건 기록
+        error=True면 에러 수만 올림 (실패까지 걸린 시간은 지연 분포에 섞지 않음)
+        """
+
+        with self._lock:
+            stats = self._stages.get(stage)
+            if stats is None:
+                stats = self._stages[stage] = _StageStats()
+
+            if error:
+                stats.errors += 1
+                return
+
+            stats.count += 1
+            stats.sum_ms += duration_ms
+            stats.buckets[bisect_left(BUCKETS_MS, duration_ms)] += 1
+            stats.recent.append(duration_ms)
+
+    def snapshot(self) -> dict:
+        """
+        단계별 요약
+        {stage: {"count", "errors", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "per_s"}}
+        per_s : 집계 시작 이후 평균 처리량 (건/초)
+        """
+
+        with self._lock:
+            items = [
+                (stage, s.count, s.sum_ms, s.errors, sorted(s.recent))
+                for stage, s in self._stages.items()
+            ]
+
+        uptime = max(time.time() - self.started_at, 1e-9)
+        summary = {}
+
+        for stage, count, sum_ms, errors, recent in items:
+            summary[stage] = {
+                "count": count,
+                "errors": errors,
+                "mean_ms": round(sum_ms / count, 3) if count else 0.0,
+                "p50_ms": round(_quantile(recent, 0.50), 3) if recent else 0.0,
+                "p95_ms": round(_quantile(recent, 0.95), 3) if recent else 0.0,
+                "p99_ms": round(_quantile(recent, 0.99), 3) if recent else 0.0,
+                "per_s": round(count / uptime, 3),
+            }
+
+        return summary
+
+    def register_counters(self, name: str, help_text: str, label: str, read):
+        """
+        외부 누적 카운터 등록 (to_prometheus 때마다 read()로 현재 값을 읽어 counter로 내보냄)
+        read : () → {label 값: 누적 수}
+        같은 name으로 다시 등록하면 교체
+        """
+
+        with self._lock:
+            self._counters[name] = (help_text, label, read)
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+            self.started_at = time.time()
+
+    # --------------------------------------------------
+    # Prometheus text format
+    # --------------------------------------------------
+    def to_prometheus(self) -> str:
+        with self._lock:
+            items = sorted(
+                (stage, s.count, s.sum_ms, s.errors, list(s.buckets), sorted(s.recent))
+                for stage, s in self._stages.items()
+            )
+            counters = sorted(self._counters.items())
+
+        name = f"{METRIC_PREFIX}_duration_ms"
+        lines = [
+            f"# HELP {name} Pipeline stage duration in milliseconds.",
+            f"# TYPE {name} histogram",
+        ]
+
+        for stage, count, sum_ms, _, buckets, _ in items:
+            label = _label(stage)
+            cumulative = 0
+
+            for bound, n in zip(BUCKETS_MS, buckets):
+                cumulative += n
+                lines.append(f'{name}_bucket{{stage="{label}",le="{bound:g}"}} {cumulative}')
+
+            lines.append(f'{name}_bucket{{stage="{label}",le="+Inf"}} {count}')
+            lines.append(f'{name}_sum{{stage="{label}"}} {sum_ms:.3f}')
+            lines.append(f'{name}_count{{stage="{label}"}} {count}')
+
+        name = f"{METRIC_PREFIX}_errors_total"
+        lines += [
+            f"# HELP {name} Pipeline stage errors.",
+            f"# TYPE {name} counter",
+        ]
+        lines += [f'{name}{{stage="{_label(stage)}"}} {errors}' for stage, _, _, errors, _, _ in items]
+
+        # 최근 구간 분위수 (histogram은 fleet 합산용, 이 값은 프로세스 단위 확인용)
+        name = f"{METRIC_PREFIX}_recent_duration_ms"
+        lines += [
+            f"# HELP {name} Pipeline stage duration quantiles over the last {RECENT_SAMPLES} events.",
+            f"# TYPE {name} gauge",
+        ]
+
+        for stage, _, _, _, _, recent in items:
+            if not recent:
+                continue
+            for q in (0.5, 0.95, 0.99):
+                lines.append(
+                    f'{name}{{stage="{_label(stage)}",quantile="{q:g}"}} {_quantile(recent, q):.3f}'
+                )
+
+        # 등록된 외부 카운터 (read는 lock 밖에서 호출 — 각 모듈이 자체 lock으로 보호)
+        for name, (help_text, label, read) in counters:
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+            lines += [f'{name}{{{label}="{_label(str(key))}"}} {value}' for key, value in read().items()]
+
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: str):
+        """원자적 교체 (수집기가 쓰다 만 파일을 읽지 않도록)"""
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(self.to_prometheus(), encoding="utf-8")
+        os.replace(tmp, path)
+
+    def start_http_server(self, port: int, host: str = "0.0.0.0"):
+        """/metrics 엔드포인트 (데몬 스레드) → server 반환"""
+
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+
+                body = metrics.to_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, name="ocr-metrics-http", daemon=True).start()
+
+        return server
+
+    def start_textfile_writer(self, path: str, interval_s: float = DEFAULT_INTERVAL_S):
+        """interval_s마다 textfile 갱신 (데몬 스레드)"""
+
+        def loop():
+            while True:
+                time.sleep(interval_s)
+                try:
+                    self.write_textfile(path)
+                except OSError:
+                    # 디스크 오류가 파이프라인을 멈추지 않도록 다음 주기에 재시도
+                    pass
+
+        threading.Thread(target=loop, name="ocr-metrics-textfile", daemon=True).start()
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# --------------------------------------------------
+# 프로세스 공용 집계 (싱글톤)
+# --------------------------------------------------
+_default_metrics = None
+_default_metrics_lock = threading.Lock()
+
+
+def get_default_metrics():
+    """환경변수 기반 공용 집계 (OCR_METRICS_ENABLED=0이면 None) — 처음 생성 시 내보내기 시작"""
+
+    global _default_metrics
+
+    if os.getenv("OCR_METRICS_ENABLED", "1") == "0":
+        return None
+
+    with _default_metrics_lock:
+        if _default_metrics is None:
+            metrics = StageMetrics()
+
+            textfile = os.getenv("OCR_METRICS_TEXTFILE")
+            if textfile:
+                metrics.start_textfile_writer(
+                    textfile, float(os.getenv("OCR_METRICS_INTERVAL_S", DEFAULT_INTERVAL_S))
+                )
+
+            port = os.getenv("OCR_METRICS_PORT")
+            if port:
+                metrics.start_http_server(int(port))
+
+            _default_metrics = metrics
+
+    return _default_metrics
@@ -0,0 +1,183 @@
+"""
+OCR 어댑터 레지스트리 (프로세스 단위 싱글톤)
+
+- 어댑터(= Vision ImageAnnotatorClient + gRPC 채널)를 프로세스당 1회만 생성
+  → 요청마다 인증 정보 확인 / vision import / 채널 연결을 반복하지 않음
+- 여러 Streamlit 세션(스레드)에서 동시에 get()해도 생성은 한 번만 일어남
+- 앱 시작 시 warm_up()으로 미리 생성 가능
+- 생성 시간 / 재사용 횟수 통계 제공
+  (어댑터가 startup_metrics를 제공하면 함께 기록 — 예: 인증 정보 로드 시간)
+
+사용 예시:
+    from services.ocr_pipeline2.ocr.adapter_registry import get_adapter
+    adapter = get_adapter("google_vision")
+    result = adapter.run(image_path)
+"""
+
+import threading
+import time
+
+from .google_vision_adapter import GoogleVisionAdapter
+from .replay_adapter import replay_adapter_from_env, recording_adapter_from_env
+
+
+class AdapterRegistry:
+
+    def __init__(self):
+        self._factories = {}
+        self._instances = {}
+        self._stats = {}
+
+        # 레지스트리 구조 보호용 lock + 어댑터별 생성 lock
+        self._lock = threading.Lock()
+        self._create_locks = {}
+
+        # 백그라운드 warm-up을 이미 시작한 어댑터 (rerun마다 스레드를 다시 띄우지 않음)
+        self._warm_started = set()
+
+    def register(self, name: str, factory):
+        """
+        name : 어댑터 이름 (예: "google_vision")
+        factory : 인자 없는 callable (예: GoogleVisionAdapter 클래스)
+        """
+
+        with self._lock:
+            self._factories[name] = factory
+            self._create_locks.setdefault(name, threading.Lock())
+            self._stats.setdefault(name, {
+                "created": 0,
+                "acquired": 0,
+                "init_ms": None,
+                "created_at": None,
+                "last_error": None,
+                "startup": {}
+            })
+
+    def get(self, name: str):
+        """
+        어댑터 반환 (없으면 생성)
+        생성 중인 다른 스레드가 있으면 완료될 때까지 대기 후 같은 인스턴스 공유
+        """
+
+        instance = self._instances.get(name)
+
+        if instance is None:
+            if name not in self._factories:
+                raise KeyError(f"등록되지 않은 OCR 어댑터: {name}")
+
+            with self._create_locks[name]:
+                instance = self._instances.get(name)
+
+                if instance is None:
+                    instance = self._create(name)
+
+        with self._lock:
+            self._stats[name]["acquired"] += 1
+
+        return instance
+
+    def _create(self, name: str):
+        """어댑터 생성 (생성 lock 안에서 호출)"""
+
+        stats = self._stats[name]
+        started = time.perf_counter()
+
+        try:
+            instance = self._factories[name]()
+        except Exception as e:
+            stats["last_error"] = f"{type(e).__name__}: {e}"
+            raise
+
+        stats["created"] += 1
+        stats["init_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        stats["created_at"] = time.time()
+        stats["last_error"] = None
+        stats["startup"] = dict(getattr(instance, "startup_metrics", {}))
+
+        self._instances[name] = instance
+
+        return instance
+
+    def warm_up(self, names=None, background: bool = False) -> dict:
+        """
+        어댑터 미리 생성 (앱 시작 시 호출)
+        - 실패해도 예외를 올리지 않고 결과에 기록 (첫 요청에서 다시 시도)
+        - background=True면 데몬 스레드에서 생성하고 즉시 반환
+          프로세스당 어댑터별 1회만 시작 (이후 호출은 아무 작업도 하지 않음)
+
+        반환: {name: {"ok": bool, "init_ms": float, "error": str}}
+        """
+
+        names = list(names or self._factories)
+
+        if background:
+            with self._lock:
+                names = [name for name in names if name not in self._warm_started]
+                self._warm_started.update(names)
+
+            if not names:
+                return {}
+
+            threading.Thread(
+                target=self.warm_up, args=(names,), name="ocr-adapter-warmup", daemon=True
+            ).start()
+            return {}
+
+        results = {}
+
+        for name in names:
+            try:
+                self.get(name)
+                results[name] = {"ok": True, "init_ms": self._stats[name]["init_ms"], "error": None}
+            except Exception as e:
+                results[name] = {"ok": False, "init_ms": None, "error": f"{type(e).__name__}: {e}"}
+
+        return results
+
+    def reset(self, name: str = None):
+        """인스턴스 폐기 (인증 정보 교체 / 테스트용) — 다음 get()에서 재생성"""
+
+        with self._lock:
+            if name is None:
+                self._instances.clear()
+                self._warm_started.clear()
+            else:
+                self._instances.pop(name, None)
+                self._warm_started.discard(name)
+
+    def stats(self) -> dict:
+        """
+        어댑터별 채널 재사용 통계
+        reused = 생성 없이 기존 인스턴스를 돌려준 횟수
+        """
+
+        with self._lock:
+            result = {}
+
+            for name, s in self._stats.items():
+                reused = max(s["acquired"] - s["created"], 0)
+                result[name] = {
+                    **s,
+                    "alive": name in self._instances,
+                    "reused": reused,
+                    "reuse_ratio": reused / s["acquired"] if s["acquired"] else 0.0
+                }
+
+            return result
+
+
+# --------------------------------------------------
+# 프로세스 공용 레지스트리
+# --------------------------------------------------
+registry = AdapterRegistry()
+registry.register(GoogleVisionAdapter.name, GoogleVisionAdapter)
+registry.register("replay", replay_adapter_from_env)
+registry.register("record", recording_adapter_from_env)
+
+
+def get_adapter(name: str = GoogleVisionAdapter.name):
+    return registry.get(name)
+
+
+def warm_up_adapters(names=None, background: bool = False) -> dict:
+    return registry.warm_up(names, background=background)
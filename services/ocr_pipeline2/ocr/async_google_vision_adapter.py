@@ -0,0 +1,126 @@
+"""
+Google Vision 비동기 어댑터 (ImageAnnotatorAsyncClient)
+
+- 인증 정보 확인 / 결과 구조는 GoogleVisionAdapter와 동일
+- run()은 코루틴 → 여러 업로드의 Vision 대기 시간을 하나의 이벤트 루프에서 겹침
+- 파일 읽기는 asyncio.to_thread로 처리해 이벤트 루프를 막지 않음
+- run_bytes / run_bytes_document / run_batch_bytes 모두 코루틴으로 오버라이드
+  (부모의 동기 메서드가 async 클라이언트로 호출되어 코루틴 객체를 응답처럼 다루는 일이 없도록)
+- 재시도 / hedging / breaker(CallPolicy)는 적용하지 않고 deadline만 적용
+- 이 어댑터를 쓰는 run_pipeline_async는 OCR → 파싱 → 검증만 수행
+  (재OCR(rescue) / 여러 영수증 분리 / 유사 이미지 중복 감지는 동기 run_pipeline 전용)
+
+주의: async gRPC 채널은 생성된 이벤트 루프에 묶이므로
+      프로세스 공용 레지스트리(adapter_registry)가 아니라 루프마다 1개씩 생성해서 사용
+"""
+
+import asyncio
+from pathlib import Path
+
+from .google_vision_adapter import GoogleVisionAdapter
+
+
+class AsyncGoogleVisionAdapter(GoogleVisionAdapter):
+
+    def _create_client(self, vision, credentials):
+        return vision.ImageAnnotatorAsyncClient(credentials=credentials)
+
+    async def run(self, image_path: str) -> dict:
+
+        content = await asyncio.to_thread(Path(image_path).read_bytes)
+        return await self.run_bytes(content, image_path)
+
+    def _request(self, content, feature_type):
+        # async 클라이언트에는 text_detection 헬퍼가 없어 annotate 요청을 직접 구성
+        return self.vision.AnnotateImageRequest(
+            image=self._image(content),
+            features=[self.vision.Feature(type_=feature_type)]
+        )
+
+    async def _batch_annotate(self, requests: list) -> list:
+        # [변경] 비동기 경로는 deadline만 적용 (재시도 / hedging은 동기 CallPolicy 전용)
+        response = await self.client.batch_annotate_images(
+            requests=requests, retry=None, timeout=self.policy.deadline_s
+        )
+        return response.responses
+
+    async def _annotate_one(self, content, name: str, feature_type, preprocess: dict = None) -> dict:
+        response = (await self._batch_annotate([self._request(content, feature_type)]))[0]
+
+        if response.error.message:
+            raise RuntimeError(response.error.message)
+
+        return self._to_result(name, response, preprocess)
+
+    async def run_bytes(self, content, name: str) -> dict:
+        """이미지 바이트(bytes / memoryview)로 OCR (캐시 key 계산 시 읽은 바이트 재사용)"""
+
+        # 전처리는 CPU 작업 → 스레드에서 실행
+        if self.preprocessor is not None:
+            content, preprocess = await asyncio.to_thread(self._prepare, content)
+        else:
+            preprocess = None
+
+        return await self._annotate_one(
+            content, name, self.vision.Feature.Type.TEXT_DETECTION, preprocess
+        )
+
+    async def run_bytes_document(self, content, name: str, preprocessor=None) -> dict:
+        """재OCR용 document_text_detection (동기 어댑터와 같은 결과 구조)"""
+
+        if preprocessor is not None:
+            content, preprocess = await asyncio.to_thread(preprocessor, content)
+        elif self.preprocessor is not None:
+            content, preprocess = await asyncio.to_thread(self._prepare, content)
+        else:
+            preprocess = None
+
+        result = await self._annotate_one(
+            content, name, self.vision.Feature.Type.DOCUMENT_TEXT_DETECTION, preprocess
+        )
+        result["feature"] = "document_text_detection"
+
+        return result
+
+    async def run_batch_bytes(self, items: list) -> list:
+        """
+        최대 MAX_BATCH_IMAGES장씩 batch_annotate_images로 OCR (배치끼리는 동시 요청)
+        요청 자체 실패는 해당 배치만, 응답의 이미지별 error는 해당 이미지만 실패 처리
+        """
+
+        results = [None] * len(items)
+
+        # 전처리(배치 분할 포함)는 CPU 작업 → 스레드에서 실행
+        batches = await asyncio.to_thread(lambda: list(self._iter_batches(items)))
+        feature_type = self.vision.Feature.Type.TEXT_DETECTION
+
+        async def _one(batch):
+            requests = [self._request(content, feature_type) for _, _, content, _ in batch]
+
+            try:
+                responses = await self._batch_annotate(requests)
+            except Exception as e:
+                for idx, name, _, _ in batch:
+                    results[idx] = self.error_result(name, e)
+                return
+
+            for (idx, name, _, preprocess), res in zip(batch, responses):
+                if res.error.message:
+                    results[idx] = self.error_result(name, res.error.message)
+                else:
+                    results[idx] = self._to_result(name, res, preprocess)
+
+        await asyncio.gather(*(_one(batch) for batch in batches))
+
+        return results
+
+    async def run_batch(self, image_paths: list) -> list:
+        """동시 요청으로 처리 (순서 유지, 이미지별 실패 분리)"""
+
+        async def _one(image_path):
+            try:
+                return await self.run(image_path)
+            except Exception as e:
+                return self.error_result(image_path, e)
+
+        return list(await asyncio.gather(*(_one(p) for p in image_paths)))
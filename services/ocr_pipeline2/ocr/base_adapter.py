@@ -2,8 +2,16 @@ class OCRAdapter:
     """
     OCR 어댑터 기본 인터페이스
     모든 OCR 구현체는 아래 구조를 반환해야 함
+
+    [변경] 구현체는 run_bytes()만 구현하면 됨
+    - run()       : 파일을 읽어 run_bytes()로 전달
+    - run_batch() : 파일을 읽어 run_batch_bytes()로 전달
+    업로드 파일(메모리)은 임시 파일 없이 run_bytes() / run_batch_bytes()로 바로 처리
     """
 
+    # OCR 엔진 이름 (결과의 "adapter" 값 / 캐시 key에 사용)
+    name = "ocr"
+
     def run(self, image_path: str) -> dict:
         """
         반환 구조:
@@ -11,10 +19,87 @@ class OCRAdapter:
         {
             "adapter": str,        # OCR 엔진 이름
             "image_name": str,     # 입력 이미지 경로 또는 파일명
-            "full_text": str       # OCR 전체 텍스트
+            "full_text": str,      # OCR 전체 텍스트
+            "layout": WordLayout   # (선택) 단어 텍스트 / 위치 / confidence 열 배열
         }
 
-        ※ 구조 정보(words, lines 등)는 현재 파이프라인에서 사용하지 않음.
-        ※ 향후 확장 시 별도 계층에서 처리.
+        [변경] 단어 위치 정보는 "layout"(word_layout.WordLayout)으로 선택 제공.
+        ※ 위치 정보를 주지 않는 엔진은 생략 가능 — 파이프라인은 full_text만으로도 동작.
+        """
+
+        with open(image_path, "rb") as f:
+            content = f.read()
+
+        return self.run_bytes(content, image_path)
+
+    def run_bytes(self, content, name: str) -> dict:
+        """
+        이미지 바이트로 OCR (반환 구조는 run()과 동일)
+        content : bytes 또는 memoryview (예: Streamlit UploadedFile.getbuffer()) — 복사하지 않고 그대로 사용
+        name    : 결과의 image_name (업로드 파일명 등)
         """
         raise NotImplementedError
+
+    def run_bytes_document(self, content, name: str, preprocessor=None) -> dict:
+        """
+        [변경] 재OCR용 — 문서(밀집 텍스트) 모드 + 지정 전처리로 OCR (반환 구조는 run()과 동일)
+        preprocessor : content → (bytes, info) callable (None이면 기본 전처리)
+        지원하지 않는 엔진은 NotImplementedError (파이프라인은 재OCR 생략)
+        """
+        raise NotImplementedError
+
+    def run_batch(self, image_paths: list) -> list:
+        """
+        여러 이미지를 한 번에 OCR
+        반환: 입력 순서와 같은 결과 리스트
+              - 성공 : run()과 동일한 구조
+              - 실패 : {"adapter", "image_name", "error"} (해당 이미지만 실패 처리)
+        """
+
+        results = [None] * len(image_paths)
+        items = []
+        positions = []
+
+        for idx, image_path in enumerate(image_paths):
+            try:
+                with open(image_path, "rb") as f:
+                    items.append((f.read(), image_path))
+                positions.append(idx)
+            except OSError as e:
+                results[idx] = self.error_result(image_path, e)
+
+        for idx, result in zip(positions, self.run_batch_bytes(items)):
+            results[idx] = result
+
+        return results
+
+    def run_batch_bytes(self, items: list) -> list:
+        """
+        items : [(content, name), ...]
+        반환 규칙은 run_batch()와 동일
+
+        기본 구현은 run_bytes()를 순서대로 호출.
+        배치 API가 있는 엔진은 오버라이드해서 왕복 횟수를 줄임.
+        """
+
+        results = []
+
+        for content, name in items:
+            try:
+                results.append(self.run_bytes(content, name))
+            except Exception as e:
+                results.append(self.error_result(name, e))
+
+        return results
+
+    def error_result(self, image_path: str, error) -> dict:
+        """run_batch의 이미지별 실패 결과"""
+
+        if isinstance(error, Exception):
+            error = f"{type(error).__name__}: {error}"
+
+        return {
+            "adapter": self.name,
+            "image_name": image_path,
+            "error": error
+        }
@@ -0,0 +1,287 @@
+"""
+Vision 호출 정책 (deadline / 재시도 / circuit breaker / hedging)
+
+- deadline   : 요청마다 gRPC timeout 지정 → 느린 RPC 하나가 업로드 전체를 붙잡지 않음
+- 재시도     : 일시적 오류(UNAVAILABLE, DEADLINE_EXCEEDED 등)만 지수 백오프 + full jitter로 재시도
+               쿼터 초과(RESOURCE_EXHAUSTED)는 재시도하지 않음 → 대기는 쿼터 스케줄러가 담당
+- breaker    : 연속 실패가 threshold를 넘으면 reset_s 동안 호출 차단 (즉시 실패)
+               이후 1회 시험 호출(half-open)이 성공하면 복구
+- hedging    : 첫 요청이 hedge_after 안에 끝나지 않으면 같은 요청을 한 번 더 보내고 먼저 온 응답 사용
+               "auto"면 최근 성공 지연의 p95를 기준으로 사용 (표본이 쌓이기 전에는 hedging 안 함)
+
+재시도 / hedging 요청은 쿼터 스케줄러 토큰을 따로 받지 않음 (이미지 1장 = 토큰 1개)
+→ 쿼터에 여유가 없으면 OCR_HEDGE=off 유지, OCR_QUOTA_RPM을 실제 쿼터보다 낮게 설정
+
+호출 결과와 함께 시도 횟수 / 지연 / hedging 여부를 stats로 반환 → 파이프라인 OCR 이벤트에 기록
+
+설정 (환경변수):
+    OCR_DEADLINE_S         : 요청당 deadline (기본 10)
+    OCR_MAX_ATTEMPTS       : 최대 시도 횟수 (기본 3)
+    OCR_BACKOFF_BASE_MS    : 백오프 기본값 (기본 200)
+    OCR_BACKOFF_MAX_MS     : 백오프 상한 (기본 2000)
+    OCR_HEDGE              : off / auto / 밀리초 (기본 off)
+    OCR_BREAKER_THRESHOLD  : breaker 열림 기준 연속 실패 수 (기본 5)
+    OCR_BREAKER_RESET_S    : breaker 열림 유지 시간 (기본 30)
+"""
+
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+# google.api_core.exceptions 클래스 이름 기준 (import 없이 MRO로 판별)
+# [변경] TooManyRequests(RESOURCE_EXHAUSTED) 제외 — 쿼터 초과 시 재시도하면 초과 호출만 늘어남
+RETRYABLE_ERRORS = {
+    "ServiceUnavailable",      # UNAVAILABLE
+    "DeadlineExceeded",        # DEADLINE_EXCEEDED
+    "InternalServerError",     # INTERNAL
+    "Aborted",                 # ABORTED
+    "TimeoutError",
+    "ConnectionError",
+}
+
+HEDGE_MIN_SAMPLES = 20
+
+
+class CircuitOpenError(RuntimeError):
+    """breaker가 열려 있어 호출하지 않음"""
+
+
+def is_retryable(error: Exception) -> bool:
+    return any(cls.__name__ in RETRYABLE_ERRORS for cls in type(error).__mro__)
+
+
+class CircuitBreaker:
+
+    def __init__(self, failure_threshold: int = 5, reset_s: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_s = reset_s
+
+        self.failures = 0
+        self.opened_at = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_s:
+            return "half_open"
+        return "open"
+
+    def allow(self):
+        """호출 가능 여부 확인 (불가하면 CircuitOpenError)"""
+
+        with self._lock:
+            state = self.state
+
+            if state == "closed":
+                return
+
+            # half-open : 시험 호출 1건만 통과
+            if state == "half_open" and not self._trial:
+                self._trial = True
+                return
+
+        raise CircuitOpenError("Vision 호출 차단 중 (circuit breaker open)")
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial = False
+
+            if self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+
+class LatencyTracker:
+    """최근 성공 호출 지연 (hedge "auto" 기준값 계산용)"""
+
+    def __init__(self, size: int = 200):
+        self._values = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float):
+        with self._lock:
+            self._values.append(seconds)
+
+    def p95(self):
+        with self._lock:
+            if len(self._values) < HEDGE_MIN_SAMPLES:
+                return None
+            values = sorted(self._values)
+
+        return values[int(0.95 * (len(values) - 1))]
+
+
+# hedging 요청 실행용 (프로세스 공용)
+_call_executor = None
+_call_executor_lock = threading.Lock()
+
+
+def _get_call_executor():
+    global _call_executor
+
+    with _call_executor_lock:
+        if _call_executor is None:
+            _call_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="ocr-call")
+
+    return _call_executor
+
+
+class CallPolicy:
+
+    def __init__(
+        self,
+        deadline_s: float = 10.0,
+        max_attempts: int = 3,
+        backoff_base_s: float = 0.2,
+        backoff_max_s: float = 2.0,
+        hedge=None,
+        breaker: CircuitBreaker = None,
+    ):
+        """
+        hedge : None(사용 안 함) / "auto"(최근 p95) / 초 단위 숫자
+        """
+
+        self.deadline_s = deadline_s
+        self.max_attempts = max(1, max_attempts)
+        self.backoff_base_s = backoff_base_s
+        self.backoff_max_s = backoff_max_s
+        self.hedge = hedge
+        self.breaker = breaker or CircuitBreaker()
+        self.latency = LatencyTracker()
+
+    @classmethod
+    def from_env(cls):
+        hedge = os.getenv("OCR_HEDGE", "off")
+
+        if hedge == "off":
+            hedge = None
+        elif hedge != "auto":
+            hedge = float(hedge) / 1000
+
+        return cls(
+            deadline_s=float(os.getenv("OCR_DEADLINE_S", 10)),
+            max_attempts=int(os.getenv("OCR_MAX_ATTEMPTS", 3)),
+            backoff_base_s=float(os.getenv("OCR_BACKOFF_BASE_MS", 200)) / 1000,
+            backoff_max_s=float(os.getenv("OCR_BACKOFF_MAX_MS", 2000)) / 1000,
+            hedge=hedge,
+            breaker=CircuitBreaker(
+                failure_threshold=int(os.getenv("OCR_BREAKER_THRESHOLD", 5)),
+                reset_s=float(os.getenv("OCR_BREAKER_RESET_S", 30)),
+            ),
+        )
+
+    def _hedge_after(self):
+        if self.hedge == "auto":
+            return self.latency.p95()
+        return self.hedge
+
+    def _backoff(self, attempt: int) -> float:
+        # full jitter : 0 ~ min(max, base * 2^(n-1))
+        return random.uniform(0, min(self.backoff_max_s, self.backoff_base_s * 2 ** (attempt - 1)))
+
+    def _attempt(self, fn, stats: dict):
+        """1회 시도 (hedging 포함) — 먼저 성공한 응답 반환"""
+
+        hedge_after = self._hedge_after()
+
+        if hedge_after is None:
+            stats["attempts"] += 1
+            return fn(self.deadline_s)
+
+        executor = _get_call_executor()
+        stats["attempts"] += 1
+        futures = [executor.submit(fn, self.deadline_s)]
+
+        done, _ = wait(futures, timeout=hedge_after)
+
+        if not done:
+            stats["attempts"] += 1
+            stats["hedged"] = True
+            stats["hedge_after_ms"] = round(hedge_after * 1000, 1)
+            futures.append(executor.submit(fn, self.deadline_s))
+
+        # 늦게 끝난 쪽은 deadline 안에서 백그라운드로 종료됨
+        pending = set(futures)
+        error = None
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                if future.exception() is None:
+                    stats["hedge_won"] = future is not futures[0]
+                    return future.result()
+                error = future.exception()
+
+        raise error
+
+    def call(self, fn):
+        """
+        fn : timeout(초)을 받아 RPC를 수행하는 callable
+        반환: (응답, stats)
+        실패 시 마지막 예외에 call_stats 속성을 붙여 다시 발생
+        """
+
+        stats = {
+            "attempts": 0,
+            "retries": 0,
+            "hedged": False,
+            "hedge_won": False,
+            "latency_ms": None,
+            "breaker": self.breaker.state
+        }
+
+        started = time.perf_counter()
+
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                self.breaker.allow()
+
+                attempt_started = time.perf_counter()
+                response = self._attempt(fn, stats)
+
+                self.latency.add(time.perf_counter() - attempt_started)
+                self.breaker.record_success()
+
+                stats["latency_ms"] = round((time.perf_counter() - started) * 1000, 2)
+                stats["breaker"] = self.breaker.state
+
+                return response, stats
+
+            except CircuitOpenError as e:
+                error = e
+                break
+
+            except Exception as e:
+                error = e
+
+                # 요청 자체 오류(INVALID_ARGUMENT 등)는 서비스가 응답한 것이므로 breaker에 반영하지 않음
+                if not is_retryable(e):
+                    self.breaker.record_success()
+                    break
+
+                self.breaker.record_failure()
+
+                if attempt == self.max_attempts:
+                    break
+
+                stats["retries"] += 1
+                time.sleep(self._backoff(attempt))
+
+        stats["latency_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        stats["breaker"] = self.breaker.state
+        error.call_stats = stats
+
+        raise error
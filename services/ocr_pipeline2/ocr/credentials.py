@@ -0,0 +1,91 @@
+"""
+GCP 서비스 계정 인증 정보 (프로세스당 1회 메모리 로드)
+
+- 우선순위
+  1) .env의 GOOGLE_APPLICATION_CREDENTIALS (JSON 키 파일 경로)
+  2) Streamlit Secrets의 [gcp_service_account] 섹션
+- 인증 정보 객체를 Vision 클라이언트에 직접 전달
+  → 임시 JSON 파일 생성 / os.environ 변경 없음 (장시간 실행 서버에서 파일 누적 방지)
+- 로드 소요 시간 / 출처를 credential_stats()로 제공 (adapter_registry 시작 지표에 포함)
+"""
+
+import os
+import threading
+import time
+
+_credentials = None
+_stats = {"source": None, "resolve_ms": None, "resolved_at": None}
+_lock = threading.Lock()
+
+
+def _from_env():
+    path = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
+
+    if not path or not os.path.exists(path):
+        return None
+
+    from google.oauth2 import service_account
+    return service_account.Credentials.from_service_account_file(path)
+
+
+def _from_streamlit_secrets():
+    try:
+        import streamlit as st
+        info = st.secrets.get("gcp_service_account")
+    except Exception:
+        return None
+
+    if not info:
+        return None
+
+    from google.oauth2 import service_account
+    return service_account.Credentials.from_service_account_info(dict(info))
+
+
+def get_credentials():
+    """프로세스 공용 인증 정보 반환 (최초 1회만 로드)"""
+
+    global _credentials
+
+    if _credentials is not None:
+        return _credentials
+
+    with _lock:
+        if _credentials is not None:
+            return _credentials
+
+        started = time.perf_counter()
+
+        for source, loader in (("env", _from_env), ("streamlit_secrets", _from_streamlit_secrets)):
+            credentials = loader()
+            if credentials is not None:
+                break
+        else:
+            raise RuntimeError(
+                "GOOGLE_APPLICATION_CREDENTIALS not set. "
+                "로컬 .env에 JSON 경로를 지정하거나, "
+                "Streamlit Secrets에 [gcp_service_account] 섹션을 추가하세요."
+            )
+
+        _stats.update(
+            source=source,
+            resolve_ms=round((time.perf_counter() - started) * 1000, 2),
+            resolved_at=time.time()
+        )
+        _credentials = credentials
+
+    return _credentials
+
+
+def credential_stats() -> dict:
+    return dict(_stats)
+
+
+def reset_credentials():
+    """인증 정보 교체 시 (다음 get_credentials()에서 다시 로드)"""
+
+    global _credentials
+
+    with _lock:
+        _credentials = None
+        _stats.update(source=None, resolve_ms=None, resolved_at=None)
@@ -1,67 +1,184 @@
 from .base_adapter import OCRAdapter
-import os
-import json
-import tempfile
+from .preprocess import get_default_preprocessor
+from .call_policy import CallPolicy
+from .credentials import get_credentials, credential_stats
+from .word_layout import WordLayout
+import time
+
+# batch_annotate_images 요청당 한도 (이미지 16장 / 요청 크기 여유분 포함 8MB)
+MAX_BATCH_IMAGES = 16
+MAX_BATCH_BYTES = 8 * 1024 * 1024
 
 
 class GoogleVisionAdapter(OCRAdapter):
 
-    def __init__(self):
-        cred_path = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
+    name = "google_vision"
+
+    def __init__(self, preprocessor=None, policy: CallPolicy = None):
+        """
+        preprocessor : content(bytes) → (bytes, info) callable
+                       (None이면 환경변수 설정 사용, 설정이 꺼져 있으면 전처리 안 함)
+        policy       : deadline / 재시도 / breaker / hedging 정책 (None이면 환경변수 설정 사용)
+        """
+
+        self.preprocessor = preprocessor or get_default_preprocessor()
+        self.policy = policy or CallPolicy.from_env()
 
-        # 로컬 JSON 파일이 없으면 Streamlit Secrets에서 가져와 임시 파일 생성
-        if not cred_path or not os.path.exists(cred_path):
-            cred_path = self._load_from_streamlit_secrets()
+        # [변경] 임시 JSON 파일 대신 프로세스 공용 인증 정보 객체를 클라이언트에 직접 전달
+        started = time.perf_counter()
+        credentials = get_credentials()
 
-        if not cred_path:
-            raise RuntimeError(
-                "GOOGLE_APPLICATION_CREDENTIALS not set. "
-                "로컬 .env에 JSON 경로를 지정하거나, "
-                "Streamlit Secrets에 [gcp_service_account] 섹션을 추가하세요."
-            )
+        self.startup_metrics = {
+            "credentials_wait_ms": round((time.perf_counter() - started) * 1000, 2),
+            **{f"credentials_{k}": v for k, v in credential_stats().items()}
+        }
 
         from google.cloud import vision
         self.vision = vision
-        self.client = vision.ImageAnnotatorClient()
-
-    @staticmethod
-    def _load_from_streamlit_secrets():
-        """Streamlit Secrets의 [gcp_service_account]에서 임시 JSON 파일 생성"""
-        try:
-            import streamlit as st
-            gcp_info = st.secrets.get("gcp_service_account")
-            if not gcp_info:
-                return None
-
-            # dict로 변환 후 임시 JSON 파일에 저장
-            gcp_dict = dict(gcp_info)
-            tmp = tempfile.NamedTemporaryFile(
-                mode="w", suffix=".json", delete=False, encoding="utf-8"
-            )
-            json.dump(gcp_dict, tmp)
-            tmp.close()
-
-            os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = tmp.name
-            return tmp.name
-        except Exception:
-            return None
-
-    def run(self, image_path: str) -> dict:
-
-        with open(image_path, "rb") as f:
-            content = f.read()
-
-        image = self.vision.Image(content=content)
-        response = self.client.text_detection(image=image)
+        self.client = self._create_client(vision, credentials)
+
+    def _create_client(self, vision, credentials):
+        """Vision 클라이언트 생성 (비동기 어댑터에서 오버라이드)"""
+        return vision.ImageAnnotatorClient(credentials=credentials)
+
+    # [변경] run()은 기본 구현(파일 읽기 → run_bytes) 사용
+    def run_bytes(self, content, name: str) -> dict:
+        content, preprocess = self._prepare(content)
+        return self._annotate(self.client.text_detection, content, name, preprocess)
+
+    def run_bytes_document(self, content, name: str, preprocessor=None) -> dict:
+        """재OCR용 document_text_detection (밀집 텍스트 / 작은 글씨에 강함)"""
+
+        if preprocessor is not None:
+            content, preprocess = preprocessor(content)
+        else:
+            content, preprocess = self._prepare(content)
+
+        result = self._annotate(self.client.document_text_detection, content, name, preprocess)
+        result["feature"] = "document_text_detection"
+
+        return result
+
+    def _annotate(self, detect, content, name: str, preprocess: dict = None) -> dict:
+
+        image = self._image(content)
+
+        # [변경] 클라이언트 기본 retry는 끄고 CallPolicy에서 deadline / 재시도 / hedging 처리
+        response, call = self.policy.call(
+            lambda timeout: detect(image=image, retry=None, timeout=timeout)
+        )
 
         if response.error.message:
             raise RuntimeError(response.error.message)
 
+        result = self._to_result(name, response, preprocess)
+        result["call"] = call
+
+        return result
+
+    def _image(self, content):
+        # protobuf bytes 필드는 bytes만 허용 → memoryview는 요청 생성 시점에 한 번만 변환
+        if not isinstance(content, bytes):
+            content = bytes(content)
+
+        return self.vision.Image(content=content)
+
+    def _prepare(self, content: bytes):
+        """전처리 적용 (설정이 없으면 원본 그대로) → (content, info 또는 None)"""
+
+        if self.preprocessor is None:
+            return content, None
+
+        return self.preprocessor(content)
+
+    def _to_result(self, image_path: str, response, preprocess: dict = None) -> dict:
+        """AnnotateImageResponse → 공통 OCR 결과 구조"""
+
         texts = response.text_annotations
         raw_text = texts[0].description if texts else ""
 
-        return {
-            "adapter": "google_vision",
+        result = {
+            "adapter": self.name,
             "image_name": image_path,
             "full_text": raw_text
-        }
\ No newline at end of file
+        }
+
+        # [변경] 단어 위치 정보 — 응답 참조만 보관하고 첫 접근 시 열 배열로 변환
+        if len(texts) > 1:
+            result["layout"] = WordLayout.from_response(response)
+
+        if preprocess is not None:
+            result["preprocess"] = preprocess
+
+        return result
+
+    # --------------------------------------------------
+    # 배치 요청 (batch_annotate_images)
+    # --------------------------------------------------
+    def _iter_batches(self, items: list):
+        """
+        (index, name, content, preprocess) 묶음을 요청 한도 이내로 분할
+        요청 크기 한도는 전처리 후 바이트 기준
+        """
+
+        batch = []
+        batch_bytes = 0
+
+        for idx, (content, name) in enumerate(items):
+
+            content, preprocess = self._prepare(content)
+
+            if batch and (
+                len(batch) >= MAX_BATCH_IMAGES
+                or batch_bytes + len(content) > MAX_BATCH_BYTES
+            ):
+                yield batch
+                batch = []
+                batch_bytes = 0
+
+            batch.append((idx, name, content, preprocess))
+            batch_bytes += len(content)
+
+        if batch:
+            yield batch
+
+    def run_batch_bytes(self, items: list) -> list:
+        """
+        최대 MAX_BATCH_IMAGES장씩 batch_annotate_images 1회로 OCR
+        응답의 이미지별 error는 해당 이미지 결과에만 반영
+        """
+
+        results = [None] * len(items)
+        feature = self.vision.Feature(type_=self.vision.Feature.Type.TEXT_DETECTION)
+
+        for batch in self._iter_batches(items):
+
+            requests = [
+                self.vision.AnnotateImageRequest(
+                    image=self._image(content),
+                    features=[feature]
+                )
+                for _, _, content, _ in batch
+            ]
+
+            try:
+                response, call = self.policy.call(
+                    lambda timeout: self.client.batch_annotate_images(
+                        requests=requests, retry=None, timeout=timeout
+                    )
+                )
+            except Exception as e:
+                # 요청 자체 실패 → 해당 배치 전체 실패
+                for idx, name, _, _ in batch:
+                    results[idx] = self.error_result(name, e)
+                    results[idx]["call"] = getattr(e, "call_stats", None)
+                continue
+
+            for (idx, name, _, preprocess), res in zip(batch, response.responses):
+                if res.error.message:
+                    results[idx] = self.error_result(name, res.error.message)
+                else:
+                    results[idx] = self._to_result(name, res, preprocess)
+                    results[idx]["call"] = call
+
+        return results
@@ -0,0 +1,277 @@
+"""
+OCR 결과 로컬 캐시 (SQLite)
+
+- key : 이미지 바이트의 SHA-256 + OCR 어댑터 이름 + 전처리 설정(클래스 / max_edge / 흑백 / JPEG 품질)
+- value : OCR full_text + 단어 위치 정보(layout, 열 배열 BLOB — 없으면 NULL)
+- 전체 크기 상한(max_bytes) 초과 시 가장 오래 조회되지 않은 항목부터 제거 (LRU)
+- hit / miss / eviction 카운터 제공
+
+같은 사진을 다시 올리거나 Streamlit rerun으로 ocr_results가 비워져도
+Vision API를 다시 호출하지 않도록 함
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from .base_adapter import OCRAdapter
+from .preprocess import preprocess_fingerprint
+from .word_layout import WordLayout
+
+DEFAULT_CACHE_PATH = "data/cache/ocr_cache.sqlite3"
+DEFAULT_MAX_MB = 256
+
+
+def image_digest(content) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+class OCRCache:
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_bytes: int = DEFAULT_MAX_MB * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+        # Streamlit 세션(스레드) 간 공유 → 연결 1개 + lock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS ocr_cache (
+                key TEXT PRIMARY KEY,
+                adapter TEXT NOT NULL,
+                full_text TEXT NOT NULL,
+                layout BLOB,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_ocr_cache_last_access ON ocr_cache(last_access)"
+        )
+
+        # [변경] 이전 버전 캐시 파일에는 layout 컬럼이 없음 → 추가 (기존 항목은 NULL)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(ocr_cache)")}
+        if "layout" not in columns:
+            self._conn.execute("ALTER TABLE ocr_cache ADD COLUMN layout BLOB")
+
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(content, adapter: str, preprocessor=None) -> str:
+        """
+        preprocessor : 어댑터가 Vision에 보내기 전 적용하는 전처리기 (None = 원본)
+        [변경] 전처리 설정이 다르면 OCR 결과도 달라지므로 key에 포함
+        """
+        return f"{adapter}:{preprocess_fingerprint(preprocessor)}:{image_digest(content)}"
+
+    def get(self, key: str):
+        """
+        캐시 조회 (없으면 None) — 조회 시각 갱신으로 LRU 순서 유지
+        반환: (full_text, WordLayout 또는 None)
+        """
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT full_text, layout FROM ocr_cache WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE ocr_cache SET last_access = ? WHERE key = ?", (time.time(), key)
+            )
+            self._conn.commit()
+            self.hits += 1
+
+        full_text, layout = row
+
+        return full_text, WordLayout.from_bytes(layout) if layout is not None else None
+
+    def put(self, key: str, adapter: str, full_text: str, layout: WordLayout = None):
+        blob = layout.to_bytes() if layout is not None else None
+        size = len(full_text.encode("utf-8")) + (len(blob) if blob is not None else 0)
+        now = time.time()
+
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO ocr_cache (key, adapter, full_text, layout, size, created_at, last_access)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (key, adapter, full_text, blob, size, now, now)
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        """전체 크기가 상한을 넘으면 오래된 항목부터 제거 (lock 안에서 호출)"""
+
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM ocr_cache").fetchone()[0]
+
+        if total <= self.max_bytes:
+            return
+
+        rows = self._conn.execute(
+            "SELECT key, size FROM ocr_cache ORDER BY last_access ASC"
+        )
+
+        victims = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            victims.append((key,))
+            total -= size
+
+        self._conn.executemany("DELETE FROM ocr_cache WHERE key = ?", victims)
+        self.evictions += len(victims)
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM ocr_cache"
+            ).fetchone()
+
+        lookups = self.hits + self.misses
+
+        return {
+            "entries": entries,
+            "bytes": total,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM ocr_cache")
+            self._conn.commit()
+
+
+# --------------------------------------------------
+# 프로세스 공용 캐시 (싱글톤)
+# --------------------------------------------------
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache():
+    """
+    환경변수 기반 공용 캐시 반환
+    - OCR_CACHE_ENABLED : "0"이면 캐시 사용 안 함 (None 반환)
+    - OCR_CACHE_PATH    : SQLite 파일 경로
+    - OCR_CACHE_MAX_MB  : 최대 크기 (MB)
+    """
+
+    global _default_cache
+
+    if os.getenv("OCR_CACHE_ENABLED", "1") == "0":
+        return None
+
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = OCRCache(
+                path=os.getenv("OCR_CACHE_PATH", DEFAULT_CACHE_PATH),
+                max_bytes=int(float(os.getenv("OCR_CACHE_MAX_MB", DEFAULT_MAX_MB)) * 1024 * 1024)
+            )
+
+    return _default_cache
+
+
+class CachedOCRAdapter(OCRAdapter):
+    """
+    OCR 어댑터 앞단 캐시
+    - 캐시 hit이면 내부 어댑터를 생성/호출하지 않음
+    - adapter_factory : 인자 없는 callable (예: GoogleVisionAdapter 클래스)
+    - preprocessor : 내부 어댑터가 사용하는 전처리기 (캐시 key 구분용, 어댑터를 만들지 않고 key 계산)
+    """
+
+    def __init__(self, adapter_factory, cache: OCRCache = None, name: str = None, preprocessor=None):
+        self._factory = adapter_factory
+        self._adapter = None
+        self.cache = cache
+        self.name = name or getattr(adapter_factory, "name", OCRAdapter.name)
+        self.preprocessor = preprocessor
+
+    @property
+    def adapter(self):
+        if self._adapter is None:
+            self._adapter = self._factory()
+        return self._adapter
+
+    # [변경] run() / run_batch()는 기본 구현(파일 읽기 → *_bytes) 사용
+    def run_bytes(self, content, name: str) -> dict:
+
+        if self.cache is None:
+            return self.adapter.run_bytes(content, name)
+
+        # hashlib은 memoryview를 복사 없이 그대로 해시
+        key = OCRCache.make_key(content, self.name, self.preprocessor)
+        cached = self.cache.get(key)
+
+        if cached is not None:
+            return self._hit_result(name, *cached)
+
+        result = self.adapter.run_bytes(content, name)
+        self.cache.put(key, self.name, result["full_text"], result.get("layout"))
+        result["cache_hit"] = False
+
+        return result
+
+    def run_batch_bytes(self, items: list) -> list:
+        """캐시 hit은 바로 채우고, miss만 모아 내부 어댑터 배치 요청 1회로 처리"""
+
+        if self.cache is None:
+            return self.adapter.run_batch_bytes(items)
+
+        results = [None] * len(items)
+        misses = []
+
+        for idx, (content, name) in enumerate(items):
+            key = OCRCache.make_key(content, self.name, self.preprocessor)
+            cached = self.cache.get(key)
+
+            if cached is None:
+                misses.append((idx, key, content, name))
+            else:
+                results[idx] = self._hit_result(name, *cached)
+
+        if misses:
+            fetched = self.adapter.run_batch_bytes([(content, name) for _, _, content, name in misses])
+
+            for (idx, key, _, _), result in zip(misses, fetched):
+                if "error" not in result:
+                    self.cache.put(key, self.name, result["full_text"], result.get("layout"))
+                    result["cache_hit"] = False
+                results[idx] = result
+
+        return results
+
+    def _hit_result(self, name: str, full_text: str, layout: WordLayout = None) -> dict:
+        result = {
+            "adapter": self.name,
+            "image_name": name,
+            "full_text": full_text,
+            "cache_hit": True
+        }
+
+        if layout is not None:
+            result["layout"] = layout
+
+        return result
@@ -0,0 +1,243 @@
+"""
+OCR 전 이미지 전처리 (선택)
+
+휴대폰 원본 사진(수 MB, 4000px 이상)을 그대로 Vision에 보내지 않도록
+1) EXIF 회전 정보 적용
+2) 긴 변을 max_edge 이하로 축소
+3) 흑백 변환 (영수증은 색 정보가 필요 없음)
+4) JPEG 재인코딩 (quality 조정)
+
+- 결과가 원본보다 크거나 이미지로 열 수 없으면 원본 바이트를 그대로 사용
+- 절약한 바이트 수 / 소요 시간을 info로 반환 → 파이프라인 PREPROCESS 이벤트에 기록
+- Pillow는 사용할 때만 import (없으면 전처리 생략)
+
+[변경] EnhancedPreprocessor : 검증 실패 영수증 재OCR용 강한 전처리
+- 영수증 영역(밝은 종이) crop → 기울기 보정(deskew) → 대비 강화(autocontrast)
+- 재OCR 때만 사용 → 정상 경로 비용은 그대로
+
+설정 (환경변수):
+    OCR_PREPROCESS_ENABLED      : "1"이면 사용 (기본 0)
+    OCR_PREPROCESS_MAX_EDGE     : 긴 변 최대 픽셀 (기본 2000)
+    OCR_PREPROCESS_GRAYSCALE    : "0"이면 컬러 유지 (기본 1)
+    OCR_PREPROCESS_JPEG_QUALITY : JPEG 품질 (기본 85)
+"""
+
+import io
+import os
+import time
+
+DEFAULT_MAX_EDGE = 2000
+DEFAULT_JPEG_QUALITY = 85
+
+
+class ImagePreprocessor:
+
+    # 결과가 원본보다 크면 원본 사용 (전송량 절약이 목적)
+    require_smaller = True
+
+    def __init__(
+        self,
+        max_edge: int = DEFAULT_MAX_EDGE,
+        grayscale: bool = True,
+        jpeg_quality: int = DEFAULT_JPEG_QUALITY,
+    ):
+        self.max_edge = max_edge
+        self.grayscale = grayscale
+        self.jpeg_quality = jpeg_quality
+
+    def fingerprint(self) -> str:
+        """전처리 설정 식별자 (OCR 캐시 key에 포함 → 설정이 바뀌면 이전 결과를 재사용하지 않음)"""
+        return f"{type(self).__name__}:{self.max_edge}:{int(self.grayscale)}:{self.jpeg_quality}"
+
+    def __call__(self, content: bytes):
+        """
+        반환: (OCR에 보낼 바이트, info)
+        info = {
+            "applied": bool,
+            "original_bytes": int,
+            "output_bytes": int,
+            "bytes_saved": int,
+            "duration_ms": float,
+            "size": [w, h] (전처리 후),
+            "reason": str (적용하지 않은 이유)
+        }
+        """
+
+        started = time.perf_counter()
+        original_bytes = len(content)
+
+        try:
+            output, size = self._process(content)
+            reason = None
+        except ImportError:
+            output, size, reason = content, None, "Pillow 미설치"
+        except Exception as e:
+            output, size, reason = content, None, f"{type(e).__name__}: {e}"
+
+        if reason is None and self.require_smaller and len(output) >= original_bytes:
+            output, reason = content, "원본보다 작아지지 않음"
+
+        return output, {
+            "applied": reason is None,
+            "original_bytes": original_bytes,
+            "output_bytes": len(output),
+            "bytes_saved": original_bytes - len(output),
+            "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+            "size": size,
+            "reason": reason
+        }
+
+    def _process(self, content: bytes):
+        from PIL import Image, ImageOps
+
+        with Image.open(io.BytesIO(content)) as img:
+            # JPEG는 디코딩 단계에서 1/2 ~ 1/8로 줄여 읽음 (max_edge 이상은 유지)
+            img.draft("L" if self.grayscale else "RGB", (self.max_edge, self.max_edge))
+            img = ImageOps.exif_transpose(img)
+
+            if self.grayscale:
+                img = img.convert("L")
+            elif img.mode not in ("RGB", "L"):
+                img = img.convert("RGB")
+
+            if max(img.size) > self.max_edge:
+                img.thumbnail((self.max_edge, self.max_edge), Image.LANCZOS)
+
+            buf = io.BytesIO()
+            img.save(buf, format="JPEG", quality=self.jpeg_quality, optimize=True)
+
+            return buf.getvalue(), list(img.size)
+
+
+class EnhancedPreprocessor(ImagePreprocessor):
+    """
+    재OCR용 강한 전처리 (흑백 고정, 결과가 원본보다 커도 사용)
+    NumPy로 영수증 영역 / 기울기 추정 (축소 이미지에서 계산)
+    """
+
+    require_smaller = False
+
+    # deskew 탐색 범위 / 간격 (도)
+    MAX_SKEW = 8.0
+    SKEW_STEP = 0.5
+
+    # 영역 추정 / 기울기 추정용 축소 크기
+    ANALYSIS_EDGE = 400
+
+    def __init__(self, max_edge: int = DEFAULT_MAX_EDGE, jpeg_quality: int = 90):
+        super().__init__(max_edge=max_edge, grayscale=True, jpeg_quality=jpeg_quality)
+
+    def _process(self, content: bytes):
+        from PIL import Image, ImageOps
+
+        with Image.open(io.BytesIO(content)) as img:
+            img.draft("L", (self.max_edge, self.max_edge))
+            img = ImageOps.exif_transpose(img).convert("L")
+
+            if max(img.size) > self.max_edge:
+                img.thumbnail((self.max_edge, self.max_edge), Image.LANCZOS)
+
+            img = self._crop_receipt(img)
+
+            angle = self._estimate_skew(img)
+            if abs(angle) >= self.SKEW_STEP:
+                img = img.rotate(angle, resample=Image.BICUBIC, expand=True, fillcolor=255)
+
+            img = ImageOps.autocontrast(img, cutoff=1)
+
+            buf = io.BytesIO()
+            img.save(buf, format="JPEG", quality=self.jpeg_quality, optimize=True)
+
+            return buf.getvalue(), list(img.size)
+
+    def _small(self, img):
+        small = img.copy()
+        small.thumbnail((self.ANALYSIS_EDGE, self.ANALYSIS_EDGE))
+        return small
+
+    def _crop_receipt(self, img):
+        """배경보다 밝은 종이 영역의 bounding box로 crop (영역이 애매하면 그대로)"""
+
+        import numpy as np
+
+        small = self._small(img)
+        pixels = np.asarray(small, dtype=np.int16)
+
+        low, high = np.percentile(pixels, (10, 90))
+        if high - low < 40:
+            return img
+
+        paper = pixels > (low + high) / 2
+
+        rows = np.flatnonzero(paper.mean(axis=1) > 0.3)
+        cols = np.flatnonzero(paper.mean(axis=0) > 0.3)
+
+        if len(rows) == 0 or len(cols) == 0:
+            return img
+
+        h, w = pixels.shape
+        area = (rows[-1] - rows[0] + 1) * (cols[-1] - cols[0] + 1) / (h * w)
+
+        # 거의 전체(이미 영수증만 찍힘) 또는 너무 작으면(오검출) crop 안 함
+        if not 0.15 <= area <= 0.9:
+            return img
+
+        scale = img.size[0] / w
+        pad = 0.02 * max(img.size)
+
+        return img.crop((
+            max(0, int(cols[0] * scale - pad)),
+            max(0, int(rows[0] * scale - pad)),
+            min(img.size[0], int((cols[-1] + 1) * scale + pad)),
+            min(img.size[1], int((rows[-1] + 1) * scale + pad)),
+        ))
+
+    def _estimate_skew(self, img) -> float:
+        """
+        글자 픽셀의 행별 합(projection profile) 분산이 가장 큰 각도
+        (글자 줄이 수평일 때 줄 / 줄 사이 대비가 가장 큼)
+        """
+
+        import numpy as np
+        from PIL import Image
+
+        small = self._small(img)
+        pixels = np.asarray(small, dtype=np.int16)
+
+        ink = Image.fromarray(((pixels < pixels.mean() - 30) * 255).astype(np.uint8))
+
+        best_angle, best_score = 0.0, -1.0
+
+        for angle in np.arange(-self.MAX_SKEW, self.MAX_SKEW + self.SKEW_STEP / 2, self.SKEW_STEP):
+            profile = np.asarray(ink.rotate(float(angle), expand=True), dtype=np.float32).sum(axis=1)
+            score = float(profile.var())
+
+            if score > best_score:
+                best_angle, best_score = float(angle), score
+
+        return best_angle
+
+
+def preprocess_fingerprint(preprocessor) -> str:
+    """전처리기 식별자 (None = 원본 그대로 전송)"""
+
+    if preprocessor is None:
+        return "raw"
+
+    fingerprint = getattr(preprocessor, "fingerprint", None)
+
+    # fingerprint가 없는 callable 전처리기는 타입 이름으로 구분
+    return fingerprint() if fingerprint is not None else type(preprocessor).__name__
+
+
+def get_default_preprocessor():
+    """환경변수 기반 전처리기 (OCR_PREPROCESS_ENABLED가 "1"이 아니면 None)"""
+
+    if os.getenv("OCR_PREPROCESS_ENABLED", "0") != "1":
+        return None
+
+    return ImagePreprocessor(
+        max_edge=int(os.getenv("OCR_PREPROCESS_MAX_EDGE", DEFAULT_MAX_EDGE)),
+        grayscale=os.getenv("OCR_PREPROCESS_GRAYSCALE", "1") != "0",
+        jpeg_quality=int(os.getenv("OCR_PREPROCESS_JPEG_QUALITY", DEFAULT_JPEG_QUALITY)),
+    )
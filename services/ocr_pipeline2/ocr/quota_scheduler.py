@@ -0,0 +1,308 @@
+"""
+Vision 호출 쿼터 스케줄러 (프로세스 공용 토큰 버킷)
+
+- 모든 Streamlit 세션의 Vision 호출을 하나의 토큰 버킷으로 제한
+  → 배치 업로드가 몰려도 분당 쿼터 초과(RESOURCE_EXHAUSTED) 대신 대기열에서 순서대로 처리
+- 대기열은 사용자(user_pk)별로 나누고 round-robin으로 토큰 배분
+  → 한 사용자가 수십 장을 올려도 다른 사용자 요청이 뒤로 밀리지 않음
+- 대기 시간 / 대기열 길이를 반환 → 파이프라인 OCR 이벤트에 기록
+- 토큰은 파이프라인이 요청한 이미지 수 기준
+  → CallPolicy의 재시도 / hedging 요청은 토큰을 따로 받지 않으므로 한도는 실제 쿼터보다 여유 있게 설정
+
+설정 (환경변수):
+    OCR_QUOTA_ENABLED  : "0"이면 사용 안 함 (기본 1)
+    OCR_QUOTA_RPM      : 분당 허용 이미지 수 (기본 1800 = Vision 기본 쿼터)
+    OCR_QUOTA_RPS      : 초당 허용 이미지 수 (RPM과 함께 설정하면 두 한도 모두 적용)
+    OCR_QUOTA_BURST    : 한 번에 몰아서 보낼 수 있는 최대 수 (기본 = 초당 허용 수)
+    OCR_QUOTA_MAX_WAIT_S : 최대 대기 시간, 넘으면 QuotaWaitTimeout (기본 120)
+"""
+
+import os
+import threading
+import time
+from collections import deque
+
+from .base_adapter import OCRAdapter
+
+
+class QuotaWaitTimeout(TimeoutError):
+    """쿼터 대기 시간 초과"""
+
+
+class TokenBucket:
+    """lock 없음 — QuotaScheduler의 condition 안에서만 사용"""
+
+    def __init__(self, rate_per_s: float, capacity: float):
+        self.rate = rate_per_s
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def time_until(self, cost: float) -> float:
+        """cost만큼 꺼낼 수 있을 때까지 남은 시간 (초)"""
+
+        self._refill()
+
+        # burst보다 큰 요청(배치)은 버킷이 가득 찼을 때 보내고 부족분은 이후 충전으로 상환
+        need = min(cost, self.capacity)
+
+        return max(0.0, (need - self.tokens) / self.rate)
+
+    def take(self, cost: float):
+        self.tokens -= cost
+
+
+class _Ticket:
+
+    __slots__ = ("user_key", "cost", "event", "granted", "enqueued_at", "queue_depth")
+
+    def __init__(self, user_key, cost, queue_depth):
+        self.user_key = user_key
+        self.cost = cost
+        self.event = threading.Event()
+        self.granted = False
+        self.enqueued_at = time.perf_counter()
+        self.queue_depth = queue_depth
+
+
+class QuotaScheduler:
+
+    def __init__(
+        self,
+        rate_per_s: float,
+        burst: float = None,
+        max_wait_s: float = 120.0,
+        per_minute: float = None,
+    ):
+        """
+        per_minute : 분당 한도 (지정하면 초당 / 분당 버킷을 모두 통과해야 토큰 배분)
+        """
+
+        self.bucket = TokenBucket(rate_per_s, burst or max(1.0, rate_per_s))
+        self.max_wait_s = max_wait_s
+
+        # [변경] 분당 버킷 : 1분 동안 최대 per_minute개, 초당 버킷이 순간 몰림을 제한
+        self.minute_bucket = TokenBucket(per_minute / 60, per_minute) if per_minute else None
+        self._buckets = [b for b in (self.bucket, self.minute_bucket) if b is not None]
+
+        # 사용자별 대기열 + 대기 중인 사용자 순서 (round-robin)
+        self._queues = {}
+        self._order = deque()
+        self._cond = threading.Condition()
+        self._dispatcher = None
+
+        self.granted = 0
+        self.timeouts = 0
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+
+    def acquire(self, user_key=None, cost: int = 1) -> dict:
+        """
+        토큰을 받을 때까지 대기
+        반환: {"wait_ms": float, "queue_depth": int (들어올 때 앞에 있던 요청 수)}
+        """
+
+        with self._cond:
+            # 대기열이 비어 있고 토큰이 있으면 바로 통과
+            if not self._order and self._time_until(cost) == 0:
+                self._take(cost)
+                self._record_wait(0.0)
+                return {"wait_ms": 0.0, "queue_depth": 0}
+
+            ticket = _Ticket(user_key, cost, self.queue_depth())
+
+            if user_key not in self._queues:
+                self._queues[user_key] = deque()
+                self._order.append(user_key)
+            self._queues[user_key].append(ticket)
+
+            self._ensure_dispatcher()
+            self._cond.notify_all()
+
+        if not ticket.event.wait(self.max_wait_s):
+            with self._cond:
+                if not ticket.granted:
+                    self._remove(ticket)
+                    self.timeouts += 1
+                    raise QuotaWaitTimeout(f"OCR 쿼터 대기 시간 초과 ({self.max_wait_s}s)")
+
+        wait_ms = round((time.perf_counter() - ticket.enqueued_at) * 1000, 2)
+
+        with self._cond:
+            self._record_wait(wait_ms)
+
+        return {"wait_ms": wait_ms, "queue_depth": ticket.queue_depth}
+
+    def _time_until(self, cost: float) -> float:
+        return max(bucket.time_until(cost) for bucket in self._buckets)
+
+    def _take(self, cost: float):
+        for bucket in self._buckets:
+            bucket.take(cost)
+
+    def queue_depth(self) -> int:
+        return sum(len(q) for q in self._queues.values())
+
+    def _record_wait(self, wait_ms: float):
+        self.granted += 1
+        self.total_wait_ms += wait_ms
+        self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+
+    def _remove(self, ticket: _Ticket):
+        """대기 포기한 요청 제거 (condition 안에서 호출)"""
+
+        queue = self._queues.get(ticket.user_key)
+
+        if queue is None or ticket not in queue:
+            return
+
+        queue.remove(ticket)
+
+        if not queue:
+            del self._queues[ticket.user_key]
+            self._order.remove(ticket.user_key)
+
+    def _ensure_dispatcher(self):
+        if self._dispatcher is None or not self._dispatcher.is_alive():
+            self._dispatcher = threading.Thread(
+                target=self._dispatch, name="ocr-quota-dispatcher", daemon=True
+            )
+            self._dispatcher.start()
+
+    def _dispatch(self):
+        """대기 중인 사용자를 돌아가며 한 건씩 토큰 배분"""
+
+        with self._cond:
+            while True:
+                if not self._order:
+                    self._cond.wait()
+                    continue
+
+                user_key = self._order[0]
+                ticket = self._queues[user_key][0]
+
+                delay = self._time_until(ticket.cost)
+
+                if delay > 0:
+                    self._cond.wait(delay)
+                    continue
+
+                self._take(ticket.cost)
+
+                queue = self._queues[user_key]
+                queue.popleft()
+                self._order.popleft()
+
+                if queue:
+                    self._order.append(user_key)
+                else:
+                    del self._queues[user_key]
+
+                ticket.granted = True
+                ticket.event.set()
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "rate_per_s": self.bucket.rate,
+                "burst": self.bucket.capacity,
+                "per_minute": self.minute_bucket.capacity if self.minute_bucket else None,
+                "queue_depth": self.queue_depth(),
+                "waiting_users": len(self._order),
+                "granted": self.granted,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": round(self.total_wait_ms / self.granted, 2) if self.granted else 0.0,
+                "max_wait_ms": self.max_wait_ms
+            }
+
+
+# --------------------------------------------------
+# 프로세스 공용 스케줄러 (싱글톤)
+# --------------------------------------------------
+_default_scheduler = None
+_default_scheduler_lock = threading.Lock()
+
+
+def get_default_scheduler():
+    """
+    환경변수 기반 공용 스케줄러 (OCR_QUOTA_ENABLED=0이면 None)
+    RPS만 → 초당 한도 / RPM만 → 분당 한도를 초당으로 환산 / 둘 다 → 두 한도 모두 적용
+    """
+
+    global _default_scheduler
+
+    if os.getenv("OCR_QUOTA_ENABLED", "1") == "0":
+        return None
+
+    with _default_scheduler_lock:
+        if _default_scheduler is None:
+            rps = os.getenv("OCR_QUOTA_RPS")
+            rpm = os.getenv("OCR_QUOTA_RPM")
+            burst = os.getenv("OCR_QUOTA_BURST")
+
+            # [변경] RPS가 RPM을 덮어쓰지 않음 — 함께 설정하면 분당 버킷 추가
+            if rps:
+                rate = float(rps)
+                per_minute = float(rpm) if rpm else None
+            else:
+                rate = float(rpm or 1800) / 60
+                per_minute = None
+
+            _default_scheduler = QuotaScheduler(
+                rate,
+                burst=float(burst) if burst else None,
+                max_wait_s=float(os.getenv("OCR_QUOTA_MAX_WAIT_S", 120)),
+                per_minute=per_minute,
+            )
+
+    return _default_scheduler
+
+
+class ScheduledOCRAdapter(OCRAdapter):
+    """
+    OCR 어댑터 앞단 쿼터 대기
+    - 이미지 1장 = 토큰 1개 (배치는 이미지 수만큼)
+    - 결과에 "quota": {"wait_ms", "queue_depth"} 추가
+    """
+
+    def __init__(self, adapter, scheduler: QuotaScheduler, user_key=None):
+        self.adapter = adapter
+        self.name = adapter.name
+        self.scheduler = scheduler
+        self.user_key = user_key
+
+    def run_bytes(self, content, name: str) -> dict:
+
+        quota = self.scheduler.acquire(self.user_key)
+
+        result = self.adapter.run_bytes(content, name)
+        result["quota"] = quota
+
+        return result
+
+    def run_bytes_document(self, content, name: str, preprocessor=None) -> dict:
+
+        quota = self.scheduler.acquire(self.user_key)
+
+        result = self.adapter.run_bytes_document(content, name, preprocessor)
+        result["quota"] = quota
+
+        return result
+
+    def run_batch_bytes(self, items: list) -> list:
+
+        if not items:
+            return []
+
+        quota = self.scheduler.acquire(self.user_key, cost=len(items))
+
+        results = self.adapter.run_batch_bytes(items)
+        for result in results:
+            result["quota"] = quota
+
+        return results
@@ -0,0 +1,215 @@
+"""
+녹화 / 재생 OCR 어댑터 (오프라인 부하 테스트 · 회귀 테스트용)
+
+- ReplayOCRAdapter    : 녹화된 OCR 결과(corpus)를 Vision 대신 반환
+                        key = 이미지 SHA-256 (녹화 시 저장된 경우) → 이미지 파일명 순으로 조회
+                        지연(latency / jitter)과 오류(error_rate)를 인위적으로 주입 가능
+- RecordingOCRAdapter : 실제 어댑터(GoogleVisionAdapter 등)를 감싸 응답을 JSONL로 기록
+
+corpus 형식:
+    vision_results.json (JSON 배열) 또는 JSONL
+    {"image_name": "r1.jpg", "full_text": "...", "sha256": "..."(선택), "layout": {...}(선택)}
+
+사용 예시 (.env):
+    OCR_ADAPTER=record  OCR_RECORD_PATH=data/ocr_corpus.jsonl   # 실제 호출 + 녹화
+    OCR_ADAPTER=replay  OCR_REPLAY_PATH=data/ocr_corpus.jsonl   # 네트워크 없이 재생
+"""
+
+import json
+import os
+import random
+import threading
+import time
+from pathlib import Path
+
+from .base_adapter import OCRAdapter
+from .ocr_cache import image_digest
+from .word_layout import WordLayout
+
+
+class ReplayInjectedError(RuntimeError):
+    """error_rate로 주입된 인위적 OCR 실패"""
+
+
+class ReplayMissError(KeyError):
+    """corpus에 없는 이미지"""
+
+
+class ReplayOCRAdapter(OCRAdapter):
+
+    name = "replay"
+
+    def __init__(
+        self,
+        corpus,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = None,
+    ):
+        """
+        corpus     : corpus 파일 경로 또는 레코드 iterable
+        latency_ms : 호출당 기본 지연
+        jitter_ms  : 0 ~ jitter_ms 사이 추가 지연 (균등분포)
+        error_rate : ReplayInjectedError를 발생시킬 확률 (0 ~ 1)
+        seed       : 지연 / 오류 주입 난수 seed (재현용)
+        """
+
+        if isinstance(corpus, (str, Path)):
+            # 거대한 corpus도 한 번에 json.load하지 않도록 스트리밍 reader 재사용
+            from services.ocr_pipeline2.pipeline.reparse import iter_ocr_records
+            corpus = iter_ocr_records(str(corpus))
+
+        self.by_hash = {}
+        self.by_name = {}
+
+        # 값 : (full_text, layout dict 또는 None)
+        for record in corpus:
+            entry = (record.get("full_text", ""), record.get("layout"))
+
+            if record.get("sha256"):
+                self.by_hash[record["sha256"]] = entry
+            if record.get("image_name"):
+                self.by_name[os.path.basename(record["image_name"])] = entry
+
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+
+        # 여러 스레드에서 동시에 호출해도 난수 순서가 seed 기준으로 재현되도록 lock
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return max(len(self.by_hash), len(self.by_name))
+
+    def lookup(self, content, name: str):
+        """녹화된 (full_text, layout dict) 조회 (없으면 None)"""
+
+        if self.by_hash and content is not None:
+            entry = self.by_hash.get(image_digest(content))
+            if entry is not None:
+                return entry
+
+        return self.by_name.get(os.path.basename(name))
+
+    def run_bytes(self, content, name: str) -> dict:
+
+        with self._lock:
+            delay = self.latency_ms + self._random.random() * self.jitter_ms
+            fail = self._random.random() < self.error_rate
+
+        if delay > 0:
+            time.sleep(delay / 1000)
+
+        if fail:
+            raise ReplayInjectedError(f"주입된 OCR 오류: {name}")
+
+        entry = self.lookup(content, name)
+
+        if entry is None:
+            raise ReplayMissError(f"녹화된 OCR 결과 없음: {name}")
+
+        full_text, layout = entry
+        result = {
+            "adapter": self.name,
+            "image_name": name,
+            "full_text": full_text
+        }
+
+        if layout is not None:
+            result["layout"] = WordLayout.from_dict(layout)
+
+        return result
+
+
+class RecordingOCRAdapter(OCRAdapter):
+    """
+    실제 어댑터 응답을 corpus(JSONL)에 이어쓰기
+    결과는 감싼 어댑터 결과 그대로 반환 (실패한 이미지는 기록하지 않음)
+    """
+
+    def __init__(self, adapter, path: str):
+        self.adapter = adapter
+        self.name = adapter.name
+        self.path = path
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def _record(self, content, result: dict):
+        record = {
+            "adapter": result["adapter"],
+            "image_name": os.path.basename(result["image_name"]),
+            "sha256": image_digest(content),
+            "full_text": result["full_text"]
+        }
+
+        if result.get("layout") is not None:
+            record["layout"] = result["layout"].to_dict()
+
+        line = json.dumps(record, ensure_ascii=False)
+
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+    def run_bytes(self, content, name: str) -> dict:
+
+        result = self.adapter.run_bytes(content, name)
+        self._record(content, result)
+
+        return result
+
+    def run_batch_bytes(self, items: list) -> list:
+
+        results = self.adapter.run_batch_bytes(items)
+
+        for (content, _), result in zip(items, results):
+            if "error" not in result:
+                self._record(content, result)
+
+        return results
+
+
+# --------------------------------------------------
+# 환경변수 기반 생성 (adapter_registry factory)
+# --------------------------------------------------
+def replay_adapter_from_env():
+    """
+    OCR_REPLAY_PATH        : corpus 경로 (필수)
+    OCR_REPLAY_LATENCY_MS  : 기본 지연 (기본 0)
+    OCR_REPLAY_JITTER_MS   : 추가 지연 상한 (기본 0)
+    OCR_REPLAY_ERROR_RATE  : 오류 주입 확률 (기본 0)
+    OCR_REPLAY_SEED        : 난수 seed (선택)
+    """
+
+    path = os.getenv("OCR_REPLAY_PATH")
+
+    if not path:
+        raise RuntimeError("OCR_REPLAY_PATH가 설정되지 않았습니다.")
+
+    seed = os.getenv("OCR_REPLAY_SEED")
+
+    return ReplayOCRAdapter(
+        path,
+        latency_ms=float(os.getenv("OCR_REPLAY_LATENCY_MS", 0)),
+        jitter_ms=float(os.getenv("OCR_REPLAY_JITTER_MS", 0)),
+        error_rate=float(os.getenv("OCR_REPLAY_ERROR_RATE", 0)),
+        seed=int(seed) if seed else None,
+    )
+
+
+def recording_adapter_from_env():
+    """
+    OCR_RECORD_PATH : 녹화 JSONL 경로 (기본 data/ocr_corpus.jsonl)
+    감싸는 어댑터는 레지스트리의 google_vision 인스턴스 (gRPC 채널 공유)
+    """
+
+    from .adapter_registry import get_adapter
+    from .google_vision_adapter import GoogleVisionAdapter
+
+    return RecordingOCRAdapter(
+        get_adapter(GoogleVisionAdapter.name),
+        os.getenv("OCR_RECORD_PATH", "data/ocr_corpus.jsonl")
+    )
@@ -0,0 +1,259 @@
+"""
+Vision 단어 위치 정보 (열 단위 압축 보관)
+
+- text_annotations[1:]의 단어마다 Python 객체를 만들지 않고 열(column) 배열로 보관
+    text       : 단어 텍스트를 이어 붙인 문자열 1개
+    offsets    : int32 (n+1)   단어 i = text[offsets[i]:offsets[i+1]]
+    boxes      : int32 (n, 4)  x0, y0, x1, y1 (축 정렬 bounding box, 픽셀)
+    confidence : float32 (n)   단어 confidence (응답에 없으면 NaN)
+- 응답 → 배열 변환은 첫 접근 시 1회 (위치 정보를 쓰지 않는 경로는 비용 없음)
+  변환 후에는 원본(응답 / blob)을 버림 → 영수증당 메모리는 단어 수 × 약 28byte
+- to_bytes() / from_bytes() : OCR 캐시(SQLite BLOB) 저장용 (from_bytes는 복사 없이 배열 생성)
+- to_dict() / from_dict()   : 녹화 corpus(JSONL) 저장용
+"""
+
+import struct
+
+# 단어 수, 페이지 너비, 페이지 높이, text 바이트 길이
+_HEADER = struct.Struct("<4I")
+
+_UNSET = object()
+
+
+class WordLayout:
+
+    __slots__ = ("_source", "_text", "_offsets", "_boxes", "_confidence", "_page_size")
+
+    def __init__(self, source):
+        """직접 생성하지 않고 from_response / from_bytes / from_dict 사용"""
+
+        self._source = source
+
+        self._text = _UNSET
+        self._offsets = None
+        self._boxes = None
+        self._confidence = None
+        self._page_size = (0, 0)
+
+    @classmethod
+    def from_response(cls, response):
+        """AnnotateImageResponse (text_detection / batch 응답 공통)"""
+        return cls(("response", response))
+
+    @classmethod
+    def from_bytes(cls, blob):
+        return cls(("bytes", blob))
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        return cls(("dict", data))
+
+    @classmethod
+    def from_arrays(cls, text: str, offsets, boxes, confidence, page_size=(0, 0)):
+        """이미 변환된 열 배열로 생성 (take() 등)"""
+
+        layout = cls(None)
+        layout._text = text
+        layout._offsets = offsets
+        layout._boxes = boxes
+        layout._confidence = confidence
+        layout._page_size = tuple(page_size)
+
+        return layout
+
+    # --------------------------------------------------
+    # 지연 변환
+    # --------------------------------------------------
+    def _decode(self):
+        if self._text is not _UNSET:
+            return
+
+        kind, source = self._source
+
+        if kind == "response":
+            self._decode_response(source)
+        elif kind == "bytes":
+            self._decode_bytes(source)
+        else:
+            self._decode_dict(source)
+
+        self._source = None
+
+    def _decode_response(self, response):
+        import numpy as np
+
+        words = response.text_annotations[1:]
+        n = len(words)
+
+        texts = [w.description for w in words]
+
+        offsets = np.zeros(n + 1, dtype=np.int32)
+        np.cumsum([len(t) for t in texts], out=offsets[1:])
+
+        boxes = np.zeros((n, 4), dtype=np.int32)
+
+        for i, w in enumerate(words):
+            vertices = w.bounding_poly.vertices
+            if not vertices:
+                continue
+
+            xs = [v.x for v in vertices]
+            ys = [v.y for v in vertices]
+            boxes[i] = (min(xs), min(ys), max(xs), max(ys))
+
+        # text_detection의 단어 confidence는 full_text_annotation에만 있음
+        # 단어 수가 같을 때만 순서대로 대응 (다르면 NaN)
+        confidence = np.full(n, np.nan, dtype=np.float32)
+        page_size = (0, 0)
+
+        document = response.full_text_annotation
+
+        if document.pages:
+            page_size = (document.pages[0].width, document.pages[0].height)
+
+            scores = [
+                word.confidence
+                for page in document.pages
+                for block in page.blocks
+                for paragraph in block.paragraphs
+                for word in paragraph.words
+            ]
+
+            if len(scores) == n:
+                confidence[:] = scores
+
+        self._text = "".join(texts)
+        self._offsets = offsets
+        self._boxes = boxes
+        self._confidence = confidence
+        self._page_size = page_size
+
+    def _decode_bytes(self, blob):
+        import numpy as np
+
+        n, width, height, text_len = _HEADER.unpack_from(blob, 0)
+        pos = _HEADER.size
+
+        self._offsets = np.frombuffer(blob, dtype="<i4", count=n + 1, offset=pos)
+        pos += (n + 1) * 4
+
+        self._boxes = np.frombuffer(blob, dtype="<i4", count=n * 4, offset=pos).reshape(n, 4)
+        pos += n * 16
+
+        self._confidence = np.frombuffer(blob, dtype="<f4", count=n, offset=pos)
+        pos += n * 4
+
+        self._text = bytes(blob[pos:pos + text_len]).decode("utf-8")
+        self._page_size = (width, height)
+
+    def _decode_dict(self, data: dict):
+        import numpy as np
+
+        n = len(data["offsets"]) - 1
+
+        self._text = data["text"]
+        self._offsets = np.asarray(data["offsets"], dtype=np.int32)
+        self._boxes = np.asarray(data["boxes"], dtype=np.int32).reshape(n, 4)
+        self._confidence = np.asarray(
+            [np.nan if c is None else c for c in data.get("confidence", [None] * n)],
+            dtype=np.float32
+        )
+        self._page_size = tuple(data.get("page_size", (0, 0)))
+
+    # --------------------------------------------------
+    # 열 접근
+    # --------------------------------------------------
+    @property
+    def text(self) -> str:
+        self._decode()
+        return self._text
+
+    @property
+    def offsets(self):
+        self._decode()
+        return self._offsets
+
+    @property
+    def boxes(self):
+        self._decode()
+        return self._boxes
+
+    @property
+    def confidence(self):
+        self._decode()
+        return self._confidence
+
+    @property
+    def page_size(self) -> tuple:
+        """(width, height) — 응답에 없으면 (0, 0)"""
+        self._decode()
+        return self._page_size
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def word(self, i: int) -> str:
+        offsets = self.offsets
+        return self.text[offsets[i]:offsets[i + 1]]
+
+    def words(self) -> list:
+        offsets = self.offsets.tolist()
+        text = self.text
+        return [text[offsets[i]:offsets[i + 1]] for i in range(len(offsets) - 1)]
+
+    def take(self, indices) -> "WordLayout":
+        """일부 단어만 담은 새 layout (영수증 영역 분리용, 순서는 indices 순)"""
+
+        import numpy as np
+
+        indices = np.asarray(indices, dtype=np.intp)
+        words = self.words()
+        texts = [words[i] for i in indices.tolist()]
+
+        offsets = np.zeros(len(texts) + 1, dtype=np.int32)
+        np.cumsum([len(t) for t in texts], out=offsets[1:])
+
+        return WordLayout.from_arrays(
+            "".join(texts), offsets, self.boxes[indices], self.confidence[indices], self.page_size
+        )
+
+    @property
+    def nbytes(self) -> int:
+        """배열 + 텍스트 메모리 크기 (대략)"""
+        return (
+            self.offsets.nbytes + self.boxes.nbytes + self.confidence.nbytes
+            + len(self.text.encode("utf-8"))
+        )
+
+    # --------------------------------------------------
+    # 직렬화
+    # --------------------------------------------------
+    def __reduce__(self):
+        """pickle(프로세스 풀 전달)은 to_bytes 형식으로 — _UNSET 표식은 프로세스마다 다른 객체"""
+
+        if self._source is not None and self._source[0] == "bytes":
+            return WordLayout.from_bytes, (self._source[1],)
+
+        return WordLayout.from_bytes, (self.to_bytes(),)
+
+    def to_bytes(self) -> bytes:
+        text = self.text.encode("utf-8")
+        width, height = self.page_size
+
+        return b"".join((
+            _HEADER.pack(len(self), width, height, len(text)),
+            self.offsets.astype("<i4", copy=False).tobytes(),
+            self.boxes.astype("<i4", copy=False).tobytes(),
+            self.confidence.astype("<f4", copy=False).tobytes(),
+            text,
+        ))
+
+    def to_dict(self) -> dict:
+        return {
+            "text": self.text,
+            "offsets": self.offsets.tolist(),
+            "boxes": self.boxes.ravel().tolist(),
+            # NaN은 JSON 표준이 아니므로 None으로 저장
+            "confidence": [None if c != c else round(c, 4) for c in self.confidence.tolist()],
+            "page_size": list(self.page_size)
+        }
@@ -0,0 +1,164 @@
+"""
+Aho-Corasick 다중 키워드 탐색기
+
+- 키워드 사전(브랜드 / 카테고리 / 품목)을 import 시 1회 automaton으로 구축
+- 텍스트를 한 번만 순회하며 모든 사전 hit을 찾음
+  → 사전 크기가 커져도 탐색 비용은 텍스트 길이에만 비례
+- 키워드마다 등록 순서(rank)를 기록해, 기존 "사전 순서대로 첫 매칭" 규칙을
+  min(rank)로 그대로 재현
+"""
+
+from collections import deque
+
+_NO_RANK = float("inf")
+
+
+class KeywordAutomaton:
+    """
+    사용 예시:
+        automaton = KeywordAutomaton([("커피", "카페"), ("김밥", "식비")])
+        automaton.find_all("김밥 커피")   # [(0, "김밥", "식비"), (3, "커피", "카페")]
+        automaton.first("김밥 커피")      # "카페" (먼저 등록된 키워드 우선)
+    """
+
+    def __init__(self, entries):
+        """
+        entries : (keyword, value) 반복자. 등록 순서가 곧 우선순위(rank)
+        """
+
+        # state별 전이 / 실패 링크 / 출력(rank, keyword, value)
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+
+        self.size = 0
+
+        for rank, (keyword, value) in enumerate(entries):
+
+            if not keyword:
+                raise ValueError("빈 키워드는 등록할 수 없습니다.")
+
+            state = 0
+            for ch in keyword:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = nxt
+
+            self._out[state].append((rank, keyword, value))
+            self.size += 1
+
+        self._build_fail_links()
+
+    def _build_fail_links(self):
+        """BFS로 실패 링크 구성 + 실패 경로의 출력 / 최소 rank 병합"""
+
+        goto, fail, out = self._goto, self._fail, self._out
+
+        self._min_rank = [_NO_RANK] * len(goto)
+        self._min_value = [None] * len(goto)
+
+        queue = deque(goto[0].values())
+
+        while queue:
+            state = queue.popleft()
+
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+
+                # root 직계 자식의 실패 링크는 root(0) 그대로
+                if state == 0:
+                    continue
+
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+
+            # 실패 링크의 출력은 BFS 순서상 이미 확정되어 있음
+            out[state] = out[state] + out[fail[state]]
+
+            if out[state]:
+                rank, _, value = min(out[state], key=lambda o: o[0])
+                self._min_rank[state] = rank
+                self._min_value[state] = value
+
+    def _walk(self, text):
+        """
+        문자 단위로 전이하며 출력이 있는 (위치, state)만 반환
+        root에서 시작 문자가 아닌 경우는 dict 조회 1회로 건너뜀
+        """
+
+        goto, fail, out = self._goto, self._fail, self._out
+        root = goto[0]
+        state = 0
+
+        for pos, ch in enumerate(text):
+            if state:
+                while state and ch not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(ch, 0)
+            else:
+                state = root.get(ch, 0)
+
+            if state and out[state]:
+                yield pos, state
+
+    def find_all(self, text):
+        """
+        모든 사전 hit 반환 (겹치는 hit 포함)
+        반환: [(시작 위치, keyword, value), ...] — 끝 위치 순
+        """
+
+        out = self._out
+        hits = []
+
+        for pos, state in self._walk(text):
+            for _, keyword, value in out[state]:
+                hits.append((pos - len(keyword) + 1, keyword, value))
+
+        return hits
+
+    def first(self, text, default=None):
+        """
+        텍스트에 포함된 키워드 중 가장 먼저 등록된 키워드의 value
+        (= 사전 순서대로 `kw in text`를 검사했을 때 처음 매칭되는 값)
+
+        ※ 가장 자주 호출되는 경로라 _walk를 인라인으로 풀어 generator 비용 제거
+        """
+
+        goto, fail, min_rank = self._goto, self._fail, self._min_rank
+        root = goto[0]
+        state = 0
+        best_rank = _NO_RANK
+        best_state = 0
+
+        for ch in text:
+            if state:
+                while state and ch not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(ch, 0)
+            else:
+                state = root.get(ch, 0)
+                if not state:
+                    continue
+
+            if min_rank[state] < best_rank:
+                best_rank = min_rank[state]
+                best_state = state
+                if best_rank == 0:
+                    break
+
+        return self._min_value[best_state] if best_state else default
+
+    def contains_any(self, text):
+        """키워드가 하나라도 포함되어 있는지"""
+
+        for _ in self._walk(text):
+            return True
+
+        return False
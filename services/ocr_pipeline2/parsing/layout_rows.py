@@ -0,0 +1,165 @@
+"""
+단어 위치 기반 영수증 행(row) 테이블
+
+- OCR layout(WordLayout)의 단어 box를 세로 중심 기준으로 정렬 후 한 번 훑어서 시각적 행으로 묶음
+  → 정렬 1회 + 행 내부 x 정렬 = O(n log n)
+- 행 안에서 가까이 붙은 단어는 하나의 셀로 합침 (예: "4" "," "500" → "4,500")
+- 행 끝 셀이 가격이면 price / price_x1 기록
+- 가격 열의 오른쪽 끝(right_edge) = 가격 행 price_x1의 중앙값
+  → 오른쪽 정렬된 금액 열에 있는 가격만 품목 가격으로 사용 (본문 중간 숫자 제외)
+
+full_text 줄 분리는 Vision이 읽은 순서를 따르므로 품목명과 가격이 다른 줄로 갈라지는 경우가 많음
+→ 같은 높이의 단어를 묶어 실제 영수증 행을 복원
+"""
+
+from .rules import PRICE_RE, HANGUL_RE
+
+# 행 구분 : 세로 중심 차이가 단어 높이 중앙값 × 이 값보다 크면 새 행
+ROW_TOLERANCE = 0.6
+
+# 셀 합치기 : 단어 간격이 단어 높이 중앙값 × 이 값 이하면 같은 셀
+CELL_GAP = 0.35
+
+# 가격 열 정렬 허용 오차 : 단어 높이 중앙값 × 이 값 (페이지 너비 3%보다 작으면 3% 사용)
+ALIGN_TOLERANCE = 2.0
+
+
+class LayoutCell:
+
+    __slots__ = ("text", "x0", "x1")
+
+    def __init__(self, text, x0, x1):
+        self.text = text
+        self.x0 = x0
+        self.x1 = x1
+
+
+class LayoutRow:
+    """
+    시각적 행 1개
+
+    cells    : x 순서 셀 목록
+    text     : 셀 텍스트를 공백으로 이은 행 텍스트
+    y        : 세로 중심 (정렬 / 인접 행 판단용)
+    price    : 행 끝 셀이 가격이면 int (아니면 None)
+    price_x1 : 가격 셀의 오른쪽 x
+    """
+
+    __slots__ = ("cells", "text", "y", "price", "price_x1", "_has_hangul")
+
+    def __init__(self, cells, y):
+        self.cells = cells
+        self.text = " ".join(c.text for c in cells)
+        self.y = y
+
+        self.price = None
+        self.price_x1 = None
+
+        last = cells[-1].text.rstrip("원")
+
+        if PRICE_RE.fullmatch(last):
+            self.price = int(last.replace(",", ""))
+            self.price_x1 = cells[-1].x1
+
+        self._has_hangul = None
+
+    @property
+    def has_hangul(self):
+        if self._has_hangul is None:
+            self._has_hangul = HANGUL_RE.search(self.text) is not None
+        return self._has_hangul
+
+
+class LayoutRowTable:
+    """
+    영수증 1장의 LayoutRow 목록 (위에서 아래 순서)
+    right_edge / tolerance : 가격 열 정렬 판단 기준
+    """
+
+    __slots__ = ("rows", "right_edge", "tolerance")
+
+    def __init__(self, rows, right_edge, tolerance):
+        self.rows = rows
+        self.right_edge = right_edge
+        self.tolerance = tolerance
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def __getitem__(self, index):
+        return self.rows[index]
+
+    def is_aligned(self, row) -> bool:
+        """행 가격이 오른쪽 가격 열에 있는지"""
+        return row.price is not None and row.price_x1 >= self.right_edge - self.tolerance
+
+
+def build_layout_rows(layout) -> LayoutRowTable:
+    """WordLayout → LayoutRowTable"""
+
+    import numpy as np
+
+    n = len(layout)
+
+    if n == 0:
+        return LayoutRowTable([], 0, 0)
+
+    boxes = layout.boxes
+    words = layout.words()
+
+    x0 = boxes[:, 0].tolist()
+    x1 = boxes[:, 2].tolist()
+    cy = ((boxes[:, 1] + boxes[:, 3]) / 2).tolist()
+
+    unit = max(1.0, float(np.median(boxes[:, 3] - boxes[:, 1])))
+
+    # --------------------------------------------------
+    # 1️⃣ 세로 중심 정렬 후 인접 단어를 행으로 묶기
+    # --------------------------------------------------
+    groups = []
+    current = []
+    anchor = None
+
+    for i in np.argsort(cy, kind="stable").tolist():
+
+        if current and cy[i] - anchor > unit * ROW_TOLERANCE:
+            groups.append(current)
+            current = []
+
+        current.append(i)
+        # 행 기준 높이 = 행 단어 세로 중심 평균 (살짝 기운 영수증 대응)
+        anchor = sum(cy[j] for j in current) / len(current)
+
+    groups.append(current)
+
+    # --------------------------------------------------
+    # 2️⃣ 행 내부 x 정렬 + 가까운 단어 셀로 합치기
+    # --------------------------------------------------
+    rows = []
+
+    for group in groups:
+        group.sort(key=lambda j: x0[j])
+
+        cells = []
+        for j in group:
+            if cells and x0[j] - cells[-1].x1 <= unit * CELL_GAP:
+                cell = cells[-1]
+                cell.text += words[j]
+                cell.x1 = max(cell.x1, x1[j])
+            else:
+                cells.append(LayoutCell(words[j], x0[j], x1[j]))
+
+        rows.append(LayoutRow(cells, sum(cy[j] for j in group) / len(group)))
+
+    # --------------------------------------------------
+    # 3️⃣ 가격 열 오른쪽 끝
+    # --------------------------------------------------
+    price_x1 = [row.price_x1 for row in rows if row.price is not None]
+    right_edge = float(np.median(price_x1)) if price_x1 else 0.0
+
+    tolerance = max(unit * ALIGN_TOLERANCE, layout.page_size[0] * 0.03)
+
+    return LayoutRowTable(rows, right_edge, tolerance)
@@ -0,0 +1,173 @@
+"""
+영수증 라인 feature 테이블
+
+- 영수증 1장당 1회 생성, 모든 extractor(store / total / payment / items)가 공유
+- 가격 regex 매칭 / 금액 / 차단 키워드 여부 등을 줄마다 한 번만 계산
+- __slots__로 줄 단위 객체 크기 최소화
+- 일부 영역에서만 쓰이는 값(정규화 텍스트, 상호명 점수 등)은 첫 접근 시 계산 후 캐싱
+"""
+
+from .rules import (
+    PRICE_RE,
+    HANGUL_RE,
+    HANGUL_OR_ALPHA_RE,
+    DIGIT_RE,
+    DIGITS_2_RE,
+    ALPHA_ONLY_RE,
+    normalize_text,
+    VAN_BLOCK_RE,
+    STORE_BLOCK_RE,
+    STORE_GENERIC_RE,
+    TOTAL_EXCLUDE_RE,
+    TOTAL_PRIORITY_AUTOMATON,
+    PAYMENT_SKIP_RE,
+    ITEM_EXCLUDE_RE,
+)
+
+_UNSET = object()
+
+
+class LineFeature:
+    """
+    영수증 한 줄의 파생 정보
+
+    text          : 원본 줄 텍스트
+    prices        : 가격 패턴 매칭 문자열 (예: ["4,500"])
+    amounts       : prices를 int로 변환한 값
+    van_blocked   : VAN / 결제사 줄 여부
+    item_excluded : items 제외 키워드 포함 여부
+    """
+
+    __slots__ = (
+        "text", "prices", "amounts", "van_blocked", "item_excluded",
+        "_normalized", "_store_score", "_priority_rank", "_total_excluded",
+        "_payment_skipped", "_has_hangul", "_has_digit",
+    )
+
+    def __init__(self, text):
+        self.text = text
+
+        prices = PRICE_RE.findall(text)
+        self.prices = prices
+        self.amounts = [int(p.replace(",", "")) for p in prices]
+
+        self.van_blocked = VAN_BLOCK_RE.search(text) is not None
+        self.item_excluded = ITEM_EXCLUDE_RE.search(text) is not None
+
+        self._normalized = _UNSET
+        self._store_score = _UNSET
+        self._priority_rank = _UNSET
+        self._total_excluded = _UNSET
+        self._payment_skipped = _UNSET
+        self._has_hangul = _UNSET
+        self._has_digit = _UNSET
+
+    @property
+    def normalized(self):
+        """대문자 + 한글/영문/숫자만 남긴 텍스트 (브랜드 탐색용)"""
+        if self._normalized is _UNSET:
+            self._normalized = normalize_text(self.text)
+        return self._normalized
+
+    @property
+    def has_hangul(self):
+        if self._has_hangul is _UNSET:
+            self._has_hangul = HANGUL_RE.search(self.text) is not None
+        return self._has_hangul
+
+    @property
+    def has_digit(self):
+        if self._has_digit is _UNSET:
+            self._has_digit = DIGIT_RE.search(self.text) is not None
+        return self._has_digit
+
+    @property
+    def store_score(self):
+        """휴리스틱 상호명 점수"""
+
+        if self._store_score is _UNSET:
+            text = self.text
+            score = 0
+
+            if HANGUL_OR_ALPHA_RE.search(text):
+                score += 2
+
+            if not self.has_digit:
+                score += 2
+
+            if 2 <= len(text) <= 25:
+                score += 1
+
+            if ALPHA_ONLY_RE.match(text):
+                score += 3
+
+            if DIGITS_2_RE.search(text):
+                score -= 3
+
+            if STORE_BLOCK_RE.search(text):
+                score -= 5
+
+            if STORE_GENERIC_RE.search(text.lower()):
+                score += 2
+
+            self._store_score = score
+
+        return self._store_score
+
+    @property
+    def priority_rank(self):
+        """포함된 total 우선순위 키워드 중 가장 앞선 index (없으면 None)"""
+        if self._priority_rank is _UNSET:
+            self._priority_rank = TOTAL_PRIORITY_AUTOMATON.first(self.text)
+        return self._priority_rank
+
+    @property
+    def total_excluded(self):
+        """total fallback 후보 제외 여부 (할인(-) / 세금·단가 등)"""
+        if self._total_excluded is _UNSET:
+            self._total_excluded = (
+                "-" in self.text
+                or TOTAL_EXCLUDE_RE.search(self.text.replace(" ", "")) is not None
+            )
+        return self._total_excluded
+
+    @property
+    def payment_skipped(self):
+        """환불 안내 문구 등 결제수단 탐색 제외 여부"""
+        if self._payment_skipped is _UNSET:
+            self._payment_skipped = PAYMENT_SKIP_RE.search(self.text) is not None
+        return self._payment_skipped
+
+
+class LineFeatureTable:
+    """
+    영수증 1장의 LineFeature 목록
+    extract_* 함수는 줄 리스트 대신 이 테이블을 받아 재계산 없이 공유 가능
+    """
+
+    __slots__ = ("lines", "rows")
+
+    def __init__(self, lines):
+        self.lines = lines
+        self.rows = [LineFeature(text) for text in lines]
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def __getitem__(self, index):
+        return self.rows[index]
+
+
+def build_line_features(lines):
+    """
+    줄 리스트 → LineFeatureTable
+    이미 테이블이면 그대로 반환 (extract_* 개별 호출 / parse_text 공용)
+    """
+
+    if isinstance(lines, LineFeatureTable):
+        return lines
+
+    return LineFeatureTable(lines)
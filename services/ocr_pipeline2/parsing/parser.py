@@ -1,51 +1,73 @@
-import re
 from datetime import datetime
 
-from .dict.store_dict import BRAND_KEYWORDS
-from .dict.store_dict import STORE_GENERIC
-from .dict.store_dict import STORE_CATEGORY_RULES
-from .dict.item_dict import ITEM_CATEGORY_RULES
+from .rules import (
+    STORE_PATTERNS,
+    DATE_PATTERNS,
+    PAYMENT_WINDOW,
+    PAYMENT_PRIORITY,
+    STORE_CATEGORY_AUTOMATON,
+    ITEM_CATEGORY_AUTOMATON,
+    BRAND_AUTOMATON,
+    ITEM_MIN_PRICE,
+    ITEM_NAME_BLOCK_RE,
+    ITEM_EXCLUDE_RE,
+    CODE_ONLY_RE,
+    PRICE_RE,
+    HANGUL_RE,
+    DELIVERY_KEYWORDS,
+)
+from .line_features import build_line_features
+from .layout_rows import build_layout_rows
+
+# 파싱 / 검증 결과가 달라지는 변경(rules.py / dict / extractor / validator)마다 1씩 올림
+# → 저장된 draft 중 버전이 다른 행은 재파싱 작업(pipeline/rederive.py)이 OCR 원문으로 다시 파싱
+PARSER_VERSION = 1
+
+# ※ 정규식 / 키워드 테이블은 rules.py에서 import 시 1회 컴파일됨
+# ※ extract_* 함수는 줄 리스트 또는 LineFeatureTable을 받음
+#    parse_text는 테이블을 1회 생성해서 모든 extractor가 공유
+
 
 # --------------------------------------------------
 # 1️⃣ Store Name
 # --------------------------------------------------
+def _store_from_fields(lines):
+    """매장 필드 regex (마지막 fallback)"""
 
-def normalize_text(t):
-    return re.sub(r"[^A-Z0-9가-힣]", "", t.upper())
+    for text in lines:
 
+        for p in STORE_PATTERNS:
 
-def extract_store_name(lines):
+            m = p.search(text)
 
-    # 🔹 VAN / 결제사 차단
-    VAN_BLOCK = [
-        "KOCES","KICC","한국신용카드","신용카드","신용매출"
-    ]
+            if m:
 
-    # --------------------------------------------------
-    # 1️⃣ 브랜드 사전 탐색
-    # --------------------------------------------------
-    for text in lines[:10]:
+                name = m.group(1).strip()
 
-        if any(v in text for v in VAN_BLOCK):
-            continue
+                if "가맹점주소" in name:
+                    continue
 
-        text_norm = normalize_text(text)
+                if 2 <= len(name) <= 30:
+                    return name
+
+    return ""
 
-        for brand in BRAND_KEYWORDS:
 
-            brand_norm = normalize_text(brand)
+def extract_store_name(lines):
 
-            if brand_norm in text_norm:
-                return text.strip()
+    features = build_line_features(lines)
+    candidates = features[:10]
 
-    BLOCK_KEYWORDS = [
-        "사업자","TEL","전화","합계","총액",
-        "카드","단가","수량","금액","상품",
-        "고객용","주문","요청","주소",
-        "대한민국","고객","APP","메뉴"
-    ]
+    # --------------------------------------------------
+    # 1️⃣ 브랜드 사전 탐색
+    # --------------------------------------------------
+    for f in candidates:
+
+        if f.van_blocked:
+            continue
 
-    candidates = lines[:10]
+        if BRAND_AUTOMATON.contains_any(f.normalized):
+            return f.text.strip()
 
     best_score = -999
     best_text = ""
@@ -53,43 +75,20 @@ def extract_store_name(lines):
     # --------------------------------------------------
     # 2️⃣ 휴리스틱 점수 기반 탐색
     # --------------------------------------------------
-    for text in candidates:
+    for f in candidates:
 
-        if "가맹점주소" in text:
+        if "가맹점주소" in f.text:
             continue
 
-        if "신고안내" in text:
+        if "신고안내" in f.text:
             continue
 
-        if any(v in text for v in VAN_BLOCK):
+        if f.van_blocked:
             continue
 
-        score = 0
-
-        if re.search(r"[가-힣A-Za-z]", text):
-            score += 2
-
-        if not re.search(r"\d", text):
-            score += 2
-
-        if 2 <= len(text) <= 25:
-            score += 1
-
-        if re.match(r"^[A-Za-z&\-\s]+$", text):
-            score += 3
-
-        if re.search(r"\d{2,}", text):
-            score -= 3
-
-        if any(k in text for k in BLOCK_KEYWORDS):
-            score -= 5
-
-        if any(g in text.lower() for g in STORE_GENERIC):
-            score += 2
-
-        if score > best_score:
-            best_score = score
-            best_text = text
+        if f.store_score > best_score:
+            best_score = f.store_score
+            best_text = f.text
 
     if best_text:
         return best_text.strip()
@@ -97,74 +96,18 @@ def extract_store_name(lines):
     # --------------------------------------------------
     # 3️⃣ 매장 필드 regex (마지막 fallback)
     # --------------------------------------------------
-    store_patterns = [
-        r"주문\s*매장\s*[:：]\s*(.+)",
-        r"상호\s*[:：]\s*(.+)",
-        r"매장명\s*[:：]\s*(.+)",
-        r"가맹점명\s*[:：]\s*(.+)",
-    ]
-
-    for text in lines:
-
-        for p in store_patterns:
-
-            m = re.search(p, text)
-
-            if m:
-
-                name = m.group(1).strip()
-
-                if "가맹점주소" in name:
-                    continue
-
-                if 2 <= len(name) <= 30:
-                    return name
+    return _store_from_fields(features.lines)
 
-    return ""
-
-
-# --------------------------------------------------
-# 2️⃣ Date
-# --------------------------------------------------
-def extract_date(lines):
-
-    full_text = "\n".join(lines)
-
-    patterns = [
-        r"(\d{4}|\d{2})[-./년\s]+(\d{1,2})[-./월\s]+(\d{1,2})",
-        r"(\d{4})(\d{2})(\d{2})"
-    ]
-
-    for pattern in patterns:
-        for m in re.finditer(pattern, full_text):
-            y, mth, d = m.groups()
-
-            if len(y) == 2:
-                y = "20" + y
-
-            try:
-                dt = datetime(int(y), int(mth), int(d))
-                if 2010 <= dt.year <= 2030:
-                    return dt.strftime("%Y-%m-%d")
-            except ValueError:
-                continue
-
-    return ""
 
 # --------------------------------------------------
 # 2️⃣ Date
 # --------------------------------------------------
 def extract_date(lines):
 
-    full_text = "\n".join(lines)
-
-    patterns = [
-        r"(\d{4}|\d{2})[-./년\s]+(\d{1,2})[-./월\s]+(\d{1,2})",
-        r"(\d{4})(\d{2})(\d{2})"
-    ]
+    full_text = "\n".join(build_line_features(lines).lines)
 
-    for pattern in patterns:
-        for m in re.finditer(pattern, full_text):
+    for pattern in DATE_PATTERNS:
+        for m in pattern.finditer(full_text):
             y, mth, d = m.groups()
 
             if len(y) == 2:
@@ -185,87 +128,45 @@ def extract_date(lines):
 # --------------------------------------------------
 def extract_total(lines):
 
-    EXCLUDE_KEYWORDS = [
-        "받은금액", "상품권", "거스름", "내신금액", "면세", "과세", "부가세", "세액",
-        "단가", "수량", "상품코드", "상품명", "품목", "가격", "할인", "할인액", "총할인*", "적립", "포인트", "쿠폰", "잔액",
-        "예금", "계좌", "카드번호", "승인번호", "사업자등록번호", "전화번호", "주소", "대표자", "사업자", 
-        "상호", "매장", "가맹점", "주문", "요청", "APP", "고객", "고객용", "대한민국", "영수증", "영수증용",
-        "세금계산서", "계산서", "청구서", "명세서"
-        ]
-
-    PRIORITY_KEYWORDS = [
-        "카드청구액", "결제대상금액", "결제금액", "결제액", "결제금", "합계", "총액", "총합계", "총금액", "총",
-        "총합", "계", "총계", "금액", "청구금액", "청구액", "지불금액", "지불액", "실결제금액", "실결제액"
-        "실제결제금액", "실제결제액"
-    ]    
+    features = build_line_features(lines)
+    n = len(features)
 
     # 1️⃣ 우선순위 기반 탐색
-    for keyword in PRIORITY_KEYWORDS:
-        for i, text in enumerate(lines):
-            if keyword in text:
-
-                # 같은 줄 숫자
-                nums = re.findall(r"\d{1,3}(?:,\d{3})+", text)
-                if nums:
-                    return int(nums[-1].replace(",", ""))
+    # 키워드 우선순위 → 줄 순서로 처음 금액이 잡히는 줄
+    # = 금액이 잡히는 줄 중 (포함 키워드 최소 index, 줄 번호)가 가장 작은 줄
+    best_rank = None
+    best_value = 0
 
-                # 다음 줄 탐색
-                if i + 1 < len(lines):
-                    nums = re.findall(r"\d{1,3}(?:,\d{3})+", lines[i+1])
-                    if nums:
-                        return int(nums[-1].replace(",", ""))
+    for i, f in enumerate(features):
 
-    # 2️⃣ fallback 후보 수집
-    candidates = []
+        # 같은 줄 숫자 → 없으면 다음 줄 탐색
+        amounts = f.amounts or (features[i+1].amounts if i + 1 < n else None)
 
-    for text in lines:
-        clean = text.replace(" ", "")
-
-        # 할인(-) 제외
-        if "-" in text:
-            continue
-
-        # 세금/단가 제외
-        if any(k in clean for k in EXCLUDE_KEYWORDS):
+        if not amounts:
             continue
 
-        nums = re.findall(r"\d{1,3}(?:,\d{3})+", text)
+        rank = f.priority_rank
 
-        for n in nums:
-            val = int(n.replace(",", ""))
-            if val >= 500:
-                candidates.append(val)
+        if rank is not None and (best_rank is None or rank < best_rank):
+            best_rank = rank
+            best_value = amounts[-1]
 
-    return max(candidates) if candidates else 0
+            if rank == 0:
+                break
 
+    if best_rank is not None:
+        return best_value
 
-# --------------------------------------------------
-# 2️⃣ Date
-# --------------------------------------------------
-def extract_date(lines):
-
-    full_text = "\n".join(lines)
-
-    patterns = [
-        r"(\d{4}|\d{2})[-./년\s]+(\d{1,2})[-./월\s]+(\d{1,2})",
-        r"(\d{4})(\d{2})(\d{2})"
+    # 2️⃣ fallback 후보 수집 (할인(-) / 세금·단가 제외)
+    candidates = [
+        val
+        for f in features
+        if f.amounts and not f.total_excluded
+        for val in f.amounts
+        if val >= 500
     ]
 
-    for pattern in patterns:
-        for m in re.finditer(pattern, full_text):
-            y, mth, d = m.groups()
-
-            if len(y) == 2:
-                y = "20" + y
-
-            try:
-                dt = datetime(int(y), int(mth), int(d))
-                if 2010 <= dt.year <= 2030:
-                    return dt.strftime("%Y-%m-%d")
-            except ValueError:
-                continue
-
-    return ""
+    return max(candidates) if candidates else 0
 
 
 # --------------------------------------------------
@@ -273,22 +174,14 @@ def extract_date(lines):
 # --------------------------------------------------
 def extract_payment(lines):
 
-    # 하단 15줄만 탐색 (결제 영역)
-    target_lines = lines[-15:]
-
-    PAYMENT_PRIORITY = [
-        ("페이", "app"),
-        ("현금", "cash"),
-        ("카드", "card"),
+    # 하단 15줄만 탐색 (결제 영역), 환불 안내 문구 제외
+    target_lines = [
+        f.text for f in build_line_features(lines)[-PAYMENT_WINDOW:]
+        if not f.payment_skipped
     ]
 
     for keyword, label in PAYMENT_PRIORITY:
         for text in target_lines:
-
-            # 환불 안내 문구 제외
-            if "환불" in text or "지참" in text or "영수증" in text:
-                continue
-
             if keyword in text:
                 return label
 
@@ -300,20 +193,15 @@ def extract_payment(lines):
 # --------------------------------------------------
 def classify_category(store_name, full_text):
 
-    store_upper = store_name.upper()
-    text_upper = full_text.upper()
-
     # 1️⃣ store 기반 분류
-    for category, keywords in STORE_CATEGORY_RULES.items():
-        for kw in keywords:
-            if kw.upper() in store_upper:
-                return category
+    hit = STORE_CATEGORY_AUTOMATON.first(store_name.upper())
+    if hit:
+        return hit[0]
 
     # 2️⃣ 품목 기반 분류
-    for category, keywords in ITEM_CATEGORY_RULES.items():
-        for kw in keywords:
-            if kw.upper() in text_upper:
-                return category
+    hit = ITEM_CATEGORY_AUTOMATON.first(full_text.upper())
+    if hit:
+        return hit[0]
 
     return "기타"
 
@@ -321,146 +209,234 @@ def classify_category(store_name, full_text):
 # --------------------------------------------------
 # 6️⃣ Items 추출 추가
 # --------------------------------------------------
-def extract_items(lines):
-
-    EXCLUDE_KEYWORDS = [
-        "%", "APP", "P", "가격", "가맹점", "거스름", "고객", "고객용",
-        "과세", "계산서", "계좌", "대한민국", "단가", "대표", "대표자",
-        "매장", "면세", "명세서", "부가세", "사업자", "사업자등록번호",
-        "상호", "세금", "세금계산서", "세액", "수량", "승인", "승인번호",
-        "영수증", "영수증용", "예금", "요청", "주소", "점", "주문", "전화",
-        "전화번호", "총액", "총합", "총할인*", "카드", "카드번호",
-        "쿠폰", "내신금액", "상품권", "상품코드", "적립", "포인트",
-        "판매", "합계", "현금",
-
-        # 🔹 추가 노이즈 필터
-        "결제", "지불", "청구", "금액", "잔액", "번호", "CATID",
-        "POS", "KOCES", "KICC", "NO", "소계", "총계"
-    ]
+def _single_line_item(f):
+    """
+    가격이 같은 줄 끝에 있는 item 후보
+    (total 비교는 호출 측에서 수행)
+    """
 
-    items = []
+    text = f.text
+    price_text = f.prices[0]
+    price = f.amounts[0]
 
-    # 전체 total 한번 계산
-    total_value = extract_total(lines)
+    if price < ITEM_MIN_PRICE:
+        return None
 
-    # --------------------------------------------------
-    # 1️⃣ single line item 탐색
-    # --------------------------------------------------
-    for text in lines:
+    # 가격이 줄 끝에 있는 경우만
+    if not text.strip().endswith(price_text):
+        return None
 
-        price_match = re.search(r"\d{1,3}(?:,\d{3})+", text)
+    name = text.replace(price_text, "").strip()
 
-        if not price_match:
-            continue
+    if len(name) < 2:
+        return None
 
-        if any(k in text for k in EXCLUDE_KEYWORDS):
-            continue
+    # 1️⃣ 한글 없는 항목 제거 (숫자, 코드 제거)
+    # 가격 문자열에는 한글이 없으므로 줄 단위 플래그로 판정 가능
+    if not f.has_hangul:
+        return None
 
-        price = int(price_match.group().replace(",", ""))
+    # 2️⃣ 세금 / 결제 라인 제거
+    if ITEM_NAME_BLOCK_RE.search(name):
+        return None
 
-        if price < 500:
-            continue
+    # 3️⃣ 너무 긴 텍스트 제거 (영수증 설명문 방지)
+    if len(name) > 25:
+        return None
 
-        # total과 동일한 값 제거
-        if price == total_value:
-            continue
+    return {
+        "name": name,
+        "normalized": normalize_item(name),
+        "price": price,
+        "qty": 1,
+        "line_text": text
+    }
 
-        # 가격이 줄 끝에 있는 경우만
-        if not text.strip().endswith(price_match.group()):
-            continue
 
-        name = text.replace(price_match.group(), "").strip()
+def _split_line_item(item_line, price_line, price):
+    """
+    item + price가 서로 다른 줄로 분리된 후보
+    (total 비교는 호출 측에서 수행)
+    """
 
-        if len(name) < 2:
-            continue
+    name = item_line.strip()
 
-        # 1️⃣ 한글 없는 항목 제거 (숫자, 코드 제거)
-        if not re.search(r"[가-힣]", name):
-            continue
+    if len(name) < 2:
+        return None
 
-        # 2️⃣ 세금 / 결제 라인 제거
-        if re.search(r"(세|부가세|결제|합계|총액|금액)", name):
-            continue
+    if CODE_ONLY_RE.fullmatch(name):
+        return None
+
+    return {
+        "name": normalize_item(name),
+        "price": price,
+        "qty": 1,
+        "line_text": item_line + " | " + price_line
+    }
+
+
+def extract_items(lines, total_value=None):
+    """
+    total_value : 이미 계산된 total (없으면 내부에서 1회 계산)
+    """
+
+    features = build_line_features(lines)
+
+    # 전체 total 한번 계산
+    if total_value is None:
+        total_value = extract_total(features)
+
+    single_items = []
+    split_items = []
+
+    n = len(features)
+
+    for i, f in enumerate(features):
 
-        # 3️⃣ 너무 긴 텍스트 제거 (영수증 설명문 방지)
-        if len(name) > 25:
+        if f.item_excluded:
             continue
 
-        normalized = normalize_item(name)
+        # --------------------------------------------------
+        # 1️⃣ single line item 탐색
+        # --------------------------------------------------
+        if f.prices:
+            item = _single_line_item(f)
 
-        items.append({
-            "name": name,          
-            "normalized": normalized, 
-            "price": price,
-            "qty": 1,
-            "line_text": text
-        })
+            if item:
+                single_items.append(item)
+
+        # --------------------------------------------------
+        # 2️⃣ item + price 분리된 경우
+        # --------------------------------------------------
+        if i + 1 < n and len(f.text) <= 40:
+            nxt = features[i+1]
+
+            if nxt.amounts and nxt.amounts[0] >= ITEM_MIN_PRICE:
+                item = _split_line_item(f.text, nxt.text, nxt.amounts[0])
+
+                if item:
+                    split_items.append(item)
 
     # --------------------------------------------------
-    # 2️⃣ item + price 분리된 경우
+    # 3️⃣ total과 동일한 값 제거 + dedupe
     # --------------------------------------------------
-    for i in range(len(lines)-1):
+    unique = []
+    seen = set()
 
-        item_line = lines[i]
-        price_line = lines[i+1]
+    for items in (single_items, split_items):
+        for item in items:
 
-        if len(item_line) > 40:
-            continue
+            if item["price"] == total_value:
+                continue
 
-        if any(k in item_line for k in EXCLUDE_KEYWORDS):
-            continue
+            key = (item["name"], item["price"])
+
+            if key not in seen:
+                unique.append(item)
+                seen.add(key)
+
+    return unique
+
+
+def _layout_item_name(row):
+    """
+    가격 앞 셀 중 숫자가 나오기 전까지를 품목명으로 사용
+    반환: (name, 나머지 숫자 셀 텍스트 목록)
+    """
+
+    name_cells = []
+    rest = []
+
+    for cell in row.cells[:-1]:
+        if rest or CODE_ONLY_RE.fullmatch(cell.text) or PRICE_RE.fullmatch(cell.text):
+            rest.append(cell.text)
+        else:
+            name_cells.append(cell.text)
+
+    return " ".join(name_cells).strip(), rest
+
+
+def _layout_qty(rest, price):
+    """단가 × 수량 = 금액이 맞을 때만 수량 반영 (아니면 1)"""
+
+    numbers = [int(t.replace(",", "")) for t in rest if t.replace(",", "").isdigit()]
+    qtys = [v for v in numbers if 1 < v < 100]
+    units = [v for v in numbers if v >= ITEM_MIN_PRICE]
+
+    for q in qtys:
+        for u in units:
+            if u * q == price:
+                return q
 
-        price = extract_price(price_line)
+    return 1
 
-        if not price:
+
+def extract_items_from_layout(layout, total_value=None):
+    """
+    단어 위치(layout) 기반 item 추출
+    - 시각적 행 단위로 품목명 + 오른쪽 정렬 가격 짝짓기
+    - 가격만 있는 행은 바로 위 행(가격 없는 한글 행)을 품목명으로 사용
+    - 행 단위로 짝이 확정되므로 text 방식의 후보 중복 제거는 하지 않음
+      (같은 품목이 두 행이면 실제로 두 번 산 것)
+
+    total_value : 이미 계산된 total (합계 행과 같은 금액 제외용)
+    """
+
+    rows = build_layout_rows(layout)
+    items = []
+    pending_name = None
+
+    for row in rows:
+
+        if ITEM_EXCLUDE_RE.search(row.text):
+            pending_name = None
             continue
 
-        if price == total_value:
+        if not rows.is_aligned(row):
+            # 가격 없는 한글 행 → 다음 행 가격과 짝 후보
+            pending_name = row if row.price is None and row.has_hangul else None
             continue
 
-        name = item_line.strip()
+        name, rest = _layout_item_name(row)
+        line_text = row.text
 
-        if len(name) < 2:
+        if not name and pending_name is not None:
+            name = pending_name.text.strip()
+            line_text = pending_name.text + " | " + row.text
+
+        pending_name = None
+        price = row.price
+
+        if price < ITEM_MIN_PRICE or price == total_value:
             continue
 
-        if re.fullmatch(r"[0-9\-* ]+", name):
+        if not 2 <= len(name) <= 25:
             continue
 
-        name = normalize_item(name)
+        if HANGUL_RE.search(name) is None or ITEM_NAME_BLOCK_RE.search(name):
+            continue
 
         items.append({
             "name": name,
+            "normalized": normalize_item(name),
             "price": price,
-            "qty": 1,
-            "line_text": item_line + " | " + price_line
+            "qty": _layout_qty(rest, price),
+            "line_text": line_text
         })
 
-    # --------------------------------------------------
-    # 3️⃣ dedupe
-    # --------------------------------------------------
-    unique = []
-    seen = set()
-
-    for item in items:
-        key = (item["name"], item["price"])
-
-        if key not in seen:
-            unique.append(item)
-            seen.add(key)
-
-    return unique
+    return items
 
 
 def extract_price(text):
 
-    match = re.search(r"\d{1,3}(?:,\d{3})+", text)
+    match = PRICE_RE.search(text)
 
     if not match:
         return None
 
     value = int(match.group().replace(",", ""))
 
-    if value < 500:
+    if value < ITEM_MIN_PRICE:
         return None
 
     return value
@@ -471,14 +447,9 @@ def extract_price(text):
 # --------------------------------------------------
 def normalize_item(name):
 
-    name_upper = name.upper()
-
-    for _, keywords in ITEM_CATEGORY_RULES.items():
-        for kw in keywords:
-            if kw.upper() in name_upper:
-                return kw
+    hit = ITEM_CATEGORY_AUTOMATON.first(name.upper())
 
-    return name
+    return hit[1] if hit else name
 
 
 # --------------------------------------------------
@@ -486,22 +457,27 @@ def normalize_item(name):
 # --------------------------------------------------
 def parse_text(ocr_result: dict) -> dict:
 
-    lines = [l.strip() for l in ocr_result["full_text"].split("\n") if l.strip()]
-
-    store = extract_store_name(lines)
-    date = extract_date(lines)
-    total = extract_total(lines)
-    payment = extract_payment(lines)
-    category = classify_category(store, ocr_result["full_text"])
-    items = extract_items(lines)
     full_text = ocr_result["full_text"]
+    lines = [l.strip() for l in full_text.split("\n") if l.strip()]
+
+    # 줄 feature는 1회만 계산해서 모든 extractor가 공유
+    features = build_line_features(lines)
+
+    store = extract_store_name(features)
+    date = extract_date(features)
+    total = extract_total(features)
+    payment = extract_payment(features)
+    category = classify_category(store, full_text)
+
+    # [변경] 단어 위치 정보가 있으면 행 기반 item 추출 우선 (못 찾으면 줄 기반으로 fallback)
+    layout = ocr_result.get("layout")
+    items = extract_items_from_layout(layout, total_value=total) if layout is not None else []
+
+    if not items:
+        items = extract_items(features, total_value=total)
 
     # 배달/포장 fallback
-    if (not store or len(store) < 2) and (
-        "배달" in full_text or
-        "포장" in full_text or
-        "픽업" in full_text
-    ):
+    if (not store or len(store) < 2) and any(k in full_text for k in DELIVERY_KEYWORDS):
         store = "배달/포장"
         category = "식비"
 
@@ -512,4 +488,4 @@ def parse_text(ocr_result: dict) -> dict:
         "payment": payment,
         "category": category,
         "items": items
-    }
\ No newline at end of file
+    }
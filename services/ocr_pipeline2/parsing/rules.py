@@ -0,0 +1,177 @@
+"""
+파서 공용 규칙 테이블
+
+- 정규식 / 키워드 목록을 import 시점에 1회만 컴파일·정규화
+- parser.py의 각 extractor가 호출마다 다시 만들던 리스트를 모듈 상수로 이동
+- 목록 내용/순서는 기존 extractor와 동일하게 유지 (순서가 곧 우선순위)
+- 브랜드 / 카테고리 / 품목 사전은 Aho-Corasick automaton으로 구축
+"""
+
+import re
+
+from .keyword_automaton import KeywordAutomaton
+
+from .dict.store_dict import BRAND_KEYWORDS
+from .dict.store_dict import STORE_GENERIC
+from .dict.store_dict import STORE_CATEGORY_RULES
+from .dict.item_dict import ITEM_CATEGORY_RULES
+
+
+# --------------------------------------------------
+# 공용 정규식
+# --------------------------------------------------
+PRICE_RE = re.compile(r"\d{1,3}(?:,\d{3})+")
+NORMALIZE_RE = re.compile(r"[^A-Z0-9가-힣]")
+
+HANGUL_RE = re.compile(r"[가-힣]")
+HANGUL_OR_ALPHA_RE = re.compile(r"[가-힣A-Za-z]")
+DIGIT_RE = re.compile(r"\d")
+DIGITS_2_RE = re.compile(r"\d{2,}")
+ALPHA_ONLY_RE = re.compile(r"^[A-Za-z&\-\s]+$")
+
+
+def normalize_text(t):
+    return NORMALIZE_RE.sub("", t.upper())
+
+
+def keyword_pattern(keywords):
+    """
+    키워드 목록 → 단일 alternation 정규식
+    any(k in text for k in keywords)와 동일한 판정을 C 레벨 1회 탐색으로 수행
+    """
+    return re.compile("|".join(re.escape(k) for k in keywords))
+
+
+# --------------------------------------------------
+# 1️⃣ Store Name
+# --------------------------------------------------
+# VAN / 결제사 차단
+VAN_BLOCK = (
+    "KOCES", "KICC", "한국신용카드", "신용카드", "신용매출"
+)
+
+STORE_BLOCK_KEYWORDS = (
+    "사업자", "TEL", "전화", "합계", "총액",
+    "카드", "단가", "수량", "금액", "상품",
+    "고객용", "주문", "요청", "주소",
+    "대한민국", "고객", "APP", "메뉴"
+)
+
+VAN_BLOCK_RE = keyword_pattern(VAN_BLOCK)
+STORE_BLOCK_RE = keyword_pattern(STORE_BLOCK_KEYWORDS)
+
+# 매장 필드 regex (마지막 fallback)
+STORE_PATTERNS = tuple(re.compile(p) for p in (
+    r"주문\s*매장\s*[:：]\s*(.+)",
+    r"상호\s*[:：]\s*(.+)",
+    r"매장명\s*[:：]\s*(.+)",
+    r"가맹점명\s*[:：]\s*(.+)",
+))
+
+# 브랜드 사전은 정규화된 형태로 automaton 구축 (호출마다 normalize_text 재계산 방지)
+BRAND_AUTOMATON = KeywordAutomaton(
+    (normalize_text(brand), brand) for brand in BRAND_KEYWORDS
+)
+
+STORE_GENERIC_RE = keyword_pattern(STORE_GENERIC)
+
+
+# --------------------------------------------------
+# 2️⃣ Date
+# --------------------------------------------------
+DATE_PATTERNS = tuple(re.compile(p) for p in (
+    r"(\d{4}|\d{2})[-./년\s]+(\d{1,2})[-./월\s]+(\d{1,2})",
+    r"(\d{4})(\d{2})(\d{2})"
+))
+
+
+# --------------------------------------------------
+# 3️⃣ Total
+# --------------------------------------------------
+TOTAL_EXCLUDE_KEYWORDS = (
+    "받은금액", "상품권", "거스름", "내신금액", "면세", "과세", "부가세", "세액",
+    "단가", "수량", "상품코드", "상품명", "품목", "가격", "할인", "할인액", "총할인*", "적립", "포인트", "쿠폰", "잔액",
+    "예금", "계좌", "카드번호", "승인번호", "사업자등록번호", "전화번호", "주소", "대표자", "사업자",
+    "상호", "매장", "가맹점", "주문", "요청", "APP", "고객", "고객용", "대한민국", "영수증", "영수증용",
+    "세금계산서", "계산서", "청구서", "명세서"
+)
+
+TOTAL_EXCLUDE_RE = keyword_pattern(TOTAL_EXCLUDE_KEYWORDS)
+
+TOTAL_PRIORITY_KEYWORDS = (
+    "카드청구액", "결제대상금액", "결제금액", "결제액", "결제금", "합계", "총액", "총합계", "총금액", "총",
+    "총합", "계", "총계", "금액", "청구금액", "청구액", "지불금액", "지불액", "실결제금액", "실결제액"
+    "실제결제금액", "실제결제액"
+)
+
+# 줄에 포함된 우선순위 키워드 중 가장 앞선 index
+TOTAL_PRIORITY_AUTOMATON = KeywordAutomaton(
+    (keyword, rank) for rank, keyword in enumerate(TOTAL_PRIORITY_KEYWORDS)
+)
+
+
+# --------------------------------------------------
+# 4️⃣ Payment
+# --------------------------------------------------
+PAYMENT_WINDOW = 15  # 하단 15줄만 탐색 (결제 영역)
+
+PAYMENT_PRIORITY = (
+    ("페이", "app"),
+    ("현금", "cash"),
+    ("카드", "card"),
+)
+
+# 환불 안내 문구 제외
+PAYMENT_SKIP_KEYWORDS = ("환불", "지참", "영수증")
+PAYMENT_SKIP_RE = keyword_pattern(PAYMENT_SKIP_KEYWORDS)
+
+
+# --------------------------------------------------
+# 5️⃣ Category
+# --------------------------------------------------
+# 대문자 키워드 → (카테고리, 원본 키워드)
+# 등록 순서 = dict 순서 → automaton.first()가 기존 "카테고리 순 첫 매칭"과 동일
+STORE_CATEGORY_AUTOMATON = KeywordAutomaton(
+    (kw.upper(), (category, kw))
+    for category, keywords in STORE_CATEGORY_RULES.items()
+    for kw in keywords
+)
+
+# category 분류 + item normalization 공용
+ITEM_CATEGORY_AUTOMATON = KeywordAutomaton(
+    (kw.upper(), (category, kw))
+    for category, keywords in ITEM_CATEGORY_RULES.items()
+    for kw in keywords
+)
+
+
+# --------------------------------------------------
+# 6️⃣ Items
+# --------------------------------------------------
+ITEM_EXCLUDE_KEYWORDS = (
+    "%", "APP", "P", "가격", "가맹점", "거스름", "고객", "고객용",
+    "과세", "계산서", "계좌", "대한민국", "단가", "대표", "대표자",
+    "매장", "면세", "명세서", "부가세", "사업자", "사업자등록번호",
+    "상호", "세금", "세금계산서", "세액", "수량", "승인", "승인번호",
+    "영수증", "영수증용", "예금", "요청", "주소", "점", "주문", "전화",
+    "전화번호", "총액", "총합", "총할인*", "카드", "카드번호",
+    "쿠폰", "내신금액", "상품권", "상품코드", "적립", "포인트",
+    "판매", "합계", "현금",
+
+    # 🔹 추가 노이즈 필터
+    "결제", "지불", "청구", "금액", "잔액", "번호", "CATID",
+    "POS", "KOCES", "KICC", "NO", "소계", "총계"
+)
+
+ITEM_EXCLUDE_RE = keyword_pattern(ITEM_EXCLUDE_KEYWORDS)
+
+ITEM_MIN_PRICE = 500
+
+# 세금 / 결제 라인 제거
+ITEM_NAME_BLOCK_RE = re.compile(r"(세|부가세|결제|합계|총액|금액)")
+
+# 숫자/코드만 있는 라인
+CODE_ONLY_RE = re.compile(r"[0-9\-* ]+")
+
+# 배달/포장 fallback 키워드
+DELIVERY_KEYWORDS = ("배달", "포장", "픽업")
@@ -0,0 +1,280 @@
+"""
+OCR 원문 + draft 버전 저장소 (SQLite)
+
+- 파이프라인 실행마다 OCR 원문(full_text + layout BLOB)과 파싱 결과 draft를 함께 보관
+- draft마다 만든 파서 버전(PARSER_VERSION) 기록
+  → 파서 규칙이 바뀌면 버전이 다른 행만 저장된 OCR 원문으로 다시 파싱 (Vision 재호출 없음)
+- 재파싱 대상 조회는 id 순 keyset 페이지 단위 → 중간에 멈춰도 다음 실행이 남은 행부터 이어서 처리
+- 보관 한도(max_rows / max_age_s)를 주면 PURGE_EVERY건 저장마다 오래된 행부터 삭제
+  (OCR 원문 + layout이 업로드마다 쌓이므로 한도 없이 켜 두지 않음)
+
+draft 컬럼에는 파싱 / 검증에서 나온 필드만 저장 (이벤트 로그 / 분리 영수증 목록 등은 제외)
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from services.ocr_pipeline2.ocr.word_layout import WordLayout
+
+DEFAULT_STORE_PATH = "data/drafts/draft_store.sqlite3"
+
+# 보관 한도 기본값 (get_default_draft_store) — 최근 10만 건 / 90일
+DEFAULT_MAX_ROWS = 100_000
+DEFAULT_MAX_AGE_DAYS = 90
+
+# 저장 몇 건마다 보관 한도 적용
+PURGE_EVERY = 500
+
+# 실행마다 달라지거나 다른 draft를 담는 필드 (재파싱 결과와 비교 대상 아님)
+VOLATILE_KEYS = ("events", "segments", "rescue", "draft_id", "db_insert_ready", "db_payload")
+
+# OCR 원문으로 다시 파싱해도 만들어지지 않는 필드 (재파싱 시 기존 값 유지)
+CARRY_KEYS = ("segment", "stitched_from")
+
+
+def derived_fields(draft: dict) -> dict:
+    """draft 중 파싱 / 검증으로 만들어지는 필드만"""
+    return {k: v for k, v in draft.items() if k not in VOLATILE_KEYS}
+
+
+class DraftStore:
+
+    def __init__(self, path: str = DEFAULT_STORE_PATH, max_rows: int = None, max_age_s: float = None):
+        """
+        max_rows  : 최대 보관 행 수 (None이면 제한 없음)
+        max_age_s : 최대 보관 기간 (초, None이면 제한 없음)
+        """
+
+        self.path = path
+        self.max_rows = max_rows
+        self.max_age_s = max_age_s
+        self._puts = 0
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+        # Streamlit 세션(스레드) 간 공유 → 연결 1개 + lock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS drafts (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_pk INTEGER,
+                image_name TEXT NOT NULL,
+                adapter TEXT,
+                full_text TEXT NOT NULL,
+                layout BLOB,
+                draft TEXT NOT NULL,
+                parser_version INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_drafts_parser_version ON drafts(parser_version)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_drafts_created_at ON drafts(created_at)"
+        )
+        self._conn.commit()
+
+        # 이전 실행에서 쌓인 행도 시작 시 한 번 정리
+        if max_rows is not None or max_age_s is not None:
+            self.purge()
+
+    def put(self, ocr_result: dict, draft: dict, parser_version: int, user_pk=None) -> int:
+        """OCR 결과 + draft 1건 저장 → 행 id"""
+
+        layout = ocr_result.get("layout")
+        now = time.time()
+
+        with self._lock:
+            cursor = self._conn.execute(
+                """
+                INSERT INTO drafts (user_pk, image_name, adapter, full_text, layout, draft,
+                                    parser_version, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    user_pk,
+                    draft.get("image_path") or ocr_result.get("image_name") or "",
+                    ocr_result.get("adapter"),
+                    ocr_result["full_text"],
+                    layout.to_bytes() if layout is not None else None,
+                    json.dumps(derived_fields(draft), ensure_ascii=False, default=str),
+                    parser_version,
+                    now,
+                    now
+                )
+            )
+            self._conn.commit()
+
+            self._puts += 1
+            purge_due = self._puts % PURGE_EVERY == 0
+
+        if purge_due and (self.max_rows is not None or self.max_age_s is not None):
+            self.purge()
+
+        return cursor.lastrowid
+
+    def get(self, draft_id: int):
+        """저장된 draft (없으면 None) — parser_version / draft_id 포함"""
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT draft, parser_version FROM drafts WHERE id = ?", (draft_id,)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        draft = json.loads(row[0])
+        draft["draft_id"] = draft_id
+        draft["parser_version"] = row[1]
+
+        return draft
+
+    def fetch_stale(self, parser_version: int, after_id: int = 0, limit: int = 500) -> list:
+        """
+        parser_version과 다른 버전으로 만들어진 행 (id > after_id, id 순 최대 limit건)
+        반환: [(id, OCR 결과 dict), ...] — layout은 WordLayout (지연 변환)
+              기존 draft의 CARRY_KEYS 필드는 OCR 결과 dict의 "carry"에 담음
+        """
+
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT id, image_name, adapter, full_text, layout, draft FROM drafts
+                WHERE id > ? AND parser_version != ?
+                ORDER BY id LIMIT ?
+                """,
+                (after_id, parser_version, limit)
+            ).fetchall()
+
+        records = []
+
+        for draft_id, image_name, adapter, full_text, layout, draft in rows:
+            draft = json.loads(draft)
+
+            record = {
+                "adapter": adapter,
+                "image_name": image_name,
+                "full_text": full_text,
+                "carry": {k: draft[k] for k in CARRY_KEYS if k in draft}
+            }
+
+            if layout is not None:
+                record["layout"] = WordLayout.from_bytes(layout)
+
+            records.append((draft_id, record))
+
+        return records
+
+    def update_drafts(self, updates: list, parser_version: int):
+        """재파싱 결과 반영 (한 트랜잭션) — updates : [(id, draft dict), ...]"""
+
+        now = time.time()
+
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE drafts SET draft = ?, parser_version = ?, updated_at = ? WHERE id = ?",
+                [
+                    (json.dumps(derived_fields(draft), ensure_ascii=False, default=str),
+                     parser_version, now, draft_id)
+                    for draft_id, draft in updates
+                ]
+            )
+            self._conn.commit()
+
+    def stats(self, parser_version: int = None) -> dict:
+        """전체 행 수 / 버전별 행 수 (parser_version을 주면 stale 행 수 포함)"""
+
+        with self._lock:
+            versions = dict(self._conn.execute(
+                "SELECT parser_version, COUNT(*) FROM drafts GROUP BY parser_version"
+            ).fetchall())
+
+        stats = {"entries": sum(versions.values()), "versions": versions}
+
+        if parser_version is not None:
+            stats["stale"] = stats["entries"] - versions.get(parser_version, 0)
+
+        return stats
+
+    def purge(self, max_rows: int = None, max_age_s: float = None) -> int:
+        """
+        보관 한도를 넘는 오래된 행 삭제 → 삭제 수
+        인자를 생략하면 생성 시 지정한 한도 사용
+        """
+
+        max_rows = self.max_rows if max_rows is None else max_rows
+        max_age_s = self.max_age_s if max_age_s is None else max_age_s
+
+        deleted = 0
+
+        with self._lock:
+            if max_age_s is not None:
+                deleted += self._conn.execute(
+                    "DELETE FROM drafts WHERE created_at < ?", (time.time() - max_age_s,)
+                ).rowcount
+
+            if max_rows is not None:
+                # id가 큰 쪽(최근) max_rows건만 남김
+                deleted += self._conn.execute(
+                    """
+                    DELETE FROM drafts WHERE id <= (
+                        SELECT id FROM drafts ORDER BY id DESC LIMIT 1 OFFSET ?
+                    )
+                    """,
+                    (max_rows,)
+                ).rowcount
+
+            self._conn.commit()
+
+        return deleted
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# --------------------------------------------------
+# 프로세스 공용 저장소 (싱글톤)
+# --------------------------------------------------
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def get_default_draft_store():
+    """
+    환경변수 기반 공용 저장소 반환
+    - OCR_DRAFT_STORE_ENABLED      : "1"일 때만 저장 (기본 0 → None 반환)
+    - OCR_DRAFT_STORE_PATH         : SQLite 파일 경로
+    - OCR_DRAFT_STORE_MAX_ROWS     : 최대 보관 행 수 (0이면 제한 없음)
+    - OCR_DRAFT_STORE_MAX_AGE_DAYS : 최대 보관 일수 (0이면 제한 없음)
+    """
+
+    global _default_store
+
+    # [변경] 업로드마다 OCR 원문이 쌓이므로 명시적으로 켤 때만 사용
+    if os.getenv("OCR_DRAFT_STORE_ENABLED", "0") != "1":
+        return None
+
+    with _default_store_lock:
+        if _default_store is None:
+            max_rows = int(os.getenv("OCR_DRAFT_STORE_MAX_ROWS", DEFAULT_MAX_ROWS))
+            max_age_days = float(os.getenv("OCR_DRAFT_STORE_MAX_AGE_DAYS", DEFAULT_MAX_AGE_DAYS))
+
+            _default_store = DraftStore(
+                os.getenv("OCR_DRAFT_STORE_PATH", DEFAULT_STORE_PATH),
+                max_rows=max_rows or None,
+                max_age_s=max_age_days * 86400 or None,
+            )
+
+    return _default_store
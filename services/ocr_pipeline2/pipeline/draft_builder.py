@@ -8,6 +8,8 @@ def build_draft(image_path: str, parsed: dict) -> dict:
     - Downstream API / Backend
 
     Validation 층은 제거 v01.5
+
+    [변경] image_path : 파일 경로 또는 업로드 파일명 (run_pipeline_bytes 경로는 디스크 파일이 없음)
     """
 
     draft = {
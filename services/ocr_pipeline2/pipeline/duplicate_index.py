@@ -0,0 +1,185 @@
+"""
+유사 이미지(같은 영수증 재촬영) 감지 — OCR 전 단계
+
+- 업로드 이미지마다 dHash(지각 해시) 계산 (Pillow + NumPy)
+  → 구도 / 밝기 / 해상도가 조금 달라도 해시가 거의 같음 (바이트 해시 캐시가 놓치는 경우)
+- 사용자별로 최근 해시 + draft를 보관하고 두 단계로 비교
+  1) 64bit 해시 Hamming 거리 ≤ threshold        → 후보
+  2) 256bit 해시 Hamming 거리 ≤ verify_threshold → 같은 영수증으로 확정
+  (영수증은 흰 종이 + 글자 줄이라 64bit만으로는 같은 가게의 다른 영수증도 가까워질 수 있음
+   → 다른 영수증을 합쳐 버리는 것보다 중복을 놓치는 쪽이 안전하도록 보수적으로 판정)
+- 같은 영수증이면 OCR을 생략하고 이전 draft를 재사용 (duplicate_of 표시)
+  → Vision 호출 절약 + 같은 영수증이 create_receipt로 두 번 저장되는 것 방지
+
+설정 (환경변수):
+    OCR_DEDUP_ENABLED      : "0"이면 사용 안 함 (기본 1)
+    OCR_DEDUP_THRESHOLD    : 후보로 볼 최대 Hamming 거리 (기본 6 / 64bit)
+    OCR_DEDUP_VERIFY_THRESHOLD : 확정할 최대 Hamming 거리 (기본 40 / 256bit)
+    OCR_DEDUP_MAX_PER_USER : 사용자별 보관 개수 (기본 200, 오래된 것부터 제거)
+"""
+
+import copy
+import io
+import os
+import threading
+import time
+from collections import deque
+
+DEFAULT_THRESHOLD = 6
+DEFAULT_VERIFY_THRESHOLD = 40
+DEFAULT_MAX_PER_USER = 200
+HASH_SIZES = (8, 16)
+
+
+def _dhash_bits(img, hash_size: int) -> int:
+    """흑백 (hash_size+1) x hash_size로 축소 후 가로로 이웃한 픽셀 밝기 비교 → hash_size² bit 정수"""
+
+    import numpy as np
+    from PIL import Image
+
+    pixels = np.asarray(img.resize((hash_size + 1, hash_size), Image.BILINEAR), dtype=np.int16)
+    diff = pixels[:, 1:] > pixels[:, :-1]
+
+    return int.from_bytes(np.packbits(diff).tobytes(), "big")
+
+
+def dhash(content) -> tuple:
+    """
+    difference hash (64bit, 256bit) — 이미지는 한 번만 디코딩
+    """
+
+    from PIL import Image, ImageOps
+
+    with Image.open(io.BytesIO(content)) as img:
+        # JPEG는 디코딩 단계에서 축소해서 읽음 (원본 해상도 전체 디코딩 생략)
+        img.draft("L", (256, 256))
+        img = ImageOps.exif_transpose(img).convert("L")
+
+        return tuple(_dhash_bits(img, size) for size in HASH_SIZES)
+
+
+def hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+class NearDuplicateIndex:
+    """
+    사용자별 최근 해시 목록
+    사용자당 최대 수백 개 → 정수 XOR + popcount 선형 탐색으로 충분히 빠름 (수십 µs)
+    """
+
+    def __init__(
+        self,
+        threshold: int = DEFAULT_THRESHOLD,
+        verify_threshold: int = DEFAULT_VERIFY_THRESHOLD,
+        max_per_user: int = DEFAULT_MAX_PER_USER,
+    ):
+        self.threshold = threshold
+        self.verify_threshold = verify_threshold
+        self.max_per_user = max_per_user
+
+        self._entries = {}
+        self._lock = threading.Lock()
+
+        self.lookups = 0
+        self.matches = 0
+
+    def compare(self, a: tuple, b: tuple):
+        """같은 영수증이면 256bit 해시 거리, 아니면 None"""
+
+        if hamming(a[0], b[0]) > self.threshold:
+            return None
+
+        distance = hamming(a[1], b[1])
+
+        return distance if distance <= self.verify_threshold else None
+
+    def find(self, user_key, image_hash: tuple):
+        """
+        가장 가까운 이전 업로드 반환 (없으면 None)
+        반환: {"name", "distance"(256bit 기준), "draft", "added_at"}
+        """
+
+        with self._lock:
+            self.lookups += 1
+            best = None
+
+            for name, h, draft, added_at in self._entries.get(user_key, ()):
+                distance = self.compare(image_hash, h)
+
+                if distance is not None and (best is None or distance < best["distance"]):
+                    best = {"name": name, "distance": distance, "draft": draft, "added_at": added_at}
+
+            if best is not None:
+                self.matches += 1
+
+            return best
+
+    def add(self, user_key, image_hash: tuple, name: str, draft: dict):
+        with self._lock:
+            entries = self._entries.get(user_key)
+
+            if entries is None:
+                entries = self._entries[user_key] = deque(maxlen=self.max_per_user)
+
+            entries.append((name, image_hash, draft, time.time()))
+
+    def clear(self, user_key=None):
+        with self._lock:
+            if user_key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(user_key, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "users": len(self._entries),
+                "entries": sum(len(e) for e in self._entries.values()),
+                "lookups": self.lookups,
+                "matches": self.matches,
+                "threshold": self.threshold,
+                "verify_threshold": self.verify_threshold
+            }
+
+
+def reuse_draft(match: dict, name: str, events: list) -> dict:
+    """이전 draft 복사본에 중복 표시 (원본 draft는 건드리지 않음)"""
+
+    draft = copy.deepcopy(match["draft"])
+
+    draft["image_path"] = name
+    draft["duplicate_of"] = match["name"]
+    draft["duplicate_distance"] = match["distance"]
+    draft["events"] = events
+
+    # 이미 저장됐을 수 있는 영수증 → 자동 저장 대상에서 제외
+    draft["db_insert_ready"] = False
+
+    return draft
+
+
+# --------------------------------------------------
+# 프로세스 공용 인덱스 (싱글톤)
+# --------------------------------------------------
+_default_index = None
+_default_index_lock = threading.Lock()
+
+
+def get_default_index():
+    """환경변수 기반 공용 인덱스 (OCR_DEDUP_ENABLED=0이면 None)"""
+
+    global _default_index
+
+    if os.getenv("OCR_DEDUP_ENABLED", "1") == "0":
+        return None
+
+    with _default_index_lock:
+        if _default_index is None:
+            _default_index = NearDuplicateIndex(
+                threshold=int(os.getenv("OCR_DEDUP_THRESHOLD", DEFAULT_THRESHOLD)),
+                verify_threshold=int(os.getenv("OCR_DEDUP_VERIFY_THRESHOLD", DEFAULT_VERIFY_THRESHOLD)),
+                max_per_user=int(os.getenv("OCR_DEDUP_MAX_PER_USER", DEFAULT_MAX_PER_USER)),
+            )
+
+    return _default_index
@@ -0,0 +1,354 @@
+"""
+OCR 작업 큐 (SQLite, 외부 서비스 없이 동작)
+
+- 화면(Streamlit)은 업로드 바이트를 큐에 넣고(submit) 작업 id만 보관 → 결과는 poll / result로 조회
+- 별도 워커 프로세스(pipeline/ocr_worker.py)가 작업을 가져가(claim) run_pipeline_bytes 실행 후 결과 draft 기록
+- 모든 상태가 파일에 있으므로 Streamlit rerun / 앱 재시작 / 워커 재시작에도 작업이 유지됨
+- 새로고침으로 세션(작업 id 목록)이 사라져도 list_jobs(user_pk)로 같은 사용자의 최근 작업을 다시 연결
+- 워커는 실행 중 lease를 주기적으로 연장(renew) → 워커가 죽으면 lease 만료 후 다른 워커가 다시 가져감
+  (MAX_ATTEMPTS회까지, 이후 failed)
+- 결과 기록 / 연장은 작업을 점유한 워커만 가능 → lease를 잃은 워커의 늦은 결과가 새 점유자 결과를 덮지 않음
+- 보관 기간(retention_s)을 주면 PURGE_EVERY회 claim마다 끝난 지 오래된 작업 삭제
+
+상태 흐름:
+    queued → running → done / failed
+    queued / running → cancelled (실행 중 취소는 결과를 버림)
+
+설정 (환경변수):
+    OCR_JOB_QUEUE_ENABLED : "1"이면 업로드 화면이 큐를 사용 (기본 0 = 화면에서 바로 처리)
+    OCR_JOB_QUEUE_PATH    : SQLite 파일 경로
+    OCR_JOB_QUEUE_RETENTION_S : 끝난 작업 보관 기간 (초, 0이면 삭제하지 않음)
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+
+DEFAULT_QUEUE_PATH = "data/jobs/ocr_jobs.sqlite3"
+
+# 워커 1회 점유 시간 (이 시간 동안 연장이 없으면 워커가 죽은 것으로 보고 재시도)
+DEFAULT_LEASE_S = 300.0
+
+MAX_ATTEMPTS = 3
+
+# 새 세션에서 다시 연결할 최근 작업 범위 (초)
+DEFAULT_RESTORE_S = 24 * 3600
+
+# 끝난 작업 보관 기간 기본값 (get_default_queue / 워커) — 7일
+DEFAULT_RETENTION_S = 7 * 24 * 3600
+
+# claim 몇 번마다 보관 기간 적용 (빈 큐 확인 포함 → 작업이 없어도 주기적으로 정리)
+PURGE_EVERY = 200
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FINISHED = (DONE, FAILED, CANCELLED)
+
+
+class JobQueue:
+
+    def __init__(self, path: str = DEFAULT_QUEUE_PATH, retention_s: float = None):
+        """
+        retention_s : 끝난 작업 보관 기간 (초, None이면 삭제하지 않음)
+        """
+
+        self.path = path
+        self.retention_s = retention_s
+        self._claims = 0
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+        # 화면 / 워커 프로세스가 같은 파일 공유 → WAL + busy timeout
+        # isolation_level=None : 문장 단위 autocommit, claim만 명시적 트랜잭션
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS ocr_jobs (
+                id TEXT PRIMARY KEY,
+                user_pk INTEGER,
+                image_name TEXT NOT NULL,
+                content BLOB,
+                status TEXT NOT NULL,
+                result TEXT,
+                error TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                worker TEXT,
+                lease_until REAL,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_ocr_jobs_status ON ocr_jobs(status, created_at)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_ocr_jobs_user ON ocr_jobs(user_pk, created_at)"
+        )
+
+        # 이전 실행에서 쌓인 작업도 시작 시 한 번 정리
+        if retention_s is not None:
+            self.purge()
+
+    # --------------------------------------------------
+    # 화면 쪽 API
+    # --------------------------------------------------
+    def submit(self, content, name: str, user_pk=None) -> str:
+        """작업 등록 → 작업 id (content는 bytes 또는 memoryview)"""
+
+        job_id = uuid.uuid4().hex
+
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT INTO ocr_jobs (id, user_pk, image_name, content, status, created_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (job_id, user_pk, name, bytes(content), QUEUED, time.time())
+            )
+
+        return job_id
+
+    def poll(self, job_ids: list) -> dict:
+        """{작업 id: 상태} (없는 id는 제외)"""
+
+        job_ids = list(job_ids)
+
+        if not job_ids:
+            return {}
+
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT id, status FROM ocr_jobs WHERE id IN ({','.join('?' * len(job_ids))})",
+                job_ids
+            ).fetchall()
+
+        return dict(rows)
+
+    def list_jobs(self, user_pk, since: float = None) -> list:
+        """
+        사용자의 작업 목록 (새로고침 후 세션 복원용)
+        since : 이 시각(epoch 초) 이후 등록된 작업만
+        반환: [(작업 id, image_name, status), ...] — 등록 순 (같은 이름이면 뒤쪽이 최근 작업)
+        """
+
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT id, image_name, status FROM ocr_jobs
+                WHERE user_pk = ? AND created_at >= ?
+                ORDER BY created_at
+                """,
+                (user_pk, since or 0.0)
+            ).fetchall()
+
+        return rows
+
+    def result(self, job_id: str):
+        """
+        끝난 작업 결과 (아직 안 끝났거나 없으면 None)
+        done     → 파이프라인 draft
+        failed / cancelled → {"validation_status": "error", "error_msg": ...}
+        """
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status, result, error FROM ocr_jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+
+        if row is None or row[0] not in FINISHED:
+            return None
+
+        status, result, error = row
+
+        if status == DONE:
+            return json.loads(result)
+
+        return {
+            "validation_status": "error",
+            "error_msg": "작업이 취소되었습니다." if status == CANCELLED else error
+        }
+
+    def cancel(self, job_id: str) -> bool:
+        """대기 / 실행 중 작업 취소 (실행 중이면 워커가 끝낸 결과를 버림) → 취소됐으면 True"""
+
+        with self._lock:
+            cursor = self._conn.execute(
+                """
+                UPDATE ocr_jobs SET status = ?, content = NULL, finished_at = ?
+                WHERE id = ? AND status IN (?, ?)
+                """,
+                (CANCELLED, time.time(), job_id, QUEUED, RUNNING)
+            )
+
+        return cursor.rowcount > 0
+
+    # --------------------------------------------------
+    # 워커 쪽 API
+    # --------------------------------------------------
+    def claim(self, worker: str, lease_s: float = DEFAULT_LEASE_S):
+        """
+        가장 오래된 대기 작업(또는 lease가 만료된 실행 중 작업) 1건 점유
+        반환: (작업 id, content, image_name, user_pk) 또는 None
+        """
+
+        now = time.time()
+
+        with self._lock:
+            # 여러 워커 프로세스가 같은 작업을 가져가지 않도록 쓰기 lock을 먼저 잡음
+            self._conn.execute("BEGIN IMMEDIATE")
+
+            try:
+                # 재시도 한도를 넘긴 만료 작업은 실패 처리
+                self._conn.execute(
+                    """
+                    UPDATE ocr_jobs SET status = ?, error = ?, content = NULL, finished_at = ?
+                    WHERE status = ? AND lease_until < ? AND attempts >= ?
+                    """,
+                    (FAILED, "워커 응답 없음 (재시도 한도 초과)", now, RUNNING, now, MAX_ATTEMPTS)
+                )
+
+                row = self._conn.execute(
+                    """
+                    SELECT id, content, image_name, user_pk FROM ocr_jobs
+                    WHERE status = ? OR (status = ? AND lease_until < ?)
+                    ORDER BY created_at LIMIT 1
+                    """,
+                    (QUEUED, RUNNING, now)
+                ).fetchone()
+
+                if row is not None:
+                    self._conn.execute(
+                        """
+                        UPDATE ocr_jobs
+                        SET status = ?, worker = ?, lease_until = ?, attempts = attempts + 1,
+                            started_at = COALESCE(started_at, ?)
+                        WHERE id = ?
+                        """,
+                        (RUNNING, worker, now + lease_s, now, row[0])
+                    )
+
+                self._conn.execute("COMMIT")
+
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+            self._claims += 1
+            purge_due = self._claims % PURGE_EVERY == 0
+
+        if purge_due and self.retention_s is not None:
+            self.purge()
+
+        return row
+
+    def renew(self, job_id: str, worker: str, lease_s: float = DEFAULT_LEASE_S) -> bool:
+        """
+        실행 중 lease 연장 → 연장됐으면 True
+        False면 취소됐거나 lease 만료 후 다른 워커가 가져간 작업 (결과는 기록되지 않음)
+        """
+
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE ocr_jobs SET lease_until = ? WHERE id = ? AND status = ? AND worker = ?",
+                (time.time() + lease_s, job_id, RUNNING, worker)
+            )
+
+        return cursor.rowcount > 0
+
+    def complete(self, job_id: str, worker: str, draft: dict) -> bool:
+        """결과 기록 (그 사이 취소됐거나 다른 워커가 가져갔으면 버림) → 기록됐으면 True"""
+
+        result = json.dumps(draft, ensure_ascii=False, default=str)
+
+        return self._finish(job_id, worker, DONE, result=result)
+
+    def fail(self, job_id: str, worker: str, error: str) -> bool:
+        return self._finish(job_id, worker, FAILED, error=error)
+
+    def _finish(self, job_id: str, worker: str, status: str, result: str = None, error: str = None) -> bool:
+        # [변경] 점유한 워커만 기록 (lease 만료로 재실행된 작업을 이전 워커가 덮지 않도록)
+        with self._lock:
+            cursor = self._conn.execute(
+                """
+                UPDATE ocr_jobs SET status = ?, result = ?, error = ?, content = NULL, finished_at = ?
+                WHERE id = ? AND status = ? AND worker = ?
+                """,
+                (status, result, error, time.time(), job_id, RUNNING, worker)
+            )
+
+        return cursor.rowcount > 0
+
+    # --------------------------------------------------
+    # 운영
+    # --------------------------------------------------
+    def stats(self) -> dict:
+        """상태별 작업 수"""
+
+        with self._lock:
+            counts = dict(self._conn.execute(
+                "SELECT status, COUNT(*) FROM ocr_jobs GROUP BY status"
+            ).fetchall())
+
+        return {status: counts.get(status, 0) for status in (QUEUED, RUNNING, DONE, FAILED, CANCELLED)}
+
+    def purge(self, older_than_s: float = None) -> int:
+        """끝난 지 older_than_s초(기본: retention_s) 지난 작업 삭제 → 삭제 수"""
+
+        older_than_s = self.retention_s if older_than_s is None else older_than_s
+
+        if older_than_s is None:
+            return 0
+
+        with self._lock:
+            cursor = self._conn.execute(
+                f"DELETE FROM ocr_jobs WHERE status IN ({','.join('?' * len(FINISHED))}) AND finished_at < ?",
+                (*FINISHED, time.time() - older_than_s)
+            )
+
+        return cursor.rowcount
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# --------------------------------------------------
+# 프로세스 공용 큐 (싱글톤)
+# --------------------------------------------------
+_default_queue = None
+_default_queue_lock = threading.Lock()
+
+
+def retention_from_env():
+    """OCR_JOB_QUEUE_RETENTION_S → 보관 기간 (0이면 None = 삭제하지 않음)"""
+    return float(os.getenv("OCR_JOB_QUEUE_RETENTION_S", DEFAULT_RETENTION_S)) or None
+
+
+def get_default_queue():
+    """환경변수 기반 공용 큐 (OCR_JOB_QUEUE_ENABLED=1일 때만, 아니면 None)"""
+
+    global _default_queue
+
+    if os.getenv("OCR_JOB_QUEUE_ENABLED", "0") != "1":
+        return None
+
+    with _default_queue_lock:
+        if _default_queue is None:
+            _default_queue = JobQueue(
+                os.getenv("OCR_JOB_QUEUE_PATH", DEFAULT_QUEUE_PATH),
+                retention_s=retention_from_env(),
+            )
+
+    return _default_queue
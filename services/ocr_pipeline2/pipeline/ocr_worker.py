@@ -0,0 +1,132 @@
+"""
+OCR 작업 큐 워커 프로세스
+
+- 작업 큐(pipeline/job_queue.py)에서 작업을 1건씩 가져가 run_pipeline_bytes 실행 후 결과 기록
+- --concurrency개 스레드가 각자 claim → 실행 (OCR 대기는 I/O, Vision 동시 요청은 쿼터 스케줄러가 제한)
+- 큐가 비어 있으면 --poll-interval초 쉬었다가 다시 확인
+- 실행 중에는 lease의 1/3마다 lease 연장 (느린 OCR 재시도 중에도 다른 워커가 가져가지 않음)
+- 종료(Ctrl+C) 후 끝내지 못한 작업은 lease 만료 뒤 다음 워커가 다시 실행
+- 끝난 지 --retention초 지난 작업은 claim 주기에 맞춰 큐에서 삭제 (0이면 삭제하지 않음)
+
+사용 예시:
+    python -m services.ocr_pipeline2.pipeline.ocr_worker
+    python -m services.ocr_pipeline2.pipeline.ocr_worker --concurrency 8 --queue data/jobs/ocr_jobs.sqlite3
+"""
+
+import argparse
+import os
+import socket
+import sys
+import threading
+import time
+
+from services.ocr_pipeline2.pipeline.job_queue import JobQueue, DEFAULT_QUEUE_PATH, DEFAULT_LEASE_S, retention_from_env
+from services.ocr_pipeline2.pipeline.run_pipeline import run_pipeline_bytes
+
+
+def _heartbeat(queue: JobQueue, job_id: str, worker: str, lease_s: float, done: threading.Event):
+    """done이 set될 때까지 lease 연장 (연장 실패 = 취소 / 다른 워커가 가져감 → 중단)"""
+
+    while not done.wait(lease_s / 3):
+        try:
+            if not queue.renew(job_id, worker, lease_s):
+                return
+        except Exception as e:
+            # 큐 파일 잠금 등 일시 오류 → 다음 주기에 다시 연장
+            print(f"[WORKER] {worker} lease 연장 오류: {type(e).__name__}: {e}", file=sys.stderr)
+
+
+def process_one(queue: JobQueue, worker: str, lease_s: float = DEFAULT_LEASE_S) -> bool:
+    """작업 1건 처리 → 처리할 작업이 있었으면 True"""
+
+    job = queue.claim(worker, lease_s)
+
+    if job is None:
+        return False
+
+    job_id, content, name, user_pk = job
+
+    done = threading.Event()
+    heartbeat = threading.Thread(
+        target=_heartbeat, args=(queue, job_id, worker, lease_s, done),
+        name=f"ocr-worker-lease-{job_id[:8]}", daemon=True
+    )
+    heartbeat.start()
+
+    try:
+        draft = run_pipeline_bytes(content, name, verbose=False, user_pk=user_pk)
+    except Exception as e:
+        queue.fail(job_id, worker, f"{type(e).__name__}: {e}")
+        return True
+    finally:
+        done.set()
+        heartbeat.join()
+
+    queue.complete(job_id, worker, draft)
+    return True
+
+
+def run_worker(
+    queue: JobQueue,
+    concurrency: int = 4,
+    poll_interval: float = 0.5,
+    lease_s: float = DEFAULT_LEASE_S,
+    stop_event: threading.Event = None,
+):
+    """stop_event가 set될 때까지 작업 처리 (각 스레드는 진행 중인 작업을 끝낸 뒤 종료)"""
+
+    stop_event = stop_event or threading.Event()
+    prefix = f"{socket.gethostname()}:{os.getpid()}"
+
+    def loop(n):
+        worker = f"{prefix}:{n}"
+
+        while not stop_event.is_set():
+            try:
+                busy = process_one(queue, worker, lease_s)
+            except Exception as e:
+                # 큐 파일 잠금 등 일시 오류 → 잠시 후 재시도
+                print(f"[WORKER] {worker} 오류: {type(e).__name__}: {e}", file=sys.stderr)
+                busy = False
+
+            if not busy:
+                stop_event.wait(poll_interval)
+
+    threads = [
+        threading.Thread(target=loop, args=(n,), name=f"ocr-worker-{n}", daemon=True)
+        for n in range(concurrency)
+    ]
+
+    for thread in threads:
+        thread.start()
+
+    try:
+        while any(thread.is_alive() for thread in threads):
+            time.sleep(0.5)
+    except KeyboardInterrupt:
+        stop_event.set()
+        for thread in threads:
+            thread.join()
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="OCR 작업 큐 워커")
+    ap.add_argument("--queue", default=os.getenv("OCR_JOB_QUEUE_PATH", DEFAULT_QUEUE_PATH),
+                    help="작업 큐 SQLite 경로")
+    ap.add_argument("-c", "--concurrency", type=int, default=4, help="동시 처리 작업 수")
+    ap.add_argument("--poll-interval", type=float, default=0.5, help="큐가 비었을 때 재확인 간격 (초)")
+    ap.add_argument("--lease", type=float, default=DEFAULT_LEASE_S, help="작업 1건 점유 시간 (초)")
+    ap.add_argument("--retention", type=float, default=retention_from_env() or 0,
+                    help="끝난 작업 보관 기간 (초, 0이면 삭제하지 않음)")
+    args = ap.parse_args(argv)
+
+    # [변경] 워커가 claim하면서 끝난 작업을 주기적으로 정리
+    queue = JobQueue(args.queue, retention_s=args.retention or None)
+    print(f"[WORKER] 시작: {args.queue} / 동시 {args.concurrency}건 / 대기 {queue.stats()['queued']}건",
+          file=sys.stderr)
+
+    run_worker(queue, concurrency=args.concurrency, poll_interval=args.poll_interval, lease_s=args.lease)
+
+
+if __name__ == "__main__":
+    main()
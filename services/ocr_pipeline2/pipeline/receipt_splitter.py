@@ -0,0 +1,154 @@
+"""
+사진 1장에 찍힌 여러 영수증 분리 (OCR 1회 → draft 여러 개)
+
+- OCR layout(단어 box)으로 XY-cut
+  1) x축(세로 띠) → 2) y축(가로 띠) 순으로 단어 box 투영이 비는 큰 간격을 찾아 분할, 조각마다 재귀
+  간격 기준은 단어 높이 중앙값의 배수 (해상도와 무관)
+- 조각마다 가격이 있고 단어가 충분해야 영수증으로 인정
+  작은 조각(배경 글씨 등)은 이웃 영수증에 합침 → 영수증이 2개 미만이면 분리하지 않음
+- 영수증마다 행 복원(layout_rows)으로 full_text를 다시 만들고 layout도 해당 단어만 담아 전달
+  → 영수증별 parse_text 입력이 일반 OCR 결과와 같은 구조
+
+설정 (환경변수):
+    OCR_SPLIT_ENABLED : "0"이면 사용 안 함 (기본 1)
+"""
+
+import os
+
+from services.ocr_pipeline2.parsing.layout_rows import build_layout_rows
+from services.ocr_pipeline2.parsing.rules import PRICE_RE
+
+# 분할 간격 기준 (단어 높이 중앙값 배수)
+# 영수증 안의 빈 줄 / 단락 간격보다 충분히 크게 — y축은 영수증 안 공백이 길 수 있어 더 보수적
+X_GAP = 4.0
+Y_GAP = 8.0
+
+# 영수증 1장으로 인정할 최소 단어 수
+MIN_WORDS = 8
+
+MAX_DEPTH = 4
+
+
+def _looks_like_receipt(words, indices) -> bool:
+    return len(indices) >= MIN_WORDS and any(PRICE_RE.search(words[i]) for i in indices.tolist())
+
+
+def _merge_small(parts, words):
+    """영수증으로 보기 어려운 조각은 바로 앞(없으면 뒤) 영수증 조각에 합침"""
+
+    import numpy as np
+
+    groups = []
+    carry = []
+
+    for part in parts:
+        if _looks_like_receipt(words, part):
+            groups.append([*carry, part])
+            carry = []
+        elif groups:
+            groups[-1].append(part)
+        else:
+            carry.append(part)
+
+    if carry and groups:
+        groups[-1].extend(carry)
+
+    return [np.concatenate(g) for g in groups]
+
+
+def _cut(indices, boxes, words, unit, depth=0):
+    import numpy as np
+
+    if depth >= MAX_DEPTH or len(indices) < MIN_WORDS * 2:
+        return [indices]
+
+    for axis, gap in ((0, X_GAP), (1, Y_GAP)):
+        lo = boxes[indices, axis]
+        hi = boxes[indices, axis + 2]
+
+        order = np.argsort(lo, kind="stable")
+
+        # 앞 단어들이 덮는 최대 끝 좌표와 다음 단어 시작 사이 간격
+        reach = np.maximum.accumulate(hi[order])
+        gaps = lo[order][1:] - reach[:-1]
+
+        splits = np.flatnonzero(gaps > unit * gap) + 1
+
+        if len(splits) == 0:
+            continue
+
+        groups = _merge_small(np.split(indices[order], splits), words)
+
+        if len(groups) >= 2:
+            return [
+                region
+                for group in groups
+                for region in _cut(group, boxes, words, unit, depth + 1)
+            ]
+
+    return [indices]
+
+
+def find_receipt_regions(layout) -> list:
+    """
+    영수증 영역별 단어 index 배열 목록 (위 → 아래, 왼쪽 → 오른쪽 순)
+    영수증이 1개로 보이면 길이 1
+    """
+
+    import numpy as np
+
+    n = len(layout)
+
+    if n < MIN_WORDS * 2:
+        return [np.arange(n)]
+
+    boxes = layout.boxes
+    words = layout.words()
+    unit = max(1.0, float(np.median(boxes[:, 3] - boxes[:, 1])))
+
+    regions = _cut(np.arange(n), boxes, words, unit)
+
+    # 읽는 순서 : 영역 왼쪽 위 기준
+    regions.sort(key=lambda r: (int(boxes[r, 1].min()) // int(unit * Y_GAP), int(boxes[r, 0].min())))
+
+    return [np.sort(r) for r in regions]
+
+
+def split_receipts(ocr_result: dict) -> list:
+    """
+    OCR 결과 → 영수증별 OCR 결과 목록 (분리할 필요 없으면 [ocr_result])
+    영수증별 결과에는 "segment": {"index", "count", "bbox"} 추가
+    """
+
+    layout = ocr_result.get("layout")
+
+    if layout is None or os.getenv("OCR_SPLIT_ENABLED", "1") == "0":
+        return [ocr_result]
+
+    regions = find_receipt_regions(layout)
+
+    if len(regions) < 2:
+        return [ocr_result]
+
+    segments = []
+
+    for index, region in enumerate(regions):
+        sub_layout = layout.take(region)
+        boxes = sub_layout.boxes
+
+        segments.append({
+            "adapter": ocr_result["adapter"],
+            "image_name": ocr_result["image_name"],
+            "full_text": "\n".join(row.text for row in build_layout_rows(sub_layout)),
+            "layout": sub_layout,
+            "segment": {
+                "index": index,
+                "count": len(regions),
+                "bbox": [
+                    int(boxes[:, 0].min()), int(boxes[:, 1].min()),
+                    int(boxes[:, 2].max()), int(boxes[:, 3].max())
+                ]
+            }
+        })
+
+    return segments
@@ -0,0 +1,139 @@
+"""
+저장된 draft 재파싱 작업 (파서 버전 업그레이드용)
+
+- draft 저장소(persistence/draft_store.py)에서 현재 PARSER_VERSION과 버전이 다른 행만 batch 단위로 읽음
+- 저장된 OCR 원문(full_text + layout)으로 parse_text + validate_receipt 재실행 → Vision 호출 없음
+- batch마다 한 트랜잭션으로 반영 → 중단돼도 다음 실행이 남은 행부터 처리 (이미 반영된 행은 버전이 같아 제외)
+- 재파싱 중 예외가 난 행은 기존 draft / 버전 유지 (다음 실행에서 다시 시도)
+
+사용 예시:
+    python -m services.ocr_pipeline2.pipeline.rederive
+    python -m services.ocr_pipeline2.pipeline.rederive --store data/drafts/draft_store.sqlite3 --batch-size 1000 -w 4
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# [참고] reparse와 같이 파싱 계층만 사용 (Vision / dotenv 의존성 없음)
+from services.ocr_pipeline2.parsing.parser import PARSER_VERSION
+from services.ocr_pipeline2.persistence.draft_store import DraftStore, DEFAULT_STORE_PATH
+from services.ocr_pipeline2.pipeline.reparse import reparse_chunks, reparse_record
+
+
+def _rederive_chunk(rows: list) -> list:
+    """[(id, OCR 레코드), ...] → [(id, draft), ...] (워커 프로세스에서 실행)"""
+
+    results = []
+
+    for draft_id, record in rows:
+        draft = reparse_record(record)
+
+        # 영수증 분리 / 이어 붙이기 정보는 파싱으로 다시 만들 수 없으므로 기존 값 유지
+        if "error" not in draft:
+            draft.update(record.get("carry", {}))
+
+        results.append((draft_id, draft))
+
+    return results
+
+
+def _iter_stale(store: DraftStore, parser_version: int, batch_size: int, limit: int = None):
+    """stale 행을 id 순 keyset 페이지로 읽기 (이번 실행에서 실패한 행을 다시 읽지 않음)"""
+
+    after_id = 0
+    remaining = limit
+
+    while remaining is None or remaining > 0:
+        size = batch_size if remaining is None else min(batch_size, remaining)
+        rows = store.fetch_stale(parser_version, after_id=after_id, limit=size)
+
+        if not rows:
+            return
+
+        yield from rows
+
+        after_id = rows[-1][0]
+        if remaining is not None:
+            remaining -= len(rows)
+
+
+def run_rederive(
+    store: DraftStore,
+    parser_version: int = PARSER_VERSION,
+    batch_size: int = 500,
+    workers: int = 1,
+    limit: int = None,
+    progress: bool = True,
+) -> dict:
+    """
+    stale draft 재파싱
+    반환: {"processed", "updated", "failed", "remaining", "elapsed_s"}
+    """
+
+    counts = {"processed": 0, "updated": 0, "failed": 0}
+    started = time.perf_counter()
+
+    rows = _iter_stale(store, parser_version, batch_size, limit)
+
+    # 저장소 읽기 / 쓰기는 메인 프로세스, 파싱만 워커에 분산
+    for results in reparse_chunks(rows, workers, batch_size, process_chunk=_rederive_chunk):
+        updates = [(draft_id, draft) for draft_id, draft in results if "error" not in draft]
+
+        store.update_drafts(updates, parser_version)
+
+        counts["processed"] += len(results)
+        counts["updated"] += len(updates)
+        counts["failed"] += len(results) - len(updates)
+
+        if progress:
+            elapsed = time.perf_counter() - started
+            print(
+                f"[REDERIVE] {counts['processed']:,}건 처리 "
+                f"({counts['processed'] / elapsed:,.0f}건/s, 실패 {counts['failed']:,}건)",
+                file=sys.stderr
+            )
+            sys.stderr.flush()
+
+    counts["remaining"] = store.stats(parser_version)["stale"]
+    counts["elapsed_s"] = round(time.perf_counter() - started, 3)
+
+    if progress:
+        print(
+            f"[REDERIVE] 완료: v{parser_version} 반영 {counts['updated']:,}건 / "
+            f"{counts['elapsed_s']:.1f}s (남은 stale {counts['remaining']:,}건)",
+            file=sys.stderr
+        )
+
+    return counts
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="저장된 draft를 현재 파서 버전으로 재파싱")
+    ap.add_argument("--store", default=os.getenv("OCR_DRAFT_STORE_PATH", DEFAULT_STORE_PATH),
+                    help="draft 저장소 SQLite 경로")
+    ap.add_argument("--batch-size", type=int, default=500, help="한 트랜잭션으로 반영할 행 수")
+    ap.add_argument("-w", "--workers", type=int, default=1, help="프로세스 수 (기본 1)")
+    ap.add_argument("--limit", type=int, default=None, help="이번 실행에서 처리할 최대 행 수")
+    ap.add_argument("--dry-run", action="store_true", help="stale 행 수만 출력")
+    args = ap.parse_args(argv)
+
+    store = DraftStore(args.store)
+
+    if args.dry_run:
+        stats = store.stats(PARSER_VERSION)
+        print(f"[REDERIVE] 현재 v{PARSER_VERSION} / 전체 {stats['entries']:,}건 / stale {stats['stale']:,}건")
+        print(f"[REDERIVE] 버전별: {stats['versions']}")
+        return
+
+    run_rederive(
+        store,
+        batch_size=args.batch_size,
+        workers=args.workers,
+        limit=args.limit,
+    )
+
+
+if __name__ == "__main__":
+    main()
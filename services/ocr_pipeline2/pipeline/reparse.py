@@ -0,0 +1,254 @@
+"""
+OCR 텍스트 아카이브 일괄 재파싱 CLI
+
+- vision_results.json(JSON 배열, google_ocr.py 출력 형식) 또는 JSONL 입력을 스트리밍으로 읽음
+- parse_text + validate_receipt를 프로세스 풀에 chunk 단위로 분산
+- 결과 draft는 입력 순서 그대로 JSONL로 기록
+- 진행 카운터 출력 / --offset으로 중단 지점부터 재개
+
+사용 예시:
+    python -m services.ocr_pipeline2.pipeline.reparse vision_results.json -o drafts.jsonl
+    python -m services.ocr_pipeline2.pipeline.reparse vision_results.json -o drafts.jsonl --offset 120000
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+# [참고] run_pipeline은 Vision/dotenv 의존성을 import하므로 여기서는 파싱 계층만 사용
+from services.ocr_pipeline2.parsing.parser import PARSER_VERSION, parse_text
+from services.ocr_pipeline2.pipeline.draft_builder import build_draft
+from services.ocr_pipeline2.validation.validator import validate_receipt
+
+_WHITESPACE_RE = re.compile(r"[ \t\n\r]*")
+_READ_SIZE = 1 << 20  # 1MB
+
+
+# --------------------------------------------------
+# 입력 스트리밍
+# --------------------------------------------------
+def _iter_json_array(f):
+    """
+    거대한 JSON 배열을 전체 로드 없이 원소 단위로 읽기
+    (json.load는 100만 건 dump를 한 번에 메모리에 올림)
+    """
+
+    decoder = json.JSONDecoder()
+    buf = f.read(_READ_SIZE)
+    pos = _WHITESPACE_RE.match(buf).end()
+
+    if buf[pos:pos+1] != "[":
+        raise ValueError("JSON 배열 형식이 아닙니다.")
+    pos += 1
+
+    eof = False
+
+    while True:
+        pos = _WHITESPACE_RE.match(buf, pos).end()
+
+        # 버퍼 끝에 도달하면 다음 블록 읽기
+        if pos >= len(buf) and not eof:
+            chunk = f.read(_READ_SIZE)
+            eof = not chunk
+            buf, pos = buf[pos:] + chunk, 0
+            continue
+
+        head = buf[pos:pos+1]
+
+        if head == "]":
+            return
+
+        if head == ",":
+            pos += 1
+            continue
+
+        try:
+            obj, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            chunk = f.read(_READ_SIZE)
+            eof = not chunk
+            buf, pos = buf[pos:] + chunk, 0
+            continue
+
+        yield obj
+        pos = end
+
+
+def iter_ocr_records(path):
+    """
+    OCR 결과 레코드 스트리밍
+    - JSON 배열 ([{"image_name": ..., "full_text": ...}, ...])
+    - JSONL (한 줄에 레코드 하나)
+    """
+
+    with open(path, "r", encoding="utf-8") as f:
+        head = f.read(1)
+        while head and head.isspace():
+            head = f.read(1)
+        f.seek(0)
+
+        if head == "[":
+            yield from _iter_json_array(f)
+            return
+
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+# --------------------------------------------------
+# 레코드 처리 (워커 프로세스에서 실행)
+# --------------------------------------------------
+def reparse_record(record: dict) -> dict:
+    """OCR 레코드 1건 → draft (run_pipeline과 동일한 필드 구성, OCR 단계 제외)"""
+
+    image_path = record.get("image_name")
+
+    try:
+        parsed = parse_text(record)
+
+        validation = validate_receipt(parsed)
+        parsed.update(validation)
+
+        draft = build_draft(image_path, parsed)
+        draft["validation_status"] = validation["validation_status"]
+        draft["issues"] = validation["issues"]
+        draft["parser_version"] = PARSER_VERSION
+
+        return draft
+
+    except Exception as e:
+        return {
+            "image_path": image_path,
+            "validation_status": "error",
+            "error": f"{type(e).__name__}: {e}"
+        }
+
+
+def _reparse_chunk(records: list) -> list:
+    """chunk 단위 처리 후 JSON 문자열로 직렬화까지 워커에서 수행"""
+    return [
+        json.dumps(reparse_record(record), ensure_ascii=False)
+        for record in records
+    ]
+
+
+def _iter_chunks(records, chunk_size):
+    records = iter(records)
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def reparse_chunks(records, workers: int, chunk_size: int, process_chunk=_reparse_chunk):
+    """
+    chunk를 프로세스 풀에 분산하고 입력 순서대로 결과 chunk 반환
+    Executor.map은 입력 전체를 한 번에 submit하므로 in-flight 개수를 직접 제한
+    process_chunk : chunk → 결과 list (워커에서 실행, 모듈 최상위 함수여야 함)
+    """
+
+    chunks = _iter_chunks(records, chunk_size)
+
+    if workers <= 1:
+        for chunk in chunks:
+            yield process_chunk(chunk)
+        return
+
+    max_in_flight = workers * 2
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+
+        for chunk in chunks:
+            pending.append(executor.submit(process_chunk, chunk))
+
+            if len(pending) >= max_in_flight:
+                yield pending.popleft().result()
+
+        while pending:
+            yield pending.popleft().result()
+
+
+# --------------------------------------------------
+# CLI entry
+# --------------------------------------------------
+def run_reparse(
+    input_path: str,
+    output_path: str,
+    workers: int = None,
+    chunk_size: int = 500,
+    offset: int = 0,
+    progress_every: int = 10000,
+) -> int:
+    """
+    반환: 이번 실행에서 처리한 레코드 수
+    offset > 0이면 출력 파일에 이어쓰기 (재개)
+    """
+
+    workers = workers or os.cpu_count() or 1
+
+    records = islice(iter_ocr_records(input_path), offset, None)
+    mode = "a" if offset else "w"
+
+    done = 0
+    next_report = progress_every
+    started = time.perf_counter()
+
+    with open(output_path, mode, encoding="utf-8") as out:
+        for lines in reparse_chunks(records, workers, chunk_size):
+            out.write("\n".join(lines))
+            out.write("\n")
+            done += len(lines)
+
+            if progress_every and done >= next_report:
+                elapsed = time.perf_counter() - started
+                print(
+                    f"[REPARSE] {offset + done:,}건 처리 "
+                    f"({done / elapsed:,.0f}건/s)",
+                    file=sys.stderr
+                )
+                sys.stderr.flush()
+                next_report += progress_every
+
+    elapsed = time.perf_counter() - started
+    print(
+        f"[REPARSE] 완료: {done:,}건 / {elapsed:.1f}s "
+        f"(재개 offset: {offset + done})",
+        file=sys.stderr
+    )
+
+    return done
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="OCR 텍스트 아카이브 일괄 재파싱")
+    ap.add_argument("input", help="vision_results.json 형식 JSON 배열 또는 JSONL")
+    ap.add_argument("-o", "--output", required=True, help="draft JSONL 출력 경로")
+    ap.add_argument("-w", "--workers", type=int, default=None, help="프로세스 수 (기본: CPU 코어 수)")
+    ap.add_argument("--chunk-size", type=int, default=500, help="워커당 한 번에 처리할 레코드 수")
+    ap.add_argument("--offset", type=int, default=0, help="앞에서부터 건너뛸 레코드 수 (재개용, 출력은 이어쓰기)")
+    ap.add_argument("--progress-every", type=int, default=10000, help="진행 상황 출력 간격 (0이면 끔)")
+    args = ap.parse_args(argv)
+
+    run_reparse(
+        args.input,
+        args.output,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        offset=args.offset,
+        progress_every=args.progress_every,
+    )
+
+
+if __name__ == "__main__":
+    main()
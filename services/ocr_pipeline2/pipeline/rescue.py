@@ -0,0 +1,169 @@
+"""
+검증 실패 영수증 재OCR (adaptive rescue)
+
+- 정상 경로는 그대로 : validation_status가 error이거나 단어 confidence가 낮은 draft만 대상
+- 재OCR : 강한 전처리(EnhancedPreprocessor : crop / deskew / 대비 강화) + document_text_detection
+  → 다시 파싱 / 검증 후 더 나은 결과만 채택 (success > review_required > error, 같으면 issue 수)
+- 사용자별 시간당 재OCR 횟수 제한 (Vision 비용 상한)
+- 시도 / 구제(error → 통과) / 개선 / 실패 / 예산 초과 카운터 제공
+  → 공용 rescuer는 단계별 지표(/metrics, textfile)에 ocr_pipeline_rescue_total{outcome=...}으로 함께 내보냄
+
+설정 (환경변수):
+    OCR_RESCUE_ENABLED        : "0"이면 사용 안 함 (기본 1)
+    OCR_RESCUE_PER_USER_HOUR  : 사용자별 시간당 재OCR 최대 횟수 (기본 20)
+    OCR_RESCUE_MIN_CONFIDENCE : 단어 confidence 중앙값이 이보다 낮으면 대상 (기본 0.6)
+"""
+
+import os
+import threading
+import time
+from collections import deque
+
+from services.ocr_pipeline2.logging.metrics import get_default_metrics
+from services.ocr_pipeline2.ocr.preprocess import EnhancedPreprocessor
+
+DEFAULT_PER_USER_HOUR = 20
+DEFAULT_MIN_CONFIDENCE = 0.6
+
+METRIC_NAME = "ocr_pipeline_rescue_total"
+
+_STATUS_RANK = {"error": 0, "review_required": 1, "success": 2}
+
+
+def draft_score(draft: dict) -> tuple:
+    """draft 비교 기준 (클수록 좋음)"""
+    return (_STATUS_RANK.get(draft.get("validation_status"), 0), -len(draft.get("issues", ())))
+
+
+def median_confidence(ocr_result: dict):
+    """단어 confidence 중앙값 (layout / confidence가 없으면 None)"""
+
+    layout = ocr_result.get("layout")
+
+    if layout is None or len(layout) == 0:
+        return None
+
+    import numpy as np
+
+    confidence = layout.confidence
+    confidence = confidence[~np.isnan(confidence)]
+
+    return float(np.median(confidence)) if len(confidence) else None
+
+
+class RescueBudget:
+    """사용자별 sliding window 횟수 제한"""
+
+    def __init__(self, per_user: int, window_s: float = 3600.0):
+        self.per_user = per_user
+        self.window_s = window_s
+
+        self._used = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, user_key) -> bool:
+        now = time.monotonic()
+
+        with self._lock:
+            used = self._used.setdefault(user_key, deque())
+
+            while used and now - used[0] >= self.window_s:
+                used.popleft()
+
+            if len(used) >= self.per_user:
+                return False
+
+            used.append(now)
+            return True
+
+
+class OCRRescuer:
+
+    def __init__(
+        self,
+        per_user_hour: int = DEFAULT_PER_USER_HOUR,
+        min_confidence: float = DEFAULT_MIN_CONFIDENCE,
+        preprocessor=None,
+    ):
+        self.budget = RescueBudget(per_user_hour)
+        self.min_confidence = min_confidence
+        self.preprocessor = preprocessor or EnhancedPreprocessor()
+
+        self._lock = threading.Lock()
+        self.counts = {
+            "attempts": 0,         # 재OCR 실행
+            "rescued": 0,          # error → review_required / success
+            "improved": 0,         # 점수 상승 (rescued 포함)
+            "unchanged": 0,        # 기존 결과 유지
+            "failed": 0,           # 재OCR 호출 실패
+            "skipped_budget": 0,   # 사용자 예산 초과로 생략
+        }
+
+    def reason(self, draft: dict, ocr_result: dict):
+        """재OCR 대상이면 이유 문자열, 아니면 None"""
+
+        if draft.get("validation_status") == "error":
+            return "validation_error"
+
+        confidence = median_confidence(ocr_result)
+
+        if confidence is not None and confidence < self.min_confidence:
+            return "low_confidence"
+
+        return None
+
+    def acquire(self, user_key) -> bool:
+        if self.budget.acquire(user_key):
+            return True
+
+        self.record("skipped_budget")
+        return False
+
+    def record(self, outcome: str):
+        with self._lock:
+            self.counts[outcome] += 1
+
+    def counters(self) -> dict:
+        """누적 카운터 복사본 (Prometheus counter로 내보내는 값)"""
+        with self._lock:
+            return dict(self.counts)
+
+    def stats(self) -> dict:
+        counts = self.counters()
+
+        attempts = counts["attempts"]
+        counts["rescue_rate"] = counts["rescued"] / attempts if attempts else 0.0
+
+        return counts
+
+
+# --------------------------------------------------
+# 프로세스 공용 rescuer (싱글톤)
+# --------------------------------------------------
+_default_rescuer = None
+_default_rescuer_lock = threading.Lock()
+
+
+def get_default_rescuer():
+    """환경변수 기반 공용 rescuer (OCR_RESCUE_ENABLED=0이면 None)"""
+
+    global _default_rescuer
+
+    if os.getenv("OCR_RESCUE_ENABLED", "1") == "0":
+        return None
+
+    with _default_rescuer_lock:
+        if _default_rescuer is None:
+            _default_rescuer = OCRRescuer(
+                per_user_hour=int(os.getenv("OCR_RESCUE_PER_USER_HOUR", DEFAULT_PER_USER_HOUR)),
+                min_confidence=float(os.getenv("OCR_RESCUE_MIN_CONFIDENCE", DEFAULT_MIN_CONFIDENCE)),
+            )
+
+            # [변경] 재OCR 결과 카운터를 단계별 지표와 함께 내보냄
+            metrics = get_default_metrics()
+            if metrics is not None:
+                metrics.register_counters(
+                    METRIC_NAME, "OCR rescue outcomes.", "outcome", _default_rescuer.counters
+                )
+
+    return _default_rescuer
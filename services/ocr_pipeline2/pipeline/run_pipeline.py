@@ -1,85 +1,784 @@
 # [변경] import 경로를 ocr_pipeline2 기준으로 변경 (원본 ocr_pipeline 모듈과 분리)
 from services.ocr_pipeline2.logging.logger import PipelineLogger
-from services.ocr_pipeline2.ocr.google_vision_adapter import GoogleVisionAdapter
-from services.ocr_pipeline2.parsing.parser import parse_text
+from services.ocr_pipeline2.ocr.google_vision_adapter import GoogleVisionAdapter, MAX_BATCH_IMAGES
+from services.ocr_pipeline2.ocr.ocr_cache import CachedOCRAdapter, get_default_cache
+from services.ocr_pipeline2.ocr.preprocess import get_default_preprocessor
+from services.ocr_pipeline2.ocr.adapter_registry import get_adapter
+from services.ocr_pipeline2.ocr.base_adapter import OCRAdapter
+from services.ocr_pipeline2.ocr.quota_scheduler import ScheduledOCRAdapter, get_default_scheduler
+from services.ocr_pipeline2.parsing.parser import PARSER_VERSION, parse_text
 from services.ocr_pipeline2.pipeline.draft_builder import build_draft
+from services.ocr_pipeline2.pipeline.duplicate_index import dhash, reuse_draft, get_default_index
+from services.ocr_pipeline2.pipeline.rescue import draft_score, get_default_rescuer
+from services.ocr_pipeline2.pipeline.receipt_splitter import split_receipts
+from services.ocr_pipeline2.pipeline.stitcher import stitch_texts
 from services.ocr_pipeline2.validation.validator import validate_receipt
 from services.ocr_pipeline2.persistence.db_mapper import map_to_db_schema
+from services.ocr_pipeline2.persistence.draft_store import get_default_draft_store
 # [변경] create_receipt import 제거 - 프론트엔드에서 저장 버튼 클릭 시 직접 호출하도록 변경
 # from backend.api.receipts import create_receipt
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
+import copy
+import os
+import threading
 from dotenv import load_dotenv
 
 load_dotenv()
 
-def run_pipeline(image_path: str, verbose: bool = True) -> dict:
+def _default_adapter(user_pk=None):
+    # OCR (동일 이미지는 로컬 캐시에서 바로 반환 → Vision 호출 생략)
+    # Vision 어댑터는 레지스트리에서 프로세스 공용 인스턴스를 재사용
+    # OCR_ADAPTER=replay / record 이면 녹화 재생 / 녹화 어댑터 사용
+    # (부하 측정이 캐시에 가려지거나 녹화가 누락되지 않도록 캐시는 거치지 않음)
+    name = os.getenv("OCR_ADAPTER", GoogleVisionAdapter.name)
 
+    # 캐시 miss만 쿼터 스케줄러를 거쳐 Vision 호출 (사용자별 공정 대기열)
+    scheduler = get_default_scheduler() if name != "replay" else None
+
+    def factory():
+        adapter = get_adapter(name)
+        if scheduler is not None:
+            adapter = ScheduledOCRAdapter(adapter, scheduler, user_key=user_pk)
+        return adapter
+
+    # Vision 어댑터는 환경변수 전처리 설정을 사용 → 같은 설정으로 캐시 key 구분
+    return CachedOCRAdapter(
+        factory,
+        cache=get_default_cache() if name == GoogleVisionAdapter.name else None,
+        name=name,
+        preprocessor=get_default_preprocessor()
+    )
+
+
+def _log_ocr(logger: PipelineLogger, ocr_result: dict, meta: dict = None, duration_ms: float = None):
+    """
+    OCR 단계 이벤트 기록 (전처리가 적용됐으면 PREPROCESS 이벤트 먼저)
+    duration_ms : 전처리 포함 OCR 소요 시간 (생략하면 logger 직전 이벤트 이후 경과 시간)
+    """
+
+    if duration_ms is None:
+        duration_ms = logger.elapsed_ms()
+
+    preprocess = ocr_result.get("preprocess")
+
+    if preprocess is not None:
+        duration_ms = max(0.0, duration_ms - preprocess["duration_ms"])
+
+        logger.log_event(
+            "PREPROCESS",
+            "이미지 전처리 완료" if preprocess["applied"] else "이미지 전처리 생략",
+            {
+                "bytes_saved": preprocess["bytes_saved"],
+                "original_bytes": preprocess["original_bytes"],
+                "output_bytes": preprocess["output_bytes"],
+                "duration_ms": preprocess["duration_ms"],
+                "reason": preprocess["reason"]
+            },
+            duration_ms=preprocess["duration_ms"]
+        )
+
+    logger.log_event(
+        "OCR",
+        "텍스트 추출 완료",
+        {
+            "cache_hit": ocr_result.get("cache_hit", False),
+            # Vision 호출 시도 횟수 / 지연 / hedging 여부 (캐시 hit이면 없음)
+            **ocr_result.get("call", {}),
+            **_quota_meta(ocr_result),
+            **(meta or {})
+        },
+        duration_ms=duration_ms
+    )
+
+
+def _quota_meta(ocr_result: dict) -> dict:
+    quota = ocr_result.get("quota")
+
+    if quota is None:
+        return {}
+
+    return {"quota_wait_ms": quota["wait_ms"], "quota_queue_depth": quota["queue_depth"]}
+
+
+def _log_failure(logger: PipelineLogger, error: Exception):
+    """실패 이벤트 기록 (Vision 호출 정책 통계가 있으면 함께 기록)"""
+
+    stats = getattr(error, "call_stats", None)
+
+    if stats is not None:
+        logger.log_event("OCR", "Vision 호출 실패", stats)
+
+    logger.log_error("PIPELINE", error)
+
+
+def _finish_pipeline(image_path: str, ocr_result: dict, logger: PipelineLogger) -> dict:
+    """OCR 결과 → Parsing / Validation / Draft (단건·배치 공통)"""
+
+    # Parsing
+    parsed = parse_text(ocr_result)
+    logger.log_event("PARSING", "파싱 완료")
+
+    # Validation
+    validation = validate_receipt(parsed)
+    parsed.update(validation)
+
+    logger.log_event(
+        "VALIDATION",
+        validation["validation_status"],
+        {"issues": validation["issues"]}
+    )
+
+    # Draft 생성
+    draft = build_draft(image_path, parsed)
+    draft["events"] = logger.get_events()
+
+    draft["validation_status"] = validation["validation_status"]
+    draft["issues"] = validation["issues"]
+    draft["parser_version"] = PARSER_VERSION
+
+    # [변경] DB Insert를 파이프라인에서 자동 실행하지 않고, db_payload만 준비
+    # 프론트엔드에서 사용자가 "저장" 버튼을 클릭할 때 직접 DB에 저장함
+    if validation["validation_status"] == "success":
+        db_schema = map_to_db_schema(image_path, parsed)
+        draft["db_insert_ready"] = True
+        draft["db_payload"] = db_schema
+
+        # [변경] 아래 자동 DB 저장 로직 제거
+        # try:
+        #     db_result = create_receipt(
+        #         user_id=db_schema["user_id"],
+        #         category_id=db_schema["category_id"],
+        #         payment_method_id=db_schema["payment_method_id"],
+        #         date=db_schema["date"],
+        #         total_amount=db_schema["total_amount"],
+        #         store_name=db_schema["store_name"],
+        #         image_path=db_schema["image_path"],
+        #         details=db_schema["details"]
+        #     )
+        #
+        #     draft["db_inserted"] = True
+        #     draft["db_response"] = db_result
+        #
+        # except Exception as e:
+        #     draft["db_inserted"] = False
+        #     draft["db_error"] = str(e)
+
+    logger.log_event("DRAFT", "draft 생성 완료")
+
+    return draft
+
+
+def _archive(ocr_result: dict, draft: dict, logger: PipelineLogger, user_pk=None):
+    """
+    최종 draft를 OCR 원문과 함께 draft 저장소에 보관 (draft["draft_id"] 추가)
+    → 파서 버전이 바뀌면 rederive 작업이 Vision 재호출 없이 다시 파싱
+    저장 실패는 이벤트만 남기고 draft는 그대로 반환
+    """
+
+    store = get_default_draft_store()
+
+    if store is None:
+        return
+
+    try:
+        draft["draft_id"] = store.put(ocr_result, draft, PARSER_VERSION, user_pk=user_pk)
+    except Exception as e:
+        logger.log_event(
+            "ARCHIVE",
+            "draft 저장 실패",
+            {"error_type": type(e).__name__, "error_message": str(e)}
+        )
+
+
+# --------------------------------------------------
+# 검증 실패 영수증 재OCR (정상 경로는 호출 없음)
+# --------------------------------------------------
+def _rescue_adapter(user_pk=None):
+    """재OCR 어댑터 (캐시 없이 쿼터만 적용 / 문서 모드 미지원 엔진이면 None)"""
+
+    adapter = get_adapter(os.getenv("OCR_ADAPTER", GoogleVisionAdapter.name))
+
+    if type(adapter).run_bytes_document is OCRAdapter.run_bytes_document:
+        return None
+
+    scheduler = get_default_scheduler()
+
+    if scheduler is not None:
+        adapter = ScheduledOCRAdapter(adapter, scheduler, user_key=user_pk)
+
+    return adapter
+
+
+# _finish_pipeline이 남기는 단계 (재OCR 후보 draft는 이 단계 이벤트만 새로 만듦)
+_FINISH_STAGES = ("PARSING", "VALIDATION", "DRAFT")
+
+
+def _maybe_rescue(image_path: str, load_content, ocr_result: dict, draft: dict,
+                  logger: PipelineLogger, user_pk=None) -> tuple:
+    """
+    실패 / 저신뢰 draft만 강한 전처리 + document_text_detection으로 재OCR
+    다시 파싱한 결과가 더 나을 때만 교체
+    - 후보 draft는 별도 logger로 생성 (단계 지표는 기존 draft 것만 집계)
+    - 채택하면 기존 draft의 파싱 / 검증 / draft 이벤트를 후보 것으로 교체 → 최종 draft에는 한 벌만 남음
+    load_content : 원본 이미지 바이트를 반환하는 callable
+    반환: (draft, 그 draft를 만든 OCR 결과)
+    """
+
+    rescuer = get_default_rescuer()
+
+    if rescuer is None or load_content is None:
+        return draft, ocr_result
+
+    reason = rescuer.reason(draft, ocr_result)
+
+    if reason is None:
+        return draft, ocr_result
+
+    adapter = _rescue_adapter(user_pk)
+
+    if adapter is None:
+        return draft, ocr_result
+
+    if not rescuer.acquire(user_pk):
+        logger.log_event("RESCUE", "재OCR 생략 (사용자 예산 초과)", {"reason": reason})
+        return draft, ocr_result
+
+    rescuer.record("attempts")
+
+    try:
+        rescue_result = adapter.run_bytes_document(load_content(), image_path, rescuer.preprocessor)
+
+        logger.log_event(
+            "RESCUE",
+            "재OCR 완료",
+            {"reason": reason, **rescue_result.get("call", {}), **_quota_meta(rescue_result)}
+        )
+
+        # [변경] 같은 logger에 기록하면 파싱 이벤트가 두 벌 남고 단계 지표도 두 번 집계됨
+        # → OCR / 재OCR 이벤트만 물려받은 child logger에서 후보 생성
+        child = PipelineLogger(verbose=logger.verbose)
+        child.metrics = None
+        child.events = [e for e in logger.get_events() if e["stage"] not in _FINISH_STAGES]
+
+        candidate = _finish_pipeline(image_path, rescue_result, child)
+
+    except Exception as e:
+        rescuer.record("failed")
+        logger.log_event(
+            "RESCUE",
+            "재OCR 실패",
+            {
+                "reason": reason,
+                "error_type": type(e).__name__,
+                "error_message": str(e),
+                **(getattr(e, "call_stats", None) or {})
+            }
+        )
+        return draft, ocr_result
+
+    before = draft["validation_status"]
+    after = candidate["validation_status"]
+    adopted = draft_score(candidate) > draft_score(draft)
+
+    if adopted:
+        rescuer.record("improved")
+        if before == "error" and after != "error":
+            rescuer.record("rescued")
+
+        # 이후 이벤트(결과 기록 / 저장 실패 등)도 채택한 draft에 남도록 logger 이벤트 목록을 교체
+        logger.events[:] = child.get_events()
+        candidate["events"] = logger.get_events()
+    else:
+        rescuer.record("unchanged")
+
+    logger.log_event(
+        "RESCUE",
+        "재OCR 결과 채택" if adopted else "기존 결과 유지",
+        {"before": before, "after": after}
+    )
+
+    result, result_ocr = (candidate, rescue_result) if adopted else (draft, ocr_result)
+    result["rescue"] = {"reason": reason, "before": before, "after": after, "adopted": adopted}
+
+    return result, result_ocr
+
+
+# --------------------------------------------------
+# 사진 1장 여러 영수증 (OCR 1회 → draft 여러 개)
+# --------------------------------------------------
+_segment_executor = None
+_segment_executor_lock = threading.Lock()
+
+
+def _get_segment_executor():
+    global _segment_executor
+
+    with _segment_executor_lock:
+        if _segment_executor is None:
+            _segment_executor = ThreadPoolExecutor(
+                max_workers=min(4, os.cpu_count() or 1),
+                thread_name_prefix="ocr-segment"
+            )
+
+    return _segment_executor
+
+
+def _finish_segments(image_path: str, segments: list, logger: PipelineLogger, user_pk=None) -> dict:
+    """
+    영수증별 Parsing / Validation / Draft를 병렬 실행
+    반환: 첫 영수증 draft (나머지는 draft["segments"]에 순서대로)
+    """
+
+    logger.log_event(
+        "SEGMENT",
+        f"한 사진에서 영수증 {len(segments)}장 감지",
+        {"count": len(segments), "bboxes": [s["segment"]["bbox"] for s in segments]}
+    )
+
+    def finish(segment):
+        # OCR까지의 이벤트는 공유, 이후 단계 이벤트는 영수증별로 분리
+        child = PipelineLogger(verbose=logger.verbose)
+        child.events = list(logger.get_events())
+
+        draft = _finish_pipeline(image_path, segment, child)
+        draft["segment"] = segment["segment"]
+        _archive(segment, draft, child, user_pk)
+
+        return draft
+
+    drafts = list(_get_segment_executor().map(finish, segments))
+
+    first = drafts[0]
+    first["segments"] = drafts[1:]
+
+    return first
+
+
+def expand_segments(drafts: list) -> list:
+    """여러 영수증으로 분리된 draft를 펼친 목록 (분리되지 않은 draft는 그대로)"""
+    return [d for draft in drafts for d in (draft, *draft.get("segments", ()))]
+
+
+def _error_draft(image_path: str, logger: PipelineLogger) -> dict:
+    return {
+        "image_path": image_path,
+        "validation_status": "error",
+        "events": logger.get_events()
+    }
+
+
+def _run_single(image_path: str, ocr, verbose: bool, user_pk=None, load_content=None) -> dict:
+    """
+    ocr          : adapter → OCR 결과 (파일 경로 / 바이트 입력 공통 처리)
+    load_content : 재OCR용 원본 바이트 callable (None이면 재OCR 안 함)
+    """
+
+    logger = PipelineLogger(verbose=verbose)
+
+    try:
+        ocr_result = ocr(_default_adapter(user_pk))
+        _log_ocr(logger, ocr_result)
+
+        # [변경] 한 사진에 영수증이 여러 장이면 영수증별 draft (재OCR 대상 아님)
+        segments = split_receipts(ocr_result)
+        if len(segments) > 1:
+            return _finish_segments(image_path, segments, logger, user_pk)
+
+        draft = _finish_pipeline(image_path, ocr_result, logger)
+        draft, ocr_result = _maybe_rescue(image_path, load_content, ocr_result, draft, logger, user_pk)
+        _archive(ocr_result, draft, logger, user_pk)
+
+        return draft
+
+    except Exception as e:
+        _log_failure(logger, e)
+        return _error_draft(image_path, logger)
+
+
+def _run_batch(names: list, ocr_batch, verbose: bool, user_pk=None, load_contents=None) -> list:
+    """
+    ocr_batch     : adapter → 이미지별 OCR 결과 리스트
+    load_contents : 이미지별 재OCR용 원본 바이트 callable 리스트 (None이면 재OCR 안 함)
+    """
+
+    loggers = [PipelineLogger(verbose=verbose) for _ in names]
+
+    try:
+        ocr_results = ocr_batch(_default_adapter(user_pk))
+    except Exception as e:
+        # 어댑터 생성 실패 등 배치 전체 실패
+        for logger in loggers:
+            logger.log_error("PIPELINE", e)
+        return [_error_draft(name, logger) for name, logger in zip(names, loggers)]
+
+    # 배치 요청 1회 소요 시간 (이미지별 OCR 이벤트 duration_ms — 앞 이미지 파싱 시간은 제외)
+    ocr_ms = loggers[0].elapsed_ms() if loggers else 0.0
+
+    drafts = []
+    load_contents = load_contents or [None] * len(names)
+
+    for name, ocr_result, logger, load_content in zip(names, ocr_results, loggers, load_contents):
+        try:
+            if "error" in ocr_result:
+                if ocr_result.get("call"):
+                    logger.log_event("OCR", "Vision 호출 실패", ocr_result["call"])
+                raise RuntimeError(ocr_result["error"])
+
+            _log_ocr(logger, ocr_result, {"batch_size": len(names)}, duration_ms=ocr_ms)
+
+            segments = split_receipts(ocr_result)
+            if len(segments) > 1:
+                drafts.append(_finish_segments(name, segments, logger, user_pk))
+                continue
+
+            draft = _finish_pipeline(name, ocr_result, logger)
+            draft, ocr_result = _maybe_rescue(name, load_content, ocr_result, draft, logger, user_pk)
+            _archive(ocr_result, draft, logger, user_pk)
+            drafts.append(draft)
+
+        except Exception as e:
+            logger.log_error("PIPELINE", e)
+            drafts.append(_error_draft(name, logger))
+
+    return drafts
+
+
+# [변경] user_pk : 쿼터 스케줄러의 사용자별 대기열 key (없으면 익명 대기열 하나로 처리)
+def run_pipeline(image_path: str, verbose: bool = True, user_pk=None) -> dict:
+    return _run_single(
+        image_path,
+        lambda adapter: adapter.run(image_path),
+        verbose,
+        user_pk,
+        load_content=lambda: Path(image_path).read_bytes()
+    )
+
+
+def _image_hash(content):
+    try:
+        return dhash(content)
+    except Exception:
+        # 이미지가 아니거나 Pillow / NumPy가 없으면 중복 검사 생략
+        return None
+
+
+def _duplicate_draft(match: dict, name: str, verbose: bool) -> dict:
+    logger = PipelineLogger(verbose=verbose)
+    logger.log_event(
+        "DEDUP",
+        "같은 영수증 재업로드 — 이전 결과 재사용 (OCR 생략)",
+        {"duplicate_of": match["name"], "distance": match["distance"]}
+    )
+    return reuse_draft(match, name, logger.get_events())
+
+
+def _remember(index, user_pk, image_hash, name: str, draft: dict):
+    """성공한 draft만 인덱스에 등록 (프론트엔드가 draft를 수정해도 영향 없도록 복사본 보관)"""
+
+    if image_hash is not None and draft["validation_status"] != "error":
+        index.add(user_pk, image_hash, name, copy.deepcopy(draft))
+
+
+def run_pipeline_bytes(content, name: str, verbose: bool = True, user_pk=None) -> dict:
+    """
+    업로드 파일을 임시 파일 없이 바로 처리
+    content : bytes 또는 memoryview (UploadedFile.getbuffer())
+    name    : draft의 image_path로 사용할 이름 (업로드 파일명)
+
+    user_pk가 있으면 같은 사용자가 전에 올린 같은 영수증(유사 이미지)은 OCR 없이 이전 draft 재사용
+    """
+
+    index = get_default_index() if user_pk is not None else None
+
+    if index is None:
+        return _run_single(
+            name, lambda adapter: adapter.run_bytes(content, name), verbose, user_pk,
+            load_content=lambda: content
+        )
+
+    image_hash = _image_hash(content)
+
+    if image_hash is not None:
+        match = index.find(user_pk, image_hash)
+        if match is not None:
+            return _duplicate_draft(match, name, verbose)
+
+    draft = _run_single(
+        name, lambda adapter: adapter.run_bytes(content, name), verbose, user_pk,
+        load_content=lambda: content
+    )
+    _remember(index, user_pk, image_hash, name, draft)
+
+    return draft
+
+
+def run_pipeline_batch(image_paths: list, verbose: bool = True, user_pk=None) -> list:
+    """
+    여러 장을 한 번에 처리 (업로드 묶음용)
+    - OCR은 batch_annotate_images로 묶어서 요청 (이미지마다 왕복하지 않음)
+    - 파싱 이후 단계와 로그는 이미지별로 분리, 한 장 실패가 다른 장에 영향 없음
+    반환: image_paths와 같은 순서의 draft 리스트
+    """
+
+    image_paths = list(image_paths)
+    return _run_batch(
+        image_paths,
+        lambda adapter: adapter.run_batch(image_paths),
+        verbose,
+        user_pk,
+        load_contents=[lambda p=p: Path(p).read_bytes() for p in image_paths]
+    )
+
+
+def _resolve_duplicates(items: list, index, user_pk, verbose: bool, candidates=None):
+    """
+    OCR 전에 중복 사진 정리 (run_pipeline_batch_bytes / run_pipeline_many 공통)
+    - 같은 사용자가 전에 올린 영수증 → 이전 draft 재사용 (drafts[i]에 바로 채움)
+    - 같은 묶음 안의 중복 → 먼저 나온 사진 index에 연결 (aliases[i] = j, 그 사진 결과로 채움)
+    candidates : 검사할 index 목록 (기본 전체)
+    반환: (hashes, drafts, pending : OCR 대상 index, aliases)
+    """
+
+    candidates = range(len(items)) if candidates is None else candidates
+
+    hashes = [None] * len(items)
+    drafts = [None] * len(items)
+    pending = []
+    aliases = {}
+
+    if index is None:
+        return hashes, drafts, list(candidates), aliases
+
+    for i in candidates:
+        image_hash = hashes[i] = _image_hash(items[i][0])
+
+        if image_hash is not None:
+            match = index.find(user_pk, image_hash)
+
+            if match is not None:
+                drafts[i] = _duplicate_draft(match, items[i][1], verbose)
+                continue
+
+            same = next(
+                (j for j in pending
+                 if hashes[j] is not None and index.compare(image_hash, hashes[j]) is not None),
+                None
+            )
+
+            if same is not None:
+                aliases[i] = same
+                continue
+
+        pending.append(i)
+
+    return hashes, drafts, pending, aliases
+
+
+def _alias_draft(index, items: list, hashes: list, i: int, j: int, draft: dict, verbose: bool) -> dict:
+    """같은 묶음 안의 중복 사진 i → 먼저 나온 사진 j의 draft 재사용"""
+
+    match = {
+        "name": items[j][1],
+        "distance": index.compare(hashes[i], hashes[j]),
+        "draft": draft
+    }
+
+    return _duplicate_draft(match, items[i][1], verbose)
+
+
+def run_pipeline_batch_bytes(items: list, verbose: bool = True, user_pk=None) -> list:
+    """
+    run_pipeline_batch의 바이트 입력 버전
+    items : [(content, name), ...]
+    """
+
+    items = list(items)
+    index = get_default_index() if user_pk is not None else None
+
+    if index is None:
+        return _run_batch(
+            [name for _, name in items],
+            lambda adapter: adapter.run_batch_bytes(items),
+            verbose,
+            user_pk,
+            load_contents=[lambda c=content: c for content, _ in items]
+        )
+
+    # [변경] 중복 판정은 run_pipeline_many와 공유
+    hashes, drafts, pending, aliases = _resolve_duplicates(items, index, user_pk, verbose)
+
+    if pending:
+        for i, draft in zip(pending, _run_chunk(items, pending, verbose, user_pk)):
+            drafts[i] = draft
+            _remember(index, user_pk, hashes[i], items[i][1], draft)
+
+    for i, j in aliases.items():
+        drafts[i] = _alias_draft(index, items, hashes, i, j, drafts[j], verbose)
+
+    return drafts
+
+
+def _run_chunk(items: list, indices: list, verbose: bool, user_pk=None) -> list:
+    """items 중 indices만 배치 OCR 1회(어댑터가 MAX_BATCH_IMAGES장씩 나눔)로 처리"""
+
+    chunk = [items[i] for i in indices]
+
+    return _run_batch(
+        [name for _, name in chunk],
+        lambda adapter: adapter.run_batch_bytes(chunk),
+        verbose,
+        user_pk,
+        load_contents=[lambda c=content: c for content, _ in chunk]
+    )
+
+
+def run_pipeline_stitched(items: list, verbose: bool = True, user_pk=None) -> dict:
+    """
+    긴 영수증을 나눠 찍은 사진 묶음 → draft 1개
+    items : [(content, name), ...] 영수증 위 → 아래 순서
+    - OCR은 배치 요청 1회로 함께 처리
+    - 겹쳐 찍힌 줄은 한 번만 남기고 합친 텍스트로 파싱 1회
+    반환 draft의 image_path는 첫 사진 이름, stitched_from에 전체 사진 이름
+    """
+
+    items = list(items)
+    names = [name for _, name in items]
     logger = PipelineLogger(verbose=verbose)
 
     try:
-        # OCR
-        adapter = GoogleVisionAdapter()
-        ocr_result = adapter.run(image_path)
-        logger.log_event("OCR", "텍스트 추출 완료")
+        ocr_results = _default_adapter(user_pk).run_batch_bytes(items)
+        ocr_ms = logger.elapsed_ms()
+
+        for ocr_result in ocr_results:
+            if "error" in ocr_result:
+                if ocr_result.get("call"):
+                    logger.log_event("OCR", "Vision 호출 실패", ocr_result["call"])
+                raise RuntimeError(f"{ocr_result['image_name']}: {ocr_result['error']}")
 
-        # Parsing
-        parsed = parse_text(ocr_result)
-        logger.log_event("PARSING", "파싱 완료")
+            _log_ocr(logger, ocr_result, {"batch_size": len(items)}, duration_ms=ocr_ms)
 
-        # Validation
-        validation = validate_receipt(parsed)
-        parsed.update(validation)
+        full_text, overlaps = stitch_texts([r["full_text"] for r in ocr_results])
 
         logger.log_event(
-            "VALIDATION",
-            validation["validation_status"],
-            {"issues": validation["issues"]}
+            "STITCH",
+            f"사진 {len(items)}장 합치기 완료",
+            {"photos": len(items), "overlap_lines": overlaps, "lines": full_text.count("\n") + 1}
         )
 
-        # Draft 생성
-        draft = build_draft(image_path, parsed)
-        draft["events"] = logger.get_events()
-
-        draft["validation_status"] = validation["validation_status"]
-        draft["issues"] = validation["issues"]
-
-        # [변경] DB Insert를 파이프라인에서 자동 실행하지 않고, db_payload만 준비
-        # 프론트엔드에서 사용자가 "저장" 버튼을 클릭할 때 직접 DB에 저장함
-        if validation["validation_status"] == "success":
-            db_schema = map_to_db_schema(image_path, parsed)
-            draft["db_insert_ready"] = True
-            draft["db_payload"] = db_schema
-
-            # [변경] 아래 자동 DB 저장 로직 제거
-            # try:
-            #     db_result = create_receipt(
-            #         user_id=db_schema["user_id"],
-            #         category_id=db_schema["category_id"],
-            #         payment_method_id=db_schema["payment_method_id"],
-            #         date=db_schema["date"],
-            #         total_amount=db_schema["total_amount"],
-            #         store_name=db_schema["store_name"],
-            #         image_path=db_schema["image_path"],
-            #         details=db_schema["details"]
-            #     )
-            #
-            #     draft["db_inserted"] = True
-            #     draft["db_response"] = db_result
-            #
-            # except Exception as e:
-            #     draft["db_inserted"] = False
-            #     draft["db_error"] = str(e)
+        # 사진마다 좌표계가 달라 layout은 합치지 않음 → 줄 기반 파싱
+        ocr_result = {
+            "adapter": ocr_results[0]["adapter"] if ocr_results else None,
+            "image_name": names[0],
+            "full_text": full_text
+        }
+
+        draft = _finish_pipeline(names[0], ocr_result, logger)
+        draft["stitched_from"] = names
+        _archive(ocr_result, draft, logger, user_pk)
 
         return draft
 
     except Exception as e:
-        logger.log_error("PIPELINE", e)
-        return {
-            "image_path": image_path,
-            "validation_status": "error",
-            "events": logger.get_events()
+        _log_failure(logger, e)
+        return _error_draft(names[0] if names else "", logger)
+
+
+# 동시에 보내는 배치 요청 수 기본값 (Vision 동시 요청 수는 쿼터 스케줄러가 따로 제한)
+DEFAULT_MANY_WORKERS = 4
+
+
+def run_pipeline_many(inputs: list, max_workers: int = None, verbose: bool = True, user_pk=None):
+    """
+    여러 장을 배치 요청 여러 개로 나눠 동시에 처리하고 끝나는 순서대로 결과 반환 (generator)
+    inputs      : 파일 경로 또는 (content, name) 튜플 리스트 (섞어도 됨)
+    max_workers : 동시 배치 요청 수 (기본 DEFAULT_MANY_WORKERS)
+    yield       : (inputs 내 index, draft) — index로 입력(파일명)과 대응
+
+    - 스레드 시작 전에 중복 사진 정리 (run_pipeline_batch_bytes와 같은 규칙)
+      → 같은 묶음 안의 중복은 OCR 1회, 이전 업로드와 같은 사진은 OCR 없이 바로 반환
+    - 남은 사진은 max_workers개 chunk(chunk당 최대 MAX_BATCH_IMAGES장)로 나눠 chunk마다 배치 OCR 1회
+      → Vision 호출 수는 chunk 수, 전체 소요 시간 ≈ 가장 느린 chunk
+    - 한 장 / 한 chunk가 실패해도 해당 index만 error draft, 나머지는 계속 진행
+    - 호출 측이 중간에 그만 읽으면(generator close) 아직 시작 안 한 chunk는 취소, 기다리지 않음
+    """
+
+    inputs = list(inputs)
+    items = []
+    readable = []
+    failed = {}
+
+    for idx, item in enumerate(inputs):
+        if isinstance(item, (str, Path)):
+            try:
+                items.append((Path(item).read_bytes(), str(item)))
+                readable.append(idx)
+            except OSError as e:
+                items.append((b"", str(item)))
+                logger = PipelineLogger(verbose=verbose)
+                logger.log_error("PIPELINE", e)
+                failed[idx] = _error_draft(str(item), logger)
+        else:
+            content, name = item
+            items.append((content, name))
+            readable.append(idx)
+
+    index = get_default_index() if user_pk is not None else None
+    hashes, drafts, pending, aliases = _resolve_duplicates(items, index, user_pk, verbose, readable)
+
+    # 이미 결과가 정해진 사진 (읽기 실패 / 이전 업로드 중복) 먼저
+    for idx, draft in failed.items():
+        yield idx, draft
+
+    for idx, draft in enumerate(drafts):
+        if draft is not None:
+            yield idx, draft
+
+    if not pending:
+        return
+
+    workers = max(1, min(max_workers or DEFAULT_MANY_WORKERS, len(pending)))
+    size = min(MAX_BATCH_IMAGES, -(-len(pending) // workers))
+    chunks = [pending[k:k + size] for k in range(0, len(pending), size)]
+
+    followers = {}
+    for i, j in aliases.items():
+        followers.setdefault(j, []).append(i)
+
+    executor = ThreadPoolExecutor(max_workers=min(workers, len(chunks)), thread_name_prefix="ocr-many")
+
+    try:
+        futures = {
+            executor.submit(_run_chunk, items, chunk, verbose, user_pk): chunk
+            for chunk in chunks
         }
 
+        for future in as_completed(futures):
+            chunk = futures[future]
+
+            try:
+                chunk_drafts = future.result()
+            except Exception as e:
+                # _run_batch는 단계 예외를 error draft로 돌려주지만, 예상 못한 실패 대비
+                chunk_drafts = []
+                for i in chunk:
+                    logger = PipelineLogger(verbose=verbose)
+                    logger.log_error("PIPELINE", e)
+                    chunk_drafts.append(_error_draft(items[i][1], logger))
+
+            for i, draft in zip(chunk, chunk_drafts):
+                if index is not None:
+                    _remember(index, user_pk, hashes[i], items[i][1], draft)
+
+                yield i, draft
+
+                for follower in followers.get(i, ()):
+                    yield follower, _alias_draft(index, items, hashes, follower, i, draft, verbose)
+
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
 if __name__ == "__main__":
     image_path = Path("data/receipts/v01_eval/r1.jpg")
     result = run_pipeline(str(image_path), verbose=True)
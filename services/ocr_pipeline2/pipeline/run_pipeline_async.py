@@ -0,0 +1,184 @@
+"""
+비동기 OCR 파이프라인 (asyncio)
+
+- OCR : AsyncGoogleVisionAdapter로 Vision 응답 대기를 이벤트 루프에서 겹침
+        동시 OCR 요청 수는 semaphore로 제한 (OCR_ASYNC_CONCURRENCY, 기본 8)
+- Parsing / Validation / Draft : CPU 작업이므로 executor에서 실행 → 이벤트 루프를 막지 않음
+- 결과 draft 구조 / 로그 이벤트는 동기 run_pipeline과 동일 (_finish_pipeline 공유)
+- 동기 run_pipeline과 달리 재OCR(rescue) / 여러 영수증 분리 / 유사 이미지 중복 감지는 하지 않음
+  (캐시 → 쿼터 대기 → OCR → 파싱 / 검증 → draft 저장소 기록만 수행)
+
+사용 예시:
+    drafts = asyncio.run(run_pipeline_many_async(image_paths, concurrency=16))
+"""
+
+import asyncio
+import os
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from services.ocr_pipeline2.logging.logger import PipelineLogger
+from services.ocr_pipeline2.ocr.async_google_vision_adapter import AsyncGoogleVisionAdapter
+from services.ocr_pipeline2.ocr.ocr_cache import OCRCache, get_default_cache
+from services.ocr_pipeline2.ocr.preprocess import get_default_preprocessor
+from services.ocr_pipeline2.ocr.quota_scheduler import get_default_scheduler
+from services.ocr_pipeline2.pipeline.run_pipeline import _finish_pipeline, _archive, _error_draft, _log_ocr
+
+DEFAULT_CONCURRENCY = 8
+
+
+# --------------------------------------------------
+# 이벤트 루프별 상태 (async 클라이언트 / semaphore는 루프에 묶임)
+# --------------------------------------------------
+_loop_states = weakref.WeakKeyDictionary()
+
+
+class _LoopState:
+
+    def __init__(self, concurrency: int):
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.adapter = None
+
+    def get_adapter(self):
+        # 루프 스레드 안에서만 호출되므로 별도 lock 불필요
+        if self.adapter is None:
+            self.adapter = AsyncGoogleVisionAdapter()
+        return self.adapter
+
+
+def _loop_state() -> _LoopState:
+    loop = asyncio.get_running_loop()
+    state = _loop_states.get(loop)
+
+    if state is None:
+        concurrency = int(os.getenv("OCR_ASYNC_CONCURRENCY", DEFAULT_CONCURRENCY))
+        state = _loop_states[loop] = _LoopState(concurrency)
+
+    return state
+
+
+# --------------------------------------------------
+# 파싱용 executor (프로세스 공용)
+# --------------------------------------------------
+_parse_executor = None
+_parse_executor_lock = threading.Lock()
+
+
+def _get_parse_executor():
+    global _parse_executor
+
+    with _parse_executor_lock:
+        if _parse_executor is None:
+            _parse_executor = ThreadPoolExecutor(
+                max_workers=min(4, os.cpu_count() or 1),
+                thread_name_prefix="ocr-parse"
+            )
+
+    return _parse_executor
+
+
+# --------------------------------------------------
+# OCR (캐시 → Vision)
+# --------------------------------------------------
+async def _run_ocr(image_path: str, get_adapter, cache: OCRCache, user_pk=None) -> dict:
+
+    name = AsyncGoogleVisionAdapter.name
+    content = await asyncio.to_thread(Path(image_path).read_bytes)
+
+    if cache is not None:
+        # 어댑터와 같은 환경변수 전처리 설정으로 key 구분 (동기 경로와 캐시 공유)
+        key = OCRCache.make_key(content, name, get_default_preprocessor())
+        cached = await asyncio.to_thread(cache.get, key)
+
+        if cached is not None:
+            full_text, layout = cached
+            result = {
+                "adapter": name,
+                "image_name": image_path,
+                "full_text": full_text,
+                "cache_hit": True
+            }
+
+            if layout is not None:
+                result["layout"] = layout
+
+            return result
+
+    # 쿼터 대기는 블로킹 → 스레드에서 대기 (이벤트 루프는 다른 업로드 계속 처리)
+    scheduler = get_default_scheduler()
+    quota = await asyncio.to_thread(scheduler.acquire, user_pk) if scheduler is not None else None
+
+    result = await get_adapter().run_bytes(content, image_path)
+
+    if quota is not None:
+        result["quota"] = quota
+
+    if cache is not None:
+        await asyncio.to_thread(cache.put, key, name, result["full_text"], result.get("layout"))
+        result["cache_hit"] = False
+
+    return result
+
+
+def _finish_and_archive(image_path: str, ocr_result: dict, logger: PipelineLogger, user_pk=None) -> dict:
+    """파싱 ~ draft 저장소 기록 (SQLite 쓰기도 이벤트 루프 밖에서 실행)"""
+
+    draft = _finish_pipeline(image_path, ocr_result, logger)
+    _archive(ocr_result, draft, logger, user_pk)
+
+    return draft
+
+
+async def run_pipeline_async(
+    image_path: str,
+    verbose: bool = True,
+    semaphore: asyncio.Semaphore = None,
+    executor=None,
+    user_pk=None,
+) -> dict:
+    """
+    run_pipeline의 비동기 버전
+    semaphore : 동시 OCR 요청 제한 (기본: 루프 공용 semaphore)
+    executor  : 파싱 실행용 executor (기본: 프로세스 공용 스레드 풀)
+    user_pk   : 쿼터 스케줄러 사용자별 대기열 key
+    """
+
+    logger = PipelineLogger(verbose=verbose)
+    state = _loop_state()
+
+    try:
+        async with semaphore or state.semaphore:
+            ocr_result = await _run_ocr(image_path, state.get_adapter, get_default_cache(), user_pk)
+
+        _log_ocr(logger, ocr_result)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            executor or _get_parse_executor(),
+            _finish_and_archive, image_path, ocr_result, logger, user_pk
+        )
+
+    except Exception as e:
+        logger.log_error("PIPELINE", e)
+        return _error_draft(image_path, logger)
+
+
+async def run_pipeline_many_async(
+    image_paths: list,
+    verbose: bool = True,
+    concurrency: int = None,
+    user_pk=None,
+) -> list:
+    """
+    여러 장을 동시에 처리 (입력 순서대로 draft 반환)
+    concurrency를 지정하면 이 호출 전용 semaphore 사용
+    """
+
+    semaphore = asyncio.Semaphore(concurrency) if concurrency else None
+
+    return list(await asyncio.gather(*(
+        run_pipeline_async(image_path, verbose=verbose, semaphore=semaphore, user_pk=user_pk)
+        for image_path in image_paths
+    )))
@@ -0,0 +1,141 @@
+"""
+긴 영수증 여러 장 이어 붙이기 (사진 순서 = 영수증 위 → 아래)
+
+- 연속한 두 사진의 OCR 텍스트에서 겹쳐 찍힌 줄 구간을 찾아 한 번만 남김
+- 줄 비교는 정규화 텍스트(대문자 + 한글/영문/숫자만) 기준 → 공백 / 기호 OCR 차이 무시
+  정규화하면 빈 줄이 되는 구분선("-----", "=====" 등)은 겹침 비교에서 빼고 내용 줄만 비교
+  (구분선끼리는 모두 같은 줄로 보여 엉뚱한 겹침을 만듦)
+- 겹침 = 앞 사진 끝부분(suffix)과 뒤 사진 앞부분(prefix)이 같은 가장 긴 줄 구간
+  사진 가장자리에서 잘린 줄을 고려해 앞 사진 끝 / 뒤 사진 처음에서 최대 EDGE_LINES줄까지 건너뛰고 비교
+- 줄마다 정수 hash → 접두 rolling hash 배열을 1회 계산하면 구간 비교가 O(1)
+  → 겹침 길이 후보 전체를 훑어도 줄 수에 선형 (hash가 같으면 실제 줄 비교로 확인)
+"""
+
+from services.ocr_pipeline2.parsing.rules import normalize_text
+
+# 겹침으로 인정할 최소 줄 수 (1줄은 "합계" 같은 반복 문구와 우연히 같을 수 있음)
+MIN_OVERLAP_LINES = 2
+
+# 사진 가장자리에서 잘려 OCR이 다르게 읽었을 수 있는 줄 수
+EDGE_LINES = 2
+
+_MOD = (1 << 61) - 1
+_BASE = 1_000_003
+
+
+def _split_lines(text: str) -> list:
+    return [l.strip() for l in text.split("\n") if l.strip()]
+
+
+def _content_keys(lines: list):
+    """
+    내용 줄(정규화 결과가 빈 문자열이 아닌 줄)의 key 목록과 줄 위치
+    반환: (keys, positions) — keys[k]는 lines[positions[k]]의 key
+    """
+
+    keys = []
+    positions = []
+
+    for pos, line in enumerate(lines):
+        normalized = normalize_text(line)
+
+        if normalized:
+            keys.append(hash(normalized) % _MOD)
+            positions.append(pos)
+
+    return keys, positions
+
+
+class _PrefixHash:
+    """keys[l:r] 구간 hash를 O(1)로 계산"""
+
+    def __init__(self, keys: list):
+        self.keys = keys
+        self.prefix = [0]
+        self.power = [1]
+
+        for k in keys:
+            self.prefix.append((self.prefix[-1] * _BASE + k) % _MOD)
+            self.power.append(self.power[-1] * _BASE % _MOD)
+
+    def range(self, start: int, end: int) -> int:
+        return (self.prefix[end] - self.prefix[start] * self.power[end - start]) % _MOD
+
+
+def find_overlap(prev_keys: list, next_keys: list):
+    """
+    앞 사진 끝 ↔ 뒤 사진 처음 겹침
+    반환: (prev 겹침 끝 index, next 겹침 시작 index, 길이) 또는 None
+          prev[end - 길이:end] == next[start:start + 길이]
+    """
+
+    prev_hash = _PrefixHash(prev_keys)
+    next_hash = _PrefixHash(next_keys)
+
+    best = None
+
+    for skip_prev in range(EDGE_LINES + 1):
+        end = len(prev_keys) - skip_prev
+
+        for skip_next in range(EDGE_LINES + 1):
+            longest = min(end, len(next_keys) - skip_next)
+
+            # 긴 겹침부터 확인 → 처음 맞는 길이가 이 조합의 최대
+            for length in range(longest, MIN_OVERLAP_LINES - 1, -1):
+                if best is not None and length <= best[2]:
+                    break
+
+                if prev_hash.range(end - length, end) != next_hash.range(skip_next, skip_next + length):
+                    continue
+
+                if prev_keys[end - length:end] == next_keys[skip_next:skip_next + length]:
+                    best = (end, skip_next, length)
+                    break
+
+    return best
+
+
+def stitch_texts(texts: list):
+    """
+    여러 장의 OCR 텍스트 → 하나의 텍스트
+    반환: (합친 텍스트, 사진 경계별 겹친 줄 수 목록 — 겹침을 못 찾으면 0)
+    겹친 줄 수는 내용 줄 기준 (구분선 제외)
+    """
+
+    merged = []
+    merged_keys = []
+    merged_positions = []
+    overlaps = []
+
+    for idx, text in enumerate(texts):
+        lines = _split_lines(text)
+        keys, positions = _content_keys(lines)
+
+        if idx == 0:
+            merged, merged_keys, merged_positions = lines, keys, positions
+            continue
+
+        overlap = find_overlap(merged_keys, keys)
+
+        if overlap is None:
+            # 겹침 없이 찍은 경우 → 그대로 이어 붙임
+            overlaps.append(0)
+            cut, end, start = len(merged), len(merged_keys), 0
+            resume = 0
+        else:
+            end, start, length = overlap
+            overlaps.append(length)
+
+            # 앞 사진은 겹침 마지막 내용 줄까지, 뒤 사진은 겹침 마지막 내용 줄 다음 줄부터
+            # (가장자리 잘린 줄 제거, 겹침 안의 구분선은 앞 사진 것을 유지)
+            cut = merged_positions[end - 1] + 1
+            start += length
+            resume = positions[start - 1] + 1
+
+        merged_positions = merged_positions[:end] + [
+            cut + pos - resume for pos in positions[start:]
+        ]
+        merged_keys = merged_keys[:end] + keys[start:]
+        merged = merged[:cut] + lines[resume:]
+
+    return "\n".join(merged), overlaps
@@ -0,0 +1,166 @@
+# =============================================================================
+# test_call_policy.py - Vision 호출 정책 테스트
+# =============================================================================
+# 설명: CallPolicy가
+#       - 일시적 오류만 재시도하고 쿼터 초과(TooManyRequests)는 바로 실패하는지
+#       - 연속 실패 시 breaker가 열리고, reset 뒤 시험 호출 1건(half-open)으로 복구되는지
+#       - 느린 요청에 hedging 요청을 보내고 먼저 온 응답을 쓰는지
+#       Vision 대신 가짜 RPC 함수 사용 (네트워크 / 인증 불필요)
+#       프로젝트 루트에서 실행: python -m tests.test_call_policy
+# =============================================================================
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.ocr_pipeline2.ocr.call_policy import CallPolicy, CircuitBreaker, CircuitOpenError
+
+
+# google.api_core.exceptions와 같은 클래스 이름 (is_retryable은 이름으로 판별)
+class ServiceUnavailable(Exception):
+    pass
+
+
+class TooManyRequests(Exception):
+    pass
+
+
+class FakeRPC:
+    """정해진 순서대로 예외 / 응답을 돌려주는 RPC"""
+
+    def __init__(self, outcomes, delays=None):
+        self.outcomes = list(outcomes)
+        self.delays = list(delays or [])
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, timeout):
+        with self.lock:
+            n = self.calls
+            self.calls += 1
+
+        if n < len(self.delays):
+            time.sleep(self.delays[n])
+
+        outcome = self.outcomes[min(n, len(self.outcomes) - 1)]
+
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+def make_policy(**kwargs):
+    kwargs.setdefault("backoff_base_s", 0.001)
+    kwargs.setdefault("backoff_max_s", 0.001)
+    return CallPolicy(**kwargs)
+
+
+def check(label: str, ok: bool) -> bool:
+    print(f"   {'✅' if ok else '❌'} {label}")
+    return ok
+
+
+def check_retry() -> bool:
+    rpc = FakeRPC([ServiceUnavailable(), ServiceUnavailable(), "ok"])
+    response, stats = make_policy(max_attempts=3).call(rpc)
+
+    quota_rpc = FakeRPC([TooManyRequests(), "ok"])
+    try:
+        make_policy(max_attempts=3).call(quota_rpc)
+        quota_error = None
+    except TooManyRequests as e:
+        quota_error = e
+
+    value_rpc = FakeRPC([ValueError("bad image"), "ok"])
+    try:
+        make_policy(max_attempts=3).call(value_rpc)
+    except ValueError:
+        pass
+
+    return all([
+        check("일시적 오류 2회 후 성공", response == "ok" and rpc.calls == 3 and stats["retries"] == 2),
+        check("쿼터 초과는 재시도 안 함", quota_error is not None and quota_rpc.calls == 1
+              and quota_error.call_stats["attempts"] == 1),
+        check("요청 오류는 재시도 안 함", value_rpc.calls == 1),
+    ])
+
+
+def check_breaker() -> bool:
+    breaker = CircuitBreaker(failure_threshold=2, reset_s=0.2)
+    policy = make_policy(max_attempts=1, breaker=breaker)
+
+    for _ in range(2):
+        try:
+            policy.call(FakeRPC([ServiceUnavailable()]))
+        except ServiceUnavailable:
+            pass
+
+    opened = breaker.state == "open"
+
+    blocked_rpc = FakeRPC(["ok"])
+    try:
+        policy.call(blocked_rpc)
+        blocked = False
+    except CircuitOpenError:
+        blocked = blocked_rpc.calls == 0
+
+    time.sleep(0.25)
+    half_open = breaker.state == "half_open"
+
+    # half-open : 시험 호출 1건만 통과, 나머지는 차단
+    breaker.allow()
+    try:
+        breaker.allow()
+        single_trial = False
+    except CircuitOpenError:
+        single_trial = True
+
+    breaker.record_success()
+    response, _ = policy.call(FakeRPC(["ok"]))
+
+    return all([
+        check("연속 실패 2회 → open", opened),
+        check("open 동안 RPC 호출 안 함", blocked),
+        check("reset 뒤 half_open", half_open),
+        check("half_open 시험 호출은 1건만", single_trial),
+        check("시험 호출 성공 → closed", breaker.state == "closed" and response == "ok"),
+    ])
+
+
+def check_hedge() -> bool:
+    # 첫 요청 0.5s, hedging 요청 즉시 응답
+    rpc = FakeRPC(["slow", "fast"], delays=[0.5, 0.0])
+
+    started = time.perf_counter()
+    response, stats = make_policy(hedge=0.05).call(rpc)
+    elapsed = time.perf_counter() - started
+
+    fast_rpc = FakeRPC(["ok"])
+    _, fast_stats = make_policy(hedge=0.5).call(fast_rpc)
+
+    return all([
+        check(f"hedging 응답 사용 ({elapsed:.2f}s)", response == "fast" and elapsed < 0.3),
+        check("hedging stats 기록", stats["hedged"] and stats["hedge_won"] and stats["attempts"] == 2),
+        check("빠른 요청은 hedging 안 함", not fast_stats["hedged"] and fast_rpc.calls == 1),
+    ])
+
+
+def main():
+    print("=" * 60)
+    print("CallPolicy 테스트")
+    print("=" * 60)
+
+    results = [check_retry(), check_breaker(), check_hedge()]
+
+    print("\n" + "=" * 60)
+    print("테스트 완료!" if all(results) else "테스트 실패")
+    print("=" * 60)
+
+    return all(results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
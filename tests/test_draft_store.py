@@ -0,0 +1,118 @@
+# =============================================================================
+# test_draft_store.py - draft 저장소 + 재파싱 작업 테스트
+# =============================================================================
+# 설명: DraftStore / run_rederive가
+#       - 이전 파서 버전 행만 저장된 OCR 원문으로 다시 파싱하는지 (현재 버전 행은 그대로)
+#       - 재파싱으로 만들 수 없는 필드(segment 등)를 유지하는지
+#       - 보관 한도(max_rows / max_age_s)를 넘는 오래된 행을 지우는지
+#       - 환경변수로 켜지 않으면 저장소를 만들지 않는지
+#       임시 디렉터리의 SQLite 파일 사용 (Vision 호출 없음)
+#       프로젝트 루트에서 실행: python -m tests.test_draft_store
+# =============================================================================
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+os.environ.pop("OCR_DRAFT_STORE_ENABLED", None)
+
+from services.ocr_pipeline2.parsing.parser import PARSER_VERSION
+from services.ocr_pipeline2.persistence.draft_store import DraftStore, get_default_draft_store
+from services.ocr_pipeline2.pipeline.rederive import run_rederive
+
+
+RECEIPT_TEXT = "\n".join([
+    "이마트 성수점",
+    "2023.12.31 14:02",
+    "두부 1,980",
+    "계란 6,980",
+    "합계 8,960",
+    "신용카드 8,960",
+])
+
+
+def ocr_result(name: str) -> dict:
+    return {"adapter": "google_vision", "image_name": name, "full_text": RECEIPT_TEXT}
+
+
+def check(label: str, ok: bool) -> bool:
+    print(f"   {'✅' if ok else '❌'} {label}")
+    return ok
+
+
+def check_rederive(tmp: str) -> bool:
+    store = DraftStore(f"{tmp}/rederive.sqlite3")
+
+    # 이전 버전 draft 2건 (1건은 분리 영수증) + 현재 버전 draft 1건
+    old_id = store.put(ocr_result("old.jpg"), {"image_path": "old.jpg", "store_name": "낡은 결과"}, PARSER_VERSION - 1)
+    segment_id = store.put(
+        ocr_result("two.jpg"),
+        {"image_path": "two.jpg", "store_name": "낡은 결과", "segment": {"index": 1, "count": 2}},
+        PARSER_VERSION - 1
+    )
+    current_id = store.put(ocr_result("new.jpg"), {"image_path": "new.jpg", "store_name": "그대로"}, PARSER_VERSION)
+
+    before = store.stats(PARSER_VERSION)
+    counts = run_rederive(store, batch_size=1, progress=False)
+
+    old, segment, current = store.get(old_id), store.get(segment_id), store.get(current_id)
+
+    return all([
+        check("stale 행 수", before["entries"] == 3 and before["stale"] == 2),
+        check("stale 행만 재파싱", counts["processed"] == 2 and counts["updated"] == 2 and counts["remaining"] == 0),
+        check("OCR 원문으로 다시 만든 draft", old["parser_version"] == PARSER_VERSION
+              and old["store_name"] == "이마트 성수점" and old["total"] == 8960),
+        check("재파싱해도 segment 유지", segment["segment"] == {"index": 1, "count": 2}),
+        check("현재 버전 행은 건드리지 않음", current["store_name"] == "그대로"),
+    ])
+
+
+def check_purge(tmp: str) -> bool:
+    store = DraftStore(f"{tmp}/purge.sqlite3", max_rows=3)
+    ids = [store.put(ocr_result(f"{i}.jpg"), {"image_path": f"{i}.jpg"}, PARSER_VERSION) for i in range(5)]
+
+    by_rows = store.purge()
+    kept = [draft_id for draft_id in ids if store.get(draft_id) is not None]
+
+    time.sleep(0.05)
+    by_age = store.purge(max_age_s=0.01)
+    left = store.stats()["entries"]
+
+    # 다시 열 때 한도 적용
+    reopened = DraftStore(f"{tmp}/purge.sqlite3", max_rows=3)
+    for i in range(5):
+        reopened.put(ocr_result(f"again_{i}.jpg"), {"image_path": f"again_{i}.jpg"}, PARSER_VERSION)
+    reopened.close()
+
+    return all([
+        check("max_rows 초과분 삭제 (최근 행 유지)", by_rows == 2 and kept == ids[2:]),
+        check("max_age_s 지난 행 삭제", by_age == 3 and left == 0),
+        check("생성 시 한도로 정리", DraftStore(f"{tmp}/purge.sqlite3", max_rows=3).stats()["entries"] == 3),
+    ])
+
+
+def check_opt_in() -> bool:
+    return check("OCR_DRAFT_STORE_ENABLED 미설정 → 저장 안 함", get_default_draft_store() is None)
+
+
+def main():
+    print("=" * 60)
+    print("DraftStore / rederive 테스트")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = [check_rederive(tmp), check_purge(tmp), check_opt_in()]
+
+    print("\n" + "=" * 60)
+    print("테스트 완료!" if all(results) else "테스트 실패")
+    print("=" * 60)
+
+    return all(results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,77 @@
+# =============================================================================
+# test_duplicate_index.py - 같은 영수증 재촬영 감지 테스트
+# =============================================================================
+# 설명: dHash + NearDuplicateIndex가
+#       - 밝기 / 해상도가 조금 다른 같은 영수증 사진을 찾아내는지
+#       - 다른 영수증 / 다른 사용자 사진은 중복으로 보지 않는지
+#       NumPy로 그린 가짜 영수증 이미지 사용
+#       프로젝트 루트에서 실행: python -m tests.test_duplicate_index
+# =============================================================================
+
+import io
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+from PIL import Image
+
+from services.ocr_pipeline2.pipeline.duplicate_index import NearDuplicateIndex, dhash
+
+
+def receipt_image(seed: int, brightness: int = 0, size=(600, 900), fmt="PNG") -> bytes:
+    """흰 종이 위 길이가 다른 글자 줄 (seed마다 줄 배치가 다름)"""
+
+    rng = np.random.default_rng(seed)
+    pixels = np.full((900, 600), 235, dtype=np.int16)
+
+    for row in range(40, 860, 30):
+        start = int(rng.integers(30, 120))
+        end = int(rng.integers(250, 570))
+        pixels[row:row + 14, start:end] = 30
+
+    pixels = np.clip(pixels + brightness, 0, 255).astype(np.uint8)
+
+    img = Image.fromarray(pixels).resize(size, Image.BILINEAR)
+    buf = io.BytesIO()
+    img.save(buf, format=fmt)
+    return buf.getvalue()
+
+
+def check(label: str, ok: bool) -> bool:
+    print(f"   {'✅' if ok else '❌'} {label}")
+    return ok
+
+
+def main():
+    print("=" * 60)
+    print("NearDuplicateIndex 테스트")
+    print("=" * 60)
+
+    index = NearDuplicateIndex()
+    original = dhash(receipt_image(1))
+    index.add(1, original, "first.png", {"store_name": "이마트"})
+
+    retake = index.find(1, dhash(receipt_image(1, brightness=15, size=(450, 675), fmt="JPEG")))
+    other = index.find(1, dhash(receipt_image(2)))
+    other_user = index.find(2, original)
+
+    results = [
+        check("해시 크기 64bit / 256bit", original[0] < 2 ** 64 and original[1] < 2 ** 256),
+        check("밝기 / 해상도 / 형식이 달라도 같은 영수증으로 찾음",
+              retake is not None and retake["name"] == "first.png" and retake["draft"]["store_name"] == "이마트"),
+        check("다른 영수증은 중복 아님", other is None),
+        check("다른 사용자 업로드는 비교하지 않음", other_user is None),
+        check("조회 / 일치 카운터", index.stats()["lookups"] == 3 and index.stats()["matches"] == 1),
+    ]
+
+    print("\n" + "=" * 60)
+    print("테스트 완료!" if all(results) else "테스트 실패")
+    print("=" * 60)
+
+    return all(results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,257 @@
+# =============================================================================
+# test_job_queue.py - OCR 작업 큐 테스트
+# =============================================================================
+# 설명: JobQueue / ocr_worker가
+#       - 오래된 작업부터 1건씩 점유(claim)하는지
+#       - lease가 만료되면 다른 워커가 다시 가져가고, 이전 워커의 늦은 결과는 버리는지
+#       - 재시도 한도를 넘긴 작업을 failed로 끝내는지
+#       - 대기 / 실행 중 취소가 되는지
+#       - 작업 id를 잃어도(새로고침) user_pk로 최근 작업을 다시 찾는지
+#       - 보관 기간이 지난 끝난 작업을 claim 주기 / 재시작 시 삭제하는지
+#       - 워커가 실행 중 lease를 연장해 느린 작업을 다른 워커가 가져가지 않는지
+#       임시 디렉터리의 SQLite 파일 + 가짜 OCR 어댑터 사용
+#       프로젝트 루트에서 실행: python -m tests.test_job_queue
+# =============================================================================
+
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# 부가 기능(쿼터 / 재OCR / 저장소 / 지표 / 중복 감지)은 끄고 가짜 어댑터 사용
+os.environ.update({
+    "OCR_ADAPTER": "fake_queue",
+    "OCR_QUOTA_ENABLED": "0",
+    "OCR_RESCUE_ENABLED": "0",
+    "OCR_DRAFT_STORE_ENABLED": "0",
+    "OCR_METRICS_ENABLED": "0",
+    "OCR_DEDUP_ENABLED": "0",
+})
+
+from services.ocr_pipeline2.ocr.adapter_registry import registry
+from services.ocr_pipeline2.ocr.base_adapter import OCRAdapter
+from services.ocr_pipeline2.pipeline import job_queue
+from services.ocr_pipeline2.pipeline.job_queue import JobQueue
+from services.ocr_pipeline2.pipeline.ocr_worker import process_one
+
+
+class SlowAdapter(OCRAdapter):
+
+    name = "fake_queue"
+    delay_s = 0.0
+
+    def run_bytes(self, content, name: str) -> dict:
+        time.sleep(self.delay_s)
+        return {"adapter": self.name, "image_name": name, "full_text": "이마트\n두부 1,980\n합계 1,980"}
+
+
+registry.register(SlowAdapter.name, SlowAdapter)
+
+
+def check(label: str, ok: bool) -> bool:
+    print(f"   {'✅' if ok else '❌'} {label}")
+    return ok
+
+
+def check_claim_and_lease(tmp: str) -> bool:
+    queue = JobQueue(f"{tmp}/lease.sqlite3")
+
+    first = queue.submit(b"1", "first.jpg", user_pk=7)
+    time.sleep(0.01)
+    second = queue.submit(b"2", "second.jpg")
+
+    claimed = queue.claim("w1", lease_s=0.1)
+    other = queue.claim("w2", lease_s=0.1)
+    empty = queue.claim("w3", lease_s=0.1)
+
+    time.sleep(0.15)
+
+    # w1 lease 만료 → w3가 다시 가져감, w1의 늦은 결과 / 연장은 무시
+    reclaimed = queue.claim("w3", lease_s=10)
+    stale_renew = queue.renew(first, "w1")
+    stale_complete = queue.complete(first, "w1", {"store_name": "늦은 결과"})
+    owner_complete = queue.complete(first, "w3", {"store_name": "이마트"})
+
+    return all([
+        check("오래된 작업부터 점유", claimed is not None and claimed[0] == first
+              and bytes(claimed[1]) == b"1" and claimed[2:] == ("first.jpg", 7)),
+        check("점유된 작업은 다른 워커가 가져가지 않음", other[0] == second and empty is None),
+        check("lease 만료 → 다른 워커가 다시 가져감", reclaimed is not None and reclaimed[0] == first),
+        check("lease 잃은 워커는 연장 / 결과 기록 불가", not stale_renew and not stale_complete),
+        check("점유한 워커 결과 기록", owner_complete and queue.result(first) == {"store_name": "이마트"}),
+    ])
+
+
+def check_max_attempts(tmp: str) -> bool:
+    queue = JobQueue(f"{tmp}/attempts.sqlite3")
+    job_id = queue.submit(b"x", "crash.jpg")
+
+    for n in range(job_queue.MAX_ATTEMPTS):
+        queue.claim(f"w{n}", lease_s=0.01)
+        time.sleep(0.02)
+
+    after_limit = queue.claim("w_last", lease_s=0.01)
+    result = queue.result(job_id)
+
+    return check("재시도 한도 초과 → failed", after_limit is None
+                 and queue.poll([job_id]) == {job_id: job_queue.FAILED}
+                 and result["validation_status"] == "error")
+
+
+def check_cancel(tmp: str) -> bool:
+    queue = JobQueue(f"{tmp}/cancel.sqlite3")
+
+    queued = queue.submit(b"1", "queued.jpg")
+    running = queue.submit(b"2", "running.jpg")
+
+    queue.claim("w1")                       # queued.jpg 점유
+    queue.cancel(queued)
+    claimed = queue.claim("w1")             # running.jpg 점유
+    cancelled_running = queue.cancel(running)
+
+    return all([
+        check("대기 / 실행 중 작업 취소", cancelled_running and claimed[0] == running
+              and queue.poll([queued, running]) == {queued: "cancelled", running: "cancelled"}),
+        check("취소된 작업 결과는 버림", not queue.complete(running, "w1", {"store_name": "x"})
+              and queue.result(running)["error_msg"] == "작업이 취소되었습니다."),
+        check("끝난 작업은 다시 취소 안 됨", not queue.cancel(running)),
+    ])
+
+
+def check_list_jobs(tmp: str) -> bool:
+    queue = JobQueue(f"{tmp}/restore.sqlite3")
+
+    first = queue.submit(b"1", "a.jpg", user_pk=7)
+    time.sleep(0.01)
+    second = queue.submit(b"2", "b.jpg", user_pk=7)
+    queue.submit(b"3", "other.jpg", user_pk=8)
+
+    queue.claim("w1")
+    queue.complete(first, "w1", {"store_name": "이마트"})
+
+    # 새로고침 : 세션의 작업 id는 사라지고 user_pk만 남음
+    submitted_at = time.time()
+    time.sleep(0.01)
+    later = queue.submit(b"4", "c.jpg", user_pk=7)
+
+    restored = queue.list_jobs(7)
+    recent = queue.list_jobs(7, since=submitted_at)
+    ids = {name: job_id for job_id, name, _ in restored}
+
+    return all([
+        check("user_pk로 작업 다시 찾음 (등록 순)", [name for _, name, _ in restored] == ["a.jpg", "b.jpg", "c.jpg"]),
+        check("상태 함께 반환", [status for _, _, status in restored] == ["done", "queued", "queued"]),
+        check("찾은 id로 결과 조회", ids["a.jpg"] == first and ids["b.jpg"] == second
+              and queue.result(ids["a.jpg"]) == {"store_name": "이마트"}),
+        check("since 이후 작업만", [job_id for job_id, _, _ in recent] == [later]),
+        check("다른 사용자 작업은 제외", queue.list_jobs(9) == []),
+    ])
+
+
+def _age_finished(queue: JobQueue, seconds: float):
+    """끝난 작업의 finished_at을 seconds초 전으로 (시간 경과 흉내)"""
+    with queue._lock:
+        queue._conn.execute(
+            "UPDATE ocr_jobs SET finished_at = finished_at - ? WHERE finished_at IS NOT NULL", (seconds,)
+        )
+
+
+def check_retention(tmp: str) -> bool:
+    path = f"{tmp}/retention.sqlite3"
+    queue = JobQueue(path, retention_s=60)
+
+    old = queue.submit(b"1", "old.jpg")
+    queue.claim("w1")
+    queue.complete(old, "w1", {"store_name": "이마트"})
+    waiting = queue.submit(b"2", "waiting.jpg")
+    _age_finished(queue, 120)
+
+    # PURGE_EVERY회째 claim에서 정리 (빈 큐 확인도 claim 1회)
+    saved = job_queue.PURGE_EVERY
+    job_queue.PURGE_EVERY = 3
+
+    try:
+        queue.claim("w1")
+        kept_before = queue.poll([old]) == {old: "done"}
+        queue.claim("w1")
+        queue.claim("w1")
+        purged = queue.poll([old]) == {}
+    finally:
+        job_queue.PURGE_EVERY = saved
+
+    # 재시작 시 이전 실행에서 쌓인 작업 정리
+    queue.complete(waiting, "w1", {"store_name": "홈플러스"})
+    _age_finished(queue, 120)
+    queue.close()
+    reopened = JobQueue(path, retention_s=60)
+
+    return all([
+        check("보관 기간 지나도 claim 주기 전에는 유지", kept_before),
+        check("claim 주기에 끝난 작업 삭제", purged),
+        check("재시작 시 오래된 작업 삭제", reopened.poll([waiting]) == {}),
+        check("보관 기간 없으면 삭제하지 않음", JobQueue(path).purge() == 0),
+    ])
+
+
+def check_heartbeat(tmp: str) -> bool:
+    queue = JobQueue(f"{tmp}/heartbeat.sqlite3")
+    job_id = queue.submit(b"slow", "slow.jpg")
+
+    SlowAdapter.delay_s = 0.6
+    stolen = []
+
+    def other_worker():
+        # owner가 먼저 점유한 뒤, lease(0.3s)보다 오래 걸리는 동안 다른 워커가 계속 가져가 보려 함
+        time.sleep(0.05)
+        deadline = time.time() + 0.5
+        while time.time() < deadline:
+            job = queue.claim("thief", lease_s=0.3)
+            if job is not None:
+                stolen.append(job[0])
+            time.sleep(0.05)
+
+    thief = threading.Thread(target=other_worker)
+
+    try:
+        thief.start()
+        processed = process_one(queue, "owner", lease_s=0.3)
+    finally:
+        SlowAdapter.delay_s = 0.0
+        thief.join()
+
+    result = queue.result(job_id)
+
+    return all([
+        check("실행 중 lease 연장 → 다른 워커가 가져가지 않음", processed and not stolen),
+        check("결과 기록", result is not None and result["validation_status"] != "error"),
+    ])
+
+
+def main():
+    print("=" * 60)
+    print("JobQueue 테스트")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = [
+            check_claim_and_lease(tmp),
+            check_max_attempts(tmp),
+            check_cancel(tmp),
+            check_list_jobs(tmp),
+            check_retention(tmp),
+            check_heartbeat(tmp),
+        ]
+
+    print("\n" + "=" * 60)
+    print("테스트 완료!" if all(results) else "테스트 실패")
+    print("=" * 60)
+
+    return all(results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,104 @@
+# =============================================================================
+# test_metrics.py - 단계별 지연 지표 테스트
+# =============================================================================
+# 설명: StageMetrics가
+#       - duration을 올바른 histogram bucket에 누적하는지 (le 경계값 포함)
+#       - Prometheus text format으로 bucket / sum / count / 에러 수를 내보내는지
+#       - 분위수(p50 / p95)를 최근 표본으로 계산하는지
+#       - 등록된 외부 카운터(재OCR 결과)를 counter로 함께 내보내는지
+#       프로젝트 루트에서 실행: python -m tests.test_metrics
+# =============================================================================
+
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.ocr_pipeline2.logging.metrics import BUCKETS_MS, StageMetrics
+from services.ocr_pipeline2.pipeline.rescue import METRIC_NAME, OCRRescuer
+
+
+def parse(text: str) -> dict:
+    """주석 제외 "이름{라벨} 값" 줄 → {"이름{라벨}": float}"""
+
+    samples = {}
+
+    for line in text.splitlines():
+        if not line or line.startswith("#"):
+            continue
+        key, value = line.rsplit(" ", 1)
+        samples[key] = float(value)
+
+    return samples
+
+
+def check(label: str, ok: bool) -> bool:
+    print(f"   {'✅' if ok else '❌'} {label}")
+    return ok
+
+
+def main():
+    print("=" * 60)
+    print("StageMetrics 테스트")
+    print("=" * 60)
+
+    metrics = StageMetrics()
+
+    # 5ms는 le="5" bucket에 포함 (상한 이하)
+    for duration in (0.5, 5, 7, 300, 120000):
+        metrics.observe("OCR", duration)
+    metrics.observe("OCR", 42, error=True)
+    metrics.observe("PARSING", 3)
+
+    samples = parse(metrics.to_prometheus())
+    bucket = 'ocr_pipeline_stage_duration_ms_bucket{{stage="OCR",le="{}"}}'
+
+    expected = {"1": 1, "2.5": 1, "5": 2, "10": 3, "250": 3, "500": 4, "60000": 4, "+Inf": 5}
+    cumulative = {le: samples[bucket.format(le)] for le in expected}
+
+    snapshot = metrics.snapshot()["OCR"]
+
+    # 재OCR 카운터는 내보낼 때마다 현재 값을 읽음
+    rescuer = OCRRescuer()
+    metrics.register_counters(METRIC_NAME, "OCR rescue outcomes.", "outcome", rescuer.counters)
+    for outcome in ("attempts", "attempts", "improved", "rescued", "failed", "skipped_budget"):
+        rescuer.record(outcome)
+    rescue = {
+        outcome: parse(metrics.to_prometheus()).get(f'{METRIC_NAME}{{outcome="{outcome}"}}')
+        for outcome in ("attempts", "rescued", "improved", "failed", "skipped_budget")
+    }
+    rescue_type = f"# TYPE {METRIC_NAME} counter" in metrics.to_prometheus()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "ocr.prom"
+        metrics.write_textfile(str(path))
+        written = path.read_text(encoding="utf-8") == metrics.to_prometheus()
+
+    results = [
+        check("bucket 수 = 경계 수 + Inf", sum(
+            1 for key in samples if key.startswith('ocr_pipeline_stage_duration_ms_bucket{stage="OCR"')
+        ) == len(BUCKETS_MS) + 1),
+        check(f"누적 bucket 값 {cumulative}", cumulative == expected),
+        check("sum / count (에러는 제외)",
+              samples['ocr_pipeline_stage_duration_ms_sum{stage="OCR"}'] == 120312.5
+              and samples['ocr_pipeline_stage_duration_ms_count{stage="OCR"}'] == 5),
+        check("에러 수", samples['ocr_pipeline_stage_errors_total{stage="OCR"}'] == 1
+              and samples['ocr_pipeline_stage_errors_total{stage="PARSING"}'] == 0),
+        check("단계별 분리", samples['ocr_pipeline_stage_duration_ms_count{stage="PARSING"}'] == 1),
+        check("분위수 (nearest-rank)", snapshot["p50_ms"] == 7 and snapshot["p95_ms"] == 120000),
+        check("textfile 내보내기", written),
+        check(f"재OCR 카운터 {rescue}", rescue_type and rescue == {
+            "attempts": 2, "rescued": 1, "improved": 1, "failed": 1, "skipped_budget": 1
+        }),
+    ]
+
+    print("\n" + "=" * 60)
+    print("테스트 완료!" if all(results) else "테스트 실패")
+    print("=" * 60)
+
+    return all(results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
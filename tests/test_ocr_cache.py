@@ -0,0 +1,120 @@
+# =============================================================================
+# test_ocr_cache.py - OCR 결과 로컬 캐시 테스트
+# =============================================================================
+# 설명: OCRCache / CachedOCRAdapter가
+#       - 같은 이미지를 다시 OCR하지 않는지 (hit / miss 카운터)
+#       - 크기 상한을 넘으면 가장 오래 조회되지 않은 항목부터 지우는지 (LRU)
+#       - 전처리 설정이 다르면 다른 key를 쓰는지
+#       임시 디렉터리의 SQLite 파일 사용, Vision 대신 가짜 어댑터
+#       프로젝트 루트에서 실행: python -m tests.test_ocr_cache
+# =============================================================================
+
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.ocr_pipeline2.ocr.base_adapter import OCRAdapter
+from services.ocr_pipeline2.ocr.ocr_cache import CachedOCRAdapter, OCRCache
+from services.ocr_pipeline2.ocr.preprocess import ImagePreprocessor
+
+
+class CountingAdapter(OCRAdapter):
+
+    name = "google_vision"
+
+    def __init__(self):
+        self.calls = []
+
+    def run_bytes(self, content, name: str) -> dict:
+        return self.run_batch_bytes([(content, name)])[0]
+
+    def run_batch_bytes(self, items: list) -> list:
+        self.calls.append([name for _, name in items])
+        return [
+            {"adapter": self.name, "image_name": name, "full_text": f"text of {bytes(content).decode()}"}
+            for content, name in items
+        ]
+
+
+def check(label: str, ok: bool) -> bool:
+    print(f"   {'✅' if ok else '❌'} {label}")
+    return ok
+
+
+def check_hits(tmp: str) -> bool:
+    adapter = CountingAdapter()
+    cached = CachedOCRAdapter(lambda: adapter, cache=OCRCache(f"{tmp}/hits.sqlite3"), name="google_vision")
+
+    first = cached.run_bytes(b"a", "a.jpg")
+    second = cached.run_bytes(b"a", "a_again.jpg")
+    batch = cached.run_batch_bytes([(b"a", "a.jpg"), (b"b", "b.jpg")])
+
+    stats = cached.cache.stats()
+
+    return all([
+        check("처음은 miss, 다시 올리면 hit", first["cache_hit"] is False and second["cache_hit"] is True),
+        check("hit 결과는 저장된 텍스트", second["full_text"] == "text of a" and second["image_name"] == "a_again.jpg"),
+        check("배치는 miss만 내부 어댑터로", adapter.calls == [["a.jpg"], ["b.jpg"]]
+              and [r["cache_hit"] for r in batch] == [True, False]),
+        check("hit / miss 카운터", stats["hits"] == 2 and stats["misses"] == 2 and stats["entries"] == 2),
+    ])
+
+
+def check_lru(tmp: str) -> bool:
+    # 항목 1개 = "x" * 100 → 100 bytes, 상한 250 bytes → 2개까지
+    cache = OCRCache(f"{tmp}/lru.sqlite3", max_bytes=250)
+
+    keys = [OCRCache.make_key(bytes([i]), "google_vision") for i in range(3)]
+
+    cache.put(keys[0], "google_vision", "x" * 100)
+    cache.put(keys[1], "google_vision", "x" * 100)
+    cache.get(keys[0])                                  # 0번을 최근 조회로
+    cache.put(keys[2], "google_vision", "x" * 100)      # 가장 오래 조회 안 된 1번 제거
+
+    return all([
+        check("상한 초과 시 1건 제거", cache.stats()["evictions"] == 1 and cache.stats()["bytes"] <= 250),
+        check("최근 조회한 항목은 유지", cache.get(keys[0]) is not None and cache.get(keys[2]) is not None),
+        check("가장 오래 조회 안 된 항목 제거", cache.get(keys[1]) is None),
+    ])
+
+
+def check_preprocess_key(tmp: str) -> bool:
+    content = b"receipt"
+
+    raw = OCRCache.make_key(content, "google_vision")
+    default = OCRCache.make_key(content, "google_vision", ImagePreprocessor())
+    smaller = OCRCache.make_key(content, "google_vision", ImagePreprocessor(max_edge=1200))
+    color = OCRCache.make_key(content, "google_vision", ImagePreprocessor(grayscale=False))
+
+    adapter = CountingAdapter()
+    cache = OCRCache(f"{tmp}/preprocess.sqlite3")
+    CachedOCRAdapter(lambda: adapter, cache=cache, name="google_vision").run_bytes(content, "r.jpg")
+    CachedOCRAdapter(lambda: adapter, cache=cache, name="google_vision",
+                     preprocessor=ImagePreprocessor()).run_bytes(content, "r.jpg")
+
+    return all([
+        check("전처리 설정마다 다른 key", len({raw, default, smaller, color}) == 4),
+        check("같은 설정이면 같은 key", default == OCRCache.make_key(content, "google_vision", ImagePreprocessor())),
+        check("전처리 설정이 바뀌면 다시 OCR", len(adapter.calls) == 2),
+    ])
+
+
+def main():
+    print("=" * 60)
+    print("OCRCache 테스트")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = [check_hits(tmp), check_lru(tmp), check_preprocess_key(tmp)]
+
+    print("\n" + "=" * 60)
+    print("테스트 완료!" if all(results) else "테스트 실패")
+    print("=" * 60)
+
+    return all(results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
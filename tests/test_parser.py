@@ -0,0 +1,146 @@
+# =============================================================================
+# test_parser.py - 영수증 파서 테스트
+# =============================================================================
+# 설명: parse_text(단일 패스 엔진) 결과가
+#       - 저장된 기준 결과(tests/parser_baseline.json, 엔진 도입 전 출력)와 같은지
+#       - 필드별 extract_* 함수를 각각 호출한 결과와 같은지
+#       확인하는 테스트 스크립트 + 단어 위치(layout) 기반 item 추출 결과 확인
+#       프로젝트 루트에서 실행: python -m tests.test_parser
+# =============================================================================
+
+import json
+import sys
+from pathlib import Path
+
+# 프로젝트 루트를 path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.ocr_pipeline2.parsing.parser import (
+    parse_text,
+    extract_store_name,
+    extract_date,
+    extract_total,
+    extract_payment,
+    extract_items,
+    extract_items_from_layout,
+    classify_category,
+)
+from services.ocr_pipeline2.ocr.word_layout import WordLayout
+
+
+# 파서 기준 결과 : 입력 텍스트 → 단일 패스 엔진 도입 전 parse_text 출력 (필드별 기대값)
+# 파서 규칙을 의도적으로 바꿨다면 결과를 확인한 뒤 이 파일을 함께 갱신
+BASELINE_PATH = Path(__file__).parent / "parser_baseline.json"
+
+
+# 단어 위치 샘플 : 행마다 [(단어, x0, x1), ...] (y는 행 순서로 생성)
+LAYOUT_ROWS = [
+    [("스타벅스", 40, 300), ("강남R점", 320, 480)],
+    [("상품명", 40, 120), ("단가", 300, 360), ("수량", 400, 450), ("금액", 520, 580)],
+    [("아메리카노", 40, 190), ("4,500", 290, 360), ("2", 420, 435), ("9,000", 510, 580)],
+    [("카페", 40, 100), ("라떼", 110, 170), ("5,000", 290, 360), ("1", 420, 435), ("5,000", 510, 580)],
+    [("치즈케이크", 40, 190)],
+    [("6,500", 510, 580)],
+    [("합계", 40, 100), ("20,500", 500, 580)],
+    [("신용카드", 40, 160), ("20,500", 500, 580)],
+]
+
+LAYOUT_EXPECTED = [("아메리카노", 9000, 2), ("카페 라떼", 5000, 1), ("치즈케이크", 6500, 1)]
+
+
+def build_layout(rows) -> WordLayout:
+    words, boxes, offsets = [], [], [0]
+
+    for r, row in enumerate(rows):
+        # 살짝 기운 영수증처럼 행마다 y를 조금씩 흔듦
+        y = 100 + r * 40 + r % 3
+
+        for text, x0, x1 in row:
+            words.append(text)
+            boxes += [x0, y, x1, y + 22]
+            offsets.append(offsets[-1] + len(text))
+
+    return WordLayout.from_dict({
+        "text": "".join(words),
+        "offsets": offsets,
+        "boxes": boxes,
+        "page_size": [600, 800]
+    })
+
+
+def check_layout_items() -> bool:
+    """단어 위치 기반 item 추출 (행 복원 + 오른쪽 정렬 가격 + 단가 × 수량)"""
+
+    items = extract_items_from_layout(build_layout(LAYOUT_ROWS), total_value=20500)
+    actual = [(i["name"], i["price"], i["qty"]) for i in items]
+
+    if actual == LAYOUT_EXPECTED:
+        print(f"   ✅ layout items: {len(actual)}건")
+        return True
+
+    print(f"   ❌ layout items: {actual!r} != {LAYOUT_EXPECTED!r}")
+    return False
+
+
+def expected_result(ocr_result: dict) -> dict:
+    """필드별 extract_* 함수를 개별 호출해서 만든 기준 결과"""
+    full_text = ocr_result["full_text"]
+    lines = [l.strip() for l in full_text.split("\n") if l.strip()]
+
+    store = extract_store_name(lines)
+    category = classify_category(store, full_text)
+
+    if (not store or len(store) < 2) and (
+        "배달" in full_text or "포장" in full_text or "픽업" in full_text
+    ):
+        store = "배달/포장"
+        category = "식비"
+
+    return {
+        "store_name": store,
+        "transaction_date": extract_date(lines),
+        "total": extract_total(lines),
+        "payment": extract_payment(lines),
+        "category": category,
+        "items": extract_items(lines),
+    }
+
+
+def main():
+    print("=" * 60)
+    print("영수증 파서 테스트")
+    print("=" * 60)
+
+    failed = 0
+
+    cases = json.loads(BASELINE_PATH.read_text(encoding="utf-8"))
+
+    for case in cases:
+        name = case["name"]
+        ocr_result = {"adapter": "test", "image_name": name, "full_text": case["full_text"]}
+
+        actual = parse_text(ocr_result)
+
+        for label, expected in (("기준 결과", case["expected"]), ("extract_*", expected_result(ocr_result))):
+            if actual == expected:
+                print(f"   ✅ {name} ({label}): {actual['store_name']} / {actual['total']}")
+                continue
+
+            failed += 1
+            print(f"   ❌ {name} ({label}): 결과 불일치")
+            for key in expected.keys() | actual.keys():
+                if actual.get(key) != expected.get(key):
+                    print(f"      - {key}: {actual.get(key)!r} != {expected.get(key)!r}")
+
+    if not check_layout_items():
+        failed += 1
+
+    print("\n" + "=" * 60)
+    print("테스트 완료!" if not failed else f"테스트 실패: {failed}건")
+    print("=" * 60)
+
+    return failed == 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
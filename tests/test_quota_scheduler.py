@@ -0,0 +1,111 @@
+# =============================================================================
+# test_quota_scheduler.py - Vision 쿼터 스케줄러 테스트
+# =============================================================================
+# 설명: QuotaScheduler가
+#       - 사용자별 round-robin으로 토큰을 나눠 한 사용자가 다른 사용자를 막지 않는지
+#       - 최대 대기 시간을 넘기면 QuotaWaitTimeout을 내는지
+#       - 초당 / 분당 한도를 함께 주면 두 한도를 모두 지키는지
+#       프로젝트 루트에서 실행: python -m tests.test_quota_scheduler
+# =============================================================================
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.ocr_pipeline2.ocr.quota_scheduler import QuotaScheduler, QuotaWaitTimeout
+
+
+def check(label: str, ok: bool) -> bool:
+    print(f"   {'✅' if ok else '❌'} {label}")
+    return ok
+
+
+def check_round_robin() -> bool:
+    # 초당 20건, burst 1 → 50ms마다 1건
+    scheduler = QuotaScheduler(20, burst=1, max_wait_s=5)
+
+    order = []
+    lock = threading.Lock()
+
+    def request(user):
+        scheduler.acquire(user)
+        with lock:
+            order.append(user)
+
+    heavy = [threading.Thread(target=request, args=("heavy",)) for _ in range(6)]
+    for thread in heavy:
+        thread.start()
+
+    time.sleep(0.02)
+
+    light = [threading.Thread(target=request, args=("light",)) for _ in range(2)]
+    for thread in light:
+        thread.start()
+
+    for thread in heavy + light:
+        thread.join()
+
+    # light 2건은 heavy 대기열(5건)이 다 빠질 때까지 기다리지 않음
+    light_positions = [i for i, user in enumerate(order) if user == "light"]
+
+    return all([
+        check("모든 요청 토큰 받음", len(order) == 8 and scheduler.stats()["granted"] == 8),
+        check(f"사용자 번갈아 배분 (light 순서 {light_positions})", light_positions and max(light_positions) <= 4),
+    ])
+
+
+def check_timeout() -> bool:
+    scheduler = QuotaScheduler(1, burst=1, max_wait_s=0.1)
+    scheduler.acquire("a")
+
+    started = time.perf_counter()
+    try:
+        scheduler.acquire("a")
+        timed_out = False
+    except QuotaWaitTimeout:
+        timed_out = True
+    elapsed = time.perf_counter() - started
+
+    stats = scheduler.stats()
+
+    return all([
+        check(f"대기 초과 → QuotaWaitTimeout ({elapsed:.2f}s)", timed_out and elapsed < 0.5),
+        check("포기한 요청은 대기열에서 빠짐", stats["queue_depth"] == 0 and stats["timeouts"] == 1),
+    ])
+
+
+def check_both_limits() -> bool:
+    # 초당 한도는 넉넉하지만 분당 3건 → 4번째는 대기
+    scheduler = QuotaScheduler(100, burst=100, max_wait_s=0.2, per_minute=3)
+
+    for _ in range(3):
+        scheduler.acquire("a")
+
+    try:
+        scheduler.acquire("a")
+        limited = False
+    except QuotaWaitTimeout:
+        limited = True
+
+    return check("RPS와 RPM 함께 적용 (분당 한도 초과 시 대기)", limited)
+
+
+def main():
+    print("=" * 60)
+    print("QuotaScheduler 테스트")
+    print("=" * 60)
+
+    results = [check_round_robin(), check_timeout(), check_both_limits()]
+
+    print("\n" + "=" * 60)
+    print("테스트 완료!" if all(results) else "테스트 실패")
+    print("=" * 60)
+
+    return all(results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
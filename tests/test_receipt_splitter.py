@@ -0,0 +1,114 @@
+# =============================================================================
+# test_receipt_splitter.py - 사진 1장 여러 영수증 분리 테스트
+# =============================================================================
+# 설명: split_receipts가
+#       - 나란히 놓인 영수증 2장을 영수증별 OCR 결과로 나누는지
+#       - 영수증 1장(줄 간격이 넓어도)은 나누지 않는지
+#       Vision 응답 대신 단어 box를 직접 만든 WordLayout 사용
+#       프로젝트 루트에서 실행: python -m tests.test_receipt_splitter
+# =============================================================================
+
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+os.environ["OCR_SPLIT_ENABLED"] = "1"
+
+from services.ocr_pipeline2.ocr.word_layout import WordLayout
+from services.ocr_pipeline2.pipeline.receipt_splitter import split_receipts
+
+
+LEFT = [
+    ["GS25", "역삼점"],
+    ["2024.01.05", "09:12"],
+    ["커피", "1,500"],
+    ["빵", "2,000"],
+    ["우유", "1,800"],
+    ["합계", "5,300"],
+]
+
+RIGHT = [
+    ["올리브영", "강남점"],
+    ["2024.01.06", "18:40"],
+    ["선크림", "18,000"],
+    ["립밤", "4,500"],
+    ["합계", "22,500"],
+]
+
+LINE_H = 20
+
+
+def make_layout(receipts) -> WordLayout:
+    """receipts : [(x 시작, y 시작, 줄 간격, 줄 목록)] → 단어마다 box 하나"""
+
+    words, boxes = [], []
+
+    for x0, y0, pitch, lines in receipts:
+        for row, line in enumerate(lines):
+            y = y0 + row * pitch
+            x = x0
+            for word in line:
+                width = 12 * len(word)
+                words.append(word)
+                boxes.append([x, y, x + width, y + LINE_H])
+                x += width + 15
+
+    offsets = [0]
+    for word in words:
+        offsets.append(offsets[-1] + len(word))
+
+    return WordLayout.from_dict({
+        "text": "".join(words),
+        "offsets": offsets,
+        "boxes": [v for box in boxes for v in box],
+        "page_size": [1200, 800],
+    })
+
+
+def ocr_result(layout: WordLayout) -> dict:
+    return {"adapter": "google_vision", "image_name": "two.jpg", "full_text": "", "layout": layout}
+
+
+def check(label: str, ok: bool) -> bool:
+    print(f"   {'✅' if ok else '❌'} {label}")
+    return ok
+
+
+def main():
+    print("=" * 60)
+    print("split_receipts 테스트")
+    print("=" * 60)
+
+    # 두 영수증 사이 간격 400px (단어 높이 20px의 20배)
+    two = split_receipts(ocr_result(make_layout([(20, 40, 35, LEFT), (600, 60, 35, RIGHT)])))
+
+    # 영수증 1장, 줄 간격이 조금 넓음 (Y_GAP 미만)
+    one = split_receipts(ocr_result(make_layout([(20, 40, 60, LEFT + RIGHT)])))
+
+    texts = [segment["full_text"].splitlines() for segment in two]
+
+    results = [
+        check("영수증 2장으로 분리", len(two) == 2),
+        check("왼쪽 영수증 먼저 (읽는 순서)", len(two) == 2 and texts[0][0] == "GS25 역삼점"
+              and texts[1][0] == "올리브영 강남점"),
+        check("영수증별 행 복원", len(two) == 2 and texts[0][-1] == "합계 5,300" and texts[1][-1] == "합계 22,500"),
+        check("segment 정보 (index / count / bbox)", len(two) == 2
+              and [s["segment"]["index"] for s in two] == [0, 1]
+              and all(s["segment"]["count"] == 2 for s in two)
+              and two[1]["segment"]["bbox"][0] == 600),
+        check("영수증별 layout은 해당 단어만", len(two) == 2
+              and len(two[0]["layout"]) == sum(len(line) for line in LEFT)),
+        check("영수증 1장은 나누지 않음", len(one) == 1 and "segment" not in one[0]),
+    ]
+
+    print("\n" + "=" * 60)
+    print("테스트 완료!" if all(results) else "테스트 실패")
+    print("=" * 60)
+
+    return all(results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,179 @@
+# =============================================================================
+# test_rescue.py - 검증 실패 영수증 재OCR 테스트
+# =============================================================================
+# 설명: run_pipeline_bytes의 재OCR(adaptive rescue)이
+#       - validation_error draft를 재OCR 결과가 더 나을 때만 교체하는지
+#       - 교체 / 유지 모두 파싱 이벤트와 단계 지표를 한 번만 남기는지
+#       - success draft에는 run_bytes_document를 호출하지 않는지
+#       - RescueBudget이 시간 창 안에서 per_user + 1번째 요청을 거절하는지
+#       Vision 대신 가짜 어댑터 사용 (네트워크 / 인증 불필요)
+#       프로젝트 루트에서 실행: python -m tests.test_rescue
+# =============================================================================
+
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# 재OCR과 지표만 켜고(내보내기는 끔) 가짜 어댑터 사용
+os.environ.update({
+    "OCR_ADAPTER": "fake_rescue",
+    "OCR_QUOTA_ENABLED": "0",
+    "OCR_RESCUE_ENABLED": "1",
+    "OCR_RESCUE_PER_USER_HOUR": "2",
+    "OCR_DRAFT_STORE_ENABLED": "0",
+    "OCR_METRICS_ENABLED": "1",
+    "OCR_METRICS_TEXTFILE": "",
+    "OCR_METRICS_PORT": "",
+    "OCR_DEDUP_ENABLED": "0",
+})
+
+from services.ocr_pipeline2.logging.metrics import get_default_metrics
+from services.ocr_pipeline2.ocr.adapter_registry import registry
+from services.ocr_pipeline2.ocr.base_adapter import OCRAdapter
+from services.ocr_pipeline2.pipeline.rescue import RescueBudget, get_default_rescuer
+from services.ocr_pipeline2.pipeline.run_pipeline import run_pipeline_bytes
+
+
+RECEIPT_TEXT = "\n".join([
+    "이마트 성수점",
+    "2023.12.31 14:02",
+    "두부 1,980",
+    "계란 6,980",
+    "합계 8,960",
+    "신용카드 8,960",
+])
+
+BLURRY_TEXT = "흐릿한 사진"
+
+
+class StubAdapter(OCRAdapter):
+    """
+    good*  : 처음부터 읽힘 (success)
+    bad*   : 처음엔 흐릿(error), 재OCR하면 읽힘
+    worse* : 재OCR해도 흐릿
+    """
+
+    name = "fake_rescue"
+
+    document_calls = []
+
+    def run_bytes(self, content, name: str) -> dict:
+        text = RECEIPT_TEXT if name.startswith("good") else BLURRY_TEXT
+        return {"adapter": self.name, "image_name": name, "full_text": text}
+
+    def run_bytes_document(self, content, name: str, preprocessor=None) -> dict:
+        self.document_calls.append(name)
+        text = RECEIPT_TEXT if name.startswith("bad") else BLURRY_TEXT
+        return {"adapter": self.name, "image_name": name, "full_text": text}
+
+
+registry.register(StubAdapter.name, StubAdapter)
+
+
+def check(label: str, ok: bool) -> bool:
+    print(f"   {'✅' if ok else '❌'} {label}")
+    return ok
+
+
+def stages(draft: dict, stage: str) -> list:
+    return [e["message"] for e in draft["events"] if e["stage"] == stage]
+
+
+def parsing_count() -> int:
+    return get_default_metrics().snapshot().get("PARSING", {}).get("count", 0)
+
+
+def check_replace_and_keep() -> bool:
+    before = parsing_count()
+
+    rescued = run_pipeline_bytes(b"bad", "bad.jpg", verbose=False, user_pk=1)
+    kept = run_pipeline_bytes(b"worse", "worse.jpg", verbose=False, user_pk=1)
+
+    return all([
+        check("재OCR이 더 나으면 교체",
+              rescued["validation_status"] == "success" and rescued["rescue"]["adopted"]
+              and rescued["rescue"]["before"] == "error"),
+        check("재OCR이 낫지 않으면 기존 draft 유지",
+              kept["validation_status"] == "error" and not kept["rescue"]["adopted"]),
+        check("교체된 draft의 파싱 / 검증 / draft 이벤트는 한 벌",
+              len(stages(rescued, "PARSING")) == 1 and stages(rescued, "VALIDATION") == ["success"]
+              and len(stages(rescued, "DRAFT")) == 1),
+        check("유지된 draft에는 후보 이벤트가 섞이지 않음",
+              len(stages(kept, "PARSING")) == 1 and stages(kept, "VALIDATION") == ["error"]),
+        check("재OCR 이벤트 기록",
+              stages(rescued, "RESCUE") == ["재OCR 완료", "재OCR 결과 채택"]
+              and stages(kept, "RESCUE") == ["재OCR 완료", "기존 결과 유지"]),
+        check("단계 지표는 이미지당 PARSING 1건", parsing_count() - before == 2),
+    ])
+
+
+def check_success_skipped() -> bool:
+    calls = len(StubAdapter.document_calls)
+    draft = run_pipeline_bytes(b"good", "good.jpg", verbose=False, user_pk=2)
+
+    return check("success draft는 run_bytes_document 호출 안 함",
+                 draft["validation_status"] == "success" and "rescue" not in draft
+                 and len(StubAdapter.document_calls) == calls)
+
+
+def check_pipeline_budget() -> bool:
+    # 사용자 3 : 시간당 2회 → 세 번째 실패 draft는 재OCR 없이 그대로
+    calls = len(StubAdapter.document_calls)
+    drafts = [run_pipeline_bytes(b"bad", f"bad_{n}.jpg", verbose=False, user_pk=3) for n in range(3)]
+
+    return all([
+        check("예산 안에서는 재OCR", [d["validation_status"] for d in drafts[:2]] == ["success", "success"]),
+        check("예산 초과 → 재OCR 생략",
+              drafts[2]["validation_status"] == "error"
+              and stages(drafts[2], "RESCUE") == ["재OCR 생략 (사용자 예산 초과)"]
+              and len(StubAdapter.document_calls) - calls == 2),
+    ])
+
+
+def check_budget_window() -> bool:
+    budget = RescueBudget(per_user=2, window_s=0.2)
+
+    used = [budget.acquire("u1") for _ in range(3)]
+    other = budget.acquire("u2")
+
+    time.sleep(0.25)
+    refilled = budget.acquire("u1")
+
+    return all([
+        check("시간 창 안에서 per_user + 1번째 거절", used == [True, True, False]),
+        check("사용자별로 따로 셈", other),
+        check("시간 창이 지나면 다시 허용", refilled),
+    ])
+
+
+def main():
+    print("=" * 60)
+    print("재OCR(rescue) 테스트")
+    print("=" * 60)
+
+    results = [
+        check_replace_and_keep(),
+        check_success_skipped(),
+        check_pipeline_budget(),
+        check_budget_window(),
+    ]
+
+    stats = get_default_rescuer().stats()
+    results.append(check(
+        f"카운터 {stats}",
+        stats["attempts"] == 4 and stats["rescued"] == 3 and stats["improved"] == 3
+        and stats["unchanged"] == 1 and stats["skipped_budget"] == 1 and stats["failed"] == 0
+    ))
+
+    print("\n" + "=" * 60)
+    print("테스트 완료!" if all(results) else "테스트 실패")
+    print("=" * 60)
+
+    return all(results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,171 @@
+# =============================================================================
+# test_run_pipeline_many.py - 여러 장 동시 처리 테스트
+# =============================================================================
+# 설명: run_pipeline_many가
+#       - 같은 묶음 안의 중복 사진을 OCR 1회로 처리하는지
+#       - 사진을 배치 요청 chunk로 묶어 보내는지 (사진마다 Vision 호출하지 않음)
+#       - 한 장 / 한 chunk 실패가 다른 사진에 영향을 주지 않는지
+#       - 중간에 그만 읽어도 남은 chunk를 기다리지 않는지
+#       Vision 대신 가짜 어댑터 사용 (네트워크 / 인증 불필요)
+#       프로젝트 루트에서 실행: python -m tests.test_run_pipeline_many
+# =============================================================================
+
+import io
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# 부가 기능(쿼터 / 재OCR / 저장소 / 지표)은 끄고 가짜 어댑터 사용
+os.environ.update({
+    "OCR_ADAPTER": "fake_many",
+    "OCR_QUOTA_ENABLED": "0",
+    "OCR_RESCUE_ENABLED": "0",
+    "OCR_DRAFT_STORE_ENABLED": "0",
+    "OCR_METRICS_ENABLED": "0",
+    "OCR_DEDUP_ENABLED": "1",
+})
+
+import numpy as np
+from PIL import Image
+
+from services.ocr_pipeline2.ocr.adapter_registry import registry
+from services.ocr_pipeline2.ocr.base_adapter import OCRAdapter
+from services.ocr_pipeline2.pipeline.run_pipeline import run_pipeline_many
+
+
+RECEIPT_TEXT = "\n".join([
+    "이마트 성수점",
+    "2023.12.31 14:02",
+    "두부 1,980",
+    "계란 6,980",
+    "합계 8,960",
+    "신용카드 8,960",
+])
+
+
+class FakeBatchAdapter(OCRAdapter):
+    """배치 요청 횟수 / 이미지 수 기록, 이름으로 실패 흉내"""
+
+    name = "fake_many"
+
+    calls = []
+    lock = threading.Lock()
+    delay_s = 0.0
+
+    def run_bytes(self, content, name: str) -> dict:
+        return self.run_batch_bytes([(content, name)])[0]
+
+    def run_batch_bytes(self, items: list) -> list:
+        names = [name for _, name in items]
+
+        with self.lock:
+            self.calls.append(names)
+
+        time.sleep(self.delay_s)
+
+        if any(name.startswith("explode") for name in names):
+            raise RuntimeError("batch failed")
+
+        return [
+            {"adapter": self.name, "image_name": name, "error": "unreadable"}
+            if name.startswith("broken")
+            else {"adapter": self.name, "image_name": name, "full_text": RECEIPT_TEXT}
+            for name in names
+        ]
+
+
+registry.register(FakeBatchAdapter.name, FakeBatchAdapter)
+
+
+def make_image(seed: int) -> bytes:
+    pixels = np.random.default_rng(seed).integers(0, 256, (120, 90), dtype=np.uint8)
+    buf = io.BytesIO()
+    Image.fromarray(pixels).save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def check(label: str, ok: bool) -> bool:
+    print(f"   {'✅' if ok else '❌'} {label}")
+    return ok
+
+
+def check_dedup_and_batching() -> bool:
+    FakeBatchAdapter.calls.clear()
+
+    receipt = make_image(1)
+    items = [(receipt, "a.png"), (make_image(2), "b.png"), (receipt, "a_copy.png"), (make_image(3), "c.png")]
+
+    results = dict(run_pipeline_many(items, max_workers=2, verbose=False, user_pk=9001))
+    ocr_names = [name for call in FakeBatchAdapter.calls for name in call]
+
+    return all([
+        check("입력 index마다 결과 1건", sorted(results) == [0, 1, 2, 3]),
+        check("같은 묶음 중복 사진은 OCR 안 함", "a_copy.png" not in ocr_names and len(ocr_names) == 3),
+        check("중복 사진은 먼저 나온 사진 결과 재사용", results[2].get("duplicate_of") == "a.png"),
+        check("배치 요청 2회 (사진마다 호출하지 않음)", len(FakeBatchAdapter.calls) == 2),
+        check("index → 파일명 대응", [results[i]["image_path"] for i in range(4)]
+              == ["a.png", "b.png", "a_copy.png", "c.png"]),
+    ])
+
+
+def check_error_isolation() -> bool:
+    items = [
+        (b"1", "ok_1.jpg"), (b"2", "broken.jpg"),       # chunk 1 : 한 장만 실패
+        (b"3", "explode.jpg"), (b"4", "ok_2.jpg"),      # chunk 2 : 배치 요청 자체 실패
+        (b"5", "ok_3.jpg"), (b"6", "ok_4.jpg"),         # chunk 3 : 정상
+        "does/not/exist.jpg",                           # 파일 읽기 실패
+    ]
+
+    results = dict(run_pipeline_many(items, max_workers=3, verbose=False))
+    status = {results[i]["image_path"]: results[i]["validation_status"] for i in results}
+
+    return all([
+        check("모든 입력에 결과", len(results) == len(items)),
+        check("실패한 사진만 error", status == {
+            "ok_1.jpg": "success", "broken.jpg": "error",
+            "explode.jpg": "error", "ok_2.jpg": "error",
+            "ok_3.jpg": "success", "ok_4.jpg": "success",
+            "does/not/exist.jpg": "error",
+        }),
+    ])
+
+
+def check_early_close() -> bool:
+    FakeBatchAdapter.delay_s = 0.3
+
+    try:
+        items = [(bytes([i]), f"slow_{i}.jpg") for i in range(8)]
+        started = time.perf_counter()
+
+        finished = run_pipeline_many(items, max_workers=1, verbose=False)
+        next(finished)
+        finished.close()
+
+        elapsed = time.perf_counter() - started
+    finally:
+        FakeBatchAdapter.delay_s = 0.0
+
+    # max_workers=1 → chunk 1개라 첫 결과까지 0.3s, close가 남은 작업을 기다리지 않아야 함
+    return check(f"중간에 닫으면 바로 반환 ({elapsed:.2f}s)", elapsed < 0.6)
+
+
+def main():
+    print("=" * 60)
+    print("run_pipeline_many 테스트")
+    print("=" * 60)
+
+    results = [check_dedup_and_batching(), check_error_isolation(), check_early_close()]
+
+    print("\n" + "=" * 60)
+    print("테스트 완료!" if all(results) else "테스트 실패")
+    print("=" * 60)
+
+    return all(results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
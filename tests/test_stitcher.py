@@ -0,0 +1,92 @@
+# =============================================================================
+# test_stitcher.py - 긴 영수증 사진 이어 붙이기 테스트
+# =============================================================================
+# 설명: stitch_texts가 겹쳐 찍힌 줄을 한 번만 남기는지,
+#       구분선("-----" 등)끼리 겹침으로 오인해 실제 줄을 잃지 않는지 확인
+#       프로젝트 루트에서 실행: python -m tests.test_stitcher
+# =============================================================================
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.ocr_pipeline2.pipeline.stitcher import stitch_texts
+
+
+RECEIPT = [
+    "이마트 성수점",
+    "2023.12.31 14:02",
+    "두부 1,980",
+    "계란 6,980",
+    "샴푸 12,900",
+    "우유 2,980",
+    "라면 4,500",
+    "사과 8,900",
+    "배 9,900",
+    "휴지 12,000",
+    "세제 7,500",
+    "합계 70,620",
+    "신용카드 70,620",
+]
+
+CASES = [
+    # (설명, 사진별 텍스트, 기대 텍스트, 기대 겹침 수)
+    (
+        "겹침 3줄 + 가장자리 잘린 줄 + 띄어쓰기 차이",
+        [
+            "\n".join(RECEIPT[:8] + ["배 9,9"]),
+            "\n".join(["~~~"] + [l.replace(" ", "") for l in RECEIPT[5:11]]),
+            "\n".join(RECEIPT[9:]),
+        ],
+        "\n".join(RECEIPT[:8] + [l.replace(" ", "") for l in RECEIPT[8:11]] + RECEIPT[11:]),
+        [3, 2],
+    ),
+    (
+        "겹침 없음 → 그대로 이어 붙임",
+        ["a 1,000\nb 2,000", "c 3,000\nd 4,000"],
+        "a 1,000\nb 2,000\nc 3,000\nd 4,000",
+        [0],
+    ),
+    (
+        "구분선끼리는 겹침이 아님 (실제 줄 유지)",
+        ["빵 2,000\n----------\n==========\n김밥 4,000", "**********\n##########\n라면 3,000\n합계 6,000"],
+        "빵 2,000\n----------\n==========\n김밥 4,000\n**********\n##########\n라면 3,000\n합계 6,000",
+        [0],
+    ),
+    (
+        "겹침 구간 안의 구분선은 건너뛰고 비교",
+        ["두부 1,980\n계란 6,980\n----------\n샴푸 12,900", "계란 6,980\n==========\n샴푸 12,900\n합계 21,860"],
+        "두부 1,980\n계란 6,980\n----------\n샴푸 12,900\n합계 21,860",
+        [2],
+    ),
+]
+
+
+def main():
+    print("=" * 60)
+    print("stitch_texts 테스트")
+    print("=" * 60)
+
+    failed = 0
+
+    for label, texts, expected_text, expected_overlaps in CASES:
+        text, overlaps = stitch_texts(texts)
+
+        if text == expected_text and overlaps == expected_overlaps:
+            print(f"   ✅ {label}")
+        else:
+            failed += 1
+            print(f"   ❌ {label}")
+            print(f"      - overlaps: {overlaps} != {expected_overlaps}")
+            print(f"      - text:\n{text}")
+
+    print("\n" + "=" * 60)
+    print("테스트 완료!" if not failed else f"테스트 실패: {failed}건")
+    print("=" * 60)
+
+    return failed == 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
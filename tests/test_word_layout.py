@@ -0,0 +1,87 @@
+# =============================================================================
+# test_word_layout.py - Vision 단어 위치 정보 직렬화 테스트
+# =============================================================================
+# 설명: WordLayout이
+#       - to_bytes / from_bytes (OCR 캐시 BLOB)
+#       - to_dict / from_dict (녹화 corpus JSON)
+#       - pickle (프로세스 풀 전달)
+#       을 거쳐도 단어 / box / confidence / 페이지 크기가 그대로인지 확인
+#       프로젝트 루트에서 실행: python -m tests.test_word_layout
+# =============================================================================
+
+import json
+import pickle
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from services.ocr_pipeline2.ocr.word_layout import WordLayout
+
+
+WORDS = ["이마트", "성수점", "두부", "1,980", "합계", "1,980"]
+
+LAYOUT = WordLayout.from_dict({
+    "text": "".join(WORDS),
+    "offsets": np.cumsum([0] + [len(w) for w in WORDS]).tolist(),
+    "boxes": [
+        [10, 10, 80, 30], [90, 10, 160, 30],
+        [10, 50, 50, 70], [200, 50, 260, 70],
+        [10, 90, 50, 110], [200, 90, 260, 110],
+    ],
+    "confidence": [0.99, 0.98, None, 0.95, 0.97, 0.96],
+    "page_size": [300, 400],
+})
+
+
+def same(a: WordLayout, b: WordLayout) -> bool:
+    return (
+        a.words() == b.words()
+        and np.array_equal(a.boxes, b.boxes)
+        and np.array_equal(a.confidence, b.confidence, equal_nan=True)
+        and tuple(a.page_size) == tuple(b.page_size)
+    )
+
+
+def check(label: str, ok: bool) -> bool:
+    print(f"   {'✅' if ok else '❌'} {label}")
+    return ok
+
+
+def main():
+    print("=" * 60)
+    print("WordLayout 직렬화 테스트")
+    print("=" * 60)
+
+    blob = LAYOUT.to_bytes()
+    from_blob = WordLayout.from_bytes(blob)
+
+    # 캐시에서 읽은(아직 디코딩 안 한) layout도 그대로 pickle
+    pickled_lazy = pickle.loads(pickle.dumps(WordLayout.from_bytes(blob)))
+    pickled = pickle.loads(pickle.dumps(LAYOUT))
+
+    from_json = WordLayout.from_dict(json.loads(json.dumps(LAYOUT.to_dict())))
+    part = LAYOUT.take([2, 3])
+
+    results = [
+        check("단어 복원", LAYOUT.words() == WORDS and len(LAYOUT) == 6),
+        check("to_bytes → from_bytes", same(LAYOUT, from_blob)),
+        check("from_bytes 결과 다시 to_bytes 해도 동일", from_blob.to_bytes() == blob),
+        check("pickle (디코딩 후)", same(LAYOUT, pickled)),
+        check("pickle (디코딩 전 BLOB)", same(LAYOUT, pickled_lazy)),
+        check("to_dict → JSON → from_dict (confidence 없음 = NaN 유지)", same(LAYOUT, from_json)),
+        check("take : 일부 단어만", part.words() == ["두부", "1,980"]
+              and part.boxes.tolist() == [[10, 50, 50, 70], [200, 50, 260, 70]]),
+    ]
+
+    print("\n" + "=" * 60)
+    print("테스트 완료!" if all(results) else "테스트 실패")
+    print("=" * 60)
+
+    return all(results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)